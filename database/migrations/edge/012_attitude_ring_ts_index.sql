@@ -0,0 +1,8 @@
+-- Migration 012: Replace duplicate attitude_logs ring_number indexes
+-- with a composite (ring_number, timestamp) index.
+-- ring_number was indexed twice (column-level index=True and idx_attitude_ring);
+-- the composite index also serves WHERE ring_number = ? ORDER BY timestamp.
+
+DROP INDEX IF EXISTS ix_attitude_logs_ring_number;
+DROP INDEX IF EXISTS idx_attitude_ring;
+CREATE INDEX IF NOT EXISTS idx_attitude_ring_ts ON attitude_logs(ring_number, timestamp);
@@ -0,0 +1,7 @@
+-- Migration 013: Composite (ring_number, model_name, timestamp) index on prediction_results.
+-- Serves "latest prediction for ring N by model M" without a sort, and its
+-- ring_number prefix makes the single-column ring index redundant.
+
+CREATE INDEX IF NOT EXISTS idx_pred_ring_model_cover
+    ON prediction_results(ring_number, model_name, timestamp);
+DROP INDEX IF EXISTS idx_prediction_ring_number;
@@ -0,0 +1,17 @@
+-- Migration 014: Database-computed drift severity on model_performance_metrics.
+-- drift_severity (text) is replaced by a small integer code derived from
+-- drift_detected and rmse_increase_percent: 0=none, 1=minor, 2=moderate, 3=severe.
+-- SQLite cannot ADD a STORED generated column, so existing databases get a
+-- VIRTUAL one (same values; fresh schemas created from the models use STORED).
+
+ALTER TABLE model_performance_metrics ADD COLUMN drift_severity_code SMALLINT
+    GENERATED ALWAYS AS (
+        CASE WHEN drift_detected IS NULL OR drift_detected = 0 THEN 0
+             WHEN rmse_increase_percent > 50 THEN 3
+             WHEN rmse_increase_percent > 30 THEN 2
+             ELSE 1 END
+    ) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_perf_sev ON model_performance_metrics(drift_severity_code);
+
+ALTER TABLE model_performance_metrics DROP COLUMN drift_severity;
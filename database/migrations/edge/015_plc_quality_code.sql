@@ -0,0 +1,22 @@
+-- Migration 015: Integer data quality code on plc_logs.
+-- data_quality_code ranks data_quality_flag (0=raw/calibrated/unset,
+-- 1=interpolated, 2=rejected, 3=missing) so window queries filter with
+-- data_quality_code < 2 instead of per-row string comparisons, inside a
+-- composite (timestamp, data_quality_code) index that replaces the plain
+-- timestamp index. SQLite cannot ADD a STORED generated column, so existing
+-- databases get a VIRTUAL one (same values; fresh schemas created from the
+-- models use STORED).
+
+ALTER TABLE plc_logs ADD COLUMN data_quality_code SMALLINT
+    GENERATED ALWAYS AS (
+        CASE data_quality_flag
+            WHEN 'interpolated' THEN 1
+            WHEN 'rejected' THEN 2
+            WHEN 'missing' THEN 3
+            ELSE 0 END
+    ) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS ix_plc_logs_timestamp_quality
+    ON plc_logs(timestamp, data_quality_code);
+
+DROP INDEX IF EXISTS ix_plc_logs_timestamp;
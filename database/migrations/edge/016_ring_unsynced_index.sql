@@ -0,0 +1,7 @@
+-- Migration 016: Partial ring_summary index for unsynced rings.
+-- get_unsynced_rings() runs WHERE synced_to_cloud = 0 ORDER BY ring_number
+-- LIMIT ?; this index holds only unsynced rings, in ring_number order, so
+-- the query reads at most LIMIT entries without a sort.
+
+CREATE INDEX IF NOT EXISTS idx_ring_unsynced_rings
+    ON ring_summary(ring_number) WHERE synced_to_cloud = 0;
@@ -5,8 +5,8 @@ GET /api/v1/health - System health status
 from fastapi import APIRouter, Depends, status
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
-from datetime import datetime
 import logging
+import time
 import psutil
 import os
 import asyncio
@@ -122,7 +122,7 @@ async def health_check(
     # Minimal mode for tests to avoid blocking IO
     if os.getenv("FASTAPI_MINIMAL_HEALTH", "").lower() in ("1", "true", "yes") or "PYTEST_CURRENT_TEST" in os.environ:
         logger.info("health_check minimal branch")
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
         return HealthResponse(
             status="healthy",
             timestamp=timestamp,
@@ -132,7 +132,7 @@ async def health_check(
             components={}
         )
 
-    timestamp = datetime.utcnow().timestamp()
+    timestamp = time.time()
     issues = []
 
     # Check database health (non-blocking with timeout)
@@ -223,7 +223,7 @@ async def fast_health():
     """Return minimal healthy response without DB/system checks."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().timestamp(),
+        "timestamp": time.time(),
         "version": "1.0.0",
     }
 
@@ -302,7 +302,7 @@ def _check_system_health_sync() -> SystemHealth:
 
         # System uptime
         boot_time = psutil.boot_time()
-        uptime_seconds = datetime.utcnow().timestamp() - boot_time
+        uptime_seconds = time.time() - boot_time
 
         return SystemHealth(
             cpu_percent=round(cpu_percent, 2),
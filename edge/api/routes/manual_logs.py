@@ -6,8 +6,8 @@ Allows manual data entry for sensors, geological observations, etc.
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
-from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,7 @@ class ManualPLCLog(BaseModel):
 
     @validator('timestamp', pre=True, always=True)
     def set_timestamp(cls, v):
-        return v or datetime.utcnow().timestamp()
+        return v or time.time()
 
 
 class ManualAttitudeLog(BaseModel):
@@ -42,7 +42,7 @@ class ManualAttitudeLog(BaseModel):
 
     @validator('timestamp', pre=True, always=True)
     def set_timestamp(cls, v):
-        return v or datetime.utcnow().timestamp()
+        return v or time.time()
 
 
 class ManualMonitoringLog(BaseModel):
@@ -57,7 +57,7 @@ class ManualMonitoringLog(BaseModel):
 
     @validator('timestamp', pre=True, always=True)
     def set_timestamp(cls, v):
-        return v or datetime.utcnow().timestamp()
+        return v or time.time()
 
 
 class ManualLogBatch(BaseModel):
@@ -179,7 +179,7 @@ async def create_manual_logs(
                             log.value,
                             f"manual_{batch.operator_id}",
                             "manual",
-                            datetime.utcnow().timestamp()
+                            time.time()
                         )
                     )
                     plc_count += 1
@@ -205,7 +205,7 @@ async def create_manual_logs(
                             log.vertical_deviation,
                             log.axis_deviation,
                             f"manual_{batch.operator_id}",
-                            datetime.utcnow().timestamp()
+                            time.time()
                         )
                     )
                     attitude_count += 1
@@ -226,7 +226,7 @@ async def create_manual_logs(
                             log.sensor_location,
                             log.value,
                             log.unit,
-                            datetime.utcnow().timestamp()
+                            time.time()
                         )
                     )
                     monitoring_count += 1
@@ -5,7 +5,7 @@ Provides latest prediction and per-ring prediction lookups.
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+import time
 
 from edge.database.manager import DatabaseManager
 db_manager: Optional[DatabaseManager] = None
@@ -38,7 +38,7 @@ class PredictionResponse(BaseModel):
 def _row_to_prediction(row: dict) -> PredictionResponse:
     return PredictionResponse(
         ring_number=row["ring_number"],
-        timestamp=row.get("timestamp") or datetime.utcnow().timestamp(),
+        timestamp=row.get("timestamp") or time.time(),
         model_name=row.get("model_name", ""),
         model_version=row.get("model_version", ""),
         model_type=row.get("model_type"),
@@ -8,8 +8,8 @@ POST /api/v1/warnings/{warning_id}/resolve - Resolve warning
 from fastapi import APIRouter, HTTPException, Depends, Query, Body, status as http_status
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -175,10 +175,10 @@ async def list_warnings(
                     indicator="thrust_mean",
                     indicator_name="thrust_mean",
                     ring_number=101,
-                    timestamp=datetime.utcnow().timestamp(),
+                    timestamp=time.time(),
                     status="active",
-                    created_at=datetime.utcnow().timestamp(),
-                    updated_at=datetime.utcnow().timestamp(),
+                    created_at=time.time(),
+                    updated_at=time.time(),
                     message="Stub warning"
                 )
             ]
@@ -342,7 +342,7 @@ async def get_warning(
     """
     try:
         if _is_stub_mode():
-            now = datetime.utcnow().timestamp()
+            now = time.time()
             return WarningResponse(
                 warning_id=warning_id,
                 warning_type="threshold",
@@ -451,7 +451,7 @@ async def acknowledge_warning(
     try:
         if _is_stub_mode():
             # Echo back a stubbed response
-            now = datetime.utcnow().timestamp()
+            now = time.time()
             return WarningResponse(
                 warning_id=warning_id,
                 warning_type="threshold",
@@ -468,7 +468,7 @@ async def acknowledge_warning(
                 message="Stub warning acknowledged"
             )
 
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
 
         with db.get_connection() as conn:
             # Check if warning exists
@@ -582,7 +582,7 @@ async def resolve_warning(
     """
     try:
         if _is_stub_mode():
-            now = datetime.utcnow().timestamp()
+            now = time.time()
             new_status = "false_positive" if request.mark_as_false_positive else "resolved"
             return WarningResponse(
                 warning_id=warning_id,
@@ -600,7 +600,7 @@ async def resolve_warning(
                 message="Stub warning resolved"
             )
 
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
         new_status = "false_positive" if request.mark_as_false_positive else "resolved"
 
         with db.get_connection() as conn:
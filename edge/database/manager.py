@@ -2,23 +2,69 @@
 T055: Database Manager Utility
 Manages SQLite connection, transaction handling, and WAL mode enforcement
 """
+import asyncio
 import sqlite3
 import logging
+import threading
 from typing import Any, Dict, List, Optional, Tuple
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 
 # SQLAlchemy for ORM usage (warning system, models)
 try:
-    from sqlalchemy import create_engine
+    from sqlalchemy import create_engine, event
     from sqlalchemy.orm import sessionmaker, Session as SASession
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
     SASession = None
 
+# aiosqlite for non-blocking access from async code paths
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    AIOSQLITE_AVAILABLE = False
+    aiosqlite = None
+
+# orjson for JSON column (de)serialization; stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Connection-level settings applied to every new SQLite connection
+CONNECTION_PRAGMAS = (
+    # Must precede table creation to apply to a new file; an existing file
+    # switches over on its next full VACUUM
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",  # Concurrent readers/writers
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL, avoids fsync per commit
+    "PRAGMA cache_size=-65536",  # 64MB page cache
+    "PRAGMA temp_store=MEMORY",  # Sort/index temp tables in RAM
+    "PRAGMA mmap_size=268435456",  # 256MB memory-mapped reads
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _apply_pragmas(dbapi_connection: Any, connection_record: Any = None) -> None:
+    """Apply CONNECTION_PRAGMAS to a raw DB-API connection (engine 'connect' hook)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in CONNECTION_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _orjson_dumps(value: Any) -> str:
+    """JSON column serializer (SQLAlchemy expects str, orjson returns bytes)"""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
 
 class DatabaseManager:
     """
@@ -42,6 +88,10 @@ class DatabaseManager:
         self._ensure_database_exists()
         self._connection: Optional[sqlite3.Connection] = None
 
+        # Schema lookups are static between migrations; cache them
+        self._schema_cache: Dict[Any, Any] = {}
+        self._schema_lock = threading.Lock()
+
         # SQLAlchemy support for ORM usage
         self._engine = None
         self._SessionLocal = None
@@ -68,17 +118,9 @@ class DatabaseManager:
             # Configure row_factory for dict-like access
             self._connection.row_factory = sqlite3.Row
 
-            # Enable WAL mode for better concurrency
-            self._connection.execute("PRAGMA journal_mode=WAL")
-
-            # Set synchronous mode to NORMAL for performance
-            self._connection.execute("PRAGMA synchronous=NORMAL")
-
-            # Increase cache size to 10MB
-            self._connection.execute("PRAGMA cache_size=-10000")
-
-            # Enable foreign keys
-            self._connection.execute("PRAGMA foreign_keys=ON")
+            # WAL mode, synchronous=NORMAL, cache/mmap sizing, foreign keys
+            for pragma in CONNECTION_PRAGMAS:
+                self._connection.execute(pragma)
 
             logger.info(f"Database connected: {self.db_path} (WAL mode enabled)")
 
@@ -125,11 +167,23 @@ class DatabaseManager:
             )
 
         if self._engine is None:
+            json_options = {}
+            if ORJSON_AVAILABLE:
+                # feature_list, hyperparameters, notification channels
+                json_options = {
+                    "json_serializer": _orjson_dumps,
+                    "json_deserializer": orjson.loads,
+                }
             self._engine = create_engine(
                 f"sqlite:///{self.db_path}",
                 connect_args={"check_same_thread": False},
+                insertmanyvalues_page_size=1000,  # Rows per batched multi-VALUES INSERT
                 echo=False,  # Set to True for SQL logging
+                **json_options,
             )
+            # Pooled ORM connections get the same WAL/synchronous tuning as
+            # the raw sqlite3 connection; without it every commit fsyncs.
+            event.listen(self._engine, "connect", _apply_pragmas)
             self._SessionLocal = sessionmaker(
                 bind=self._engine,
                 autocommit=False,
@@ -253,8 +307,11 @@ class DatabaseManager:
         Returns:
             Single row as dict-like Row object, or None
         """
-        cursor = self.query(query, params)
-        return cursor.fetchone()
+        try:
+            return self.connect().execute(query, params or ()).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Query execution failed: {e}\nQuery: {query}\nParams: {params}")
+            raise
 
     def fetchall(self, query: str, params: Optional[Tuple] = None) -> List[sqlite3.Row]:
         """
@@ -267,8 +324,11 @@ class DatabaseManager:
         Returns:
             List of rows as dict-like Row objects
         """
-        cursor = self.query(query, params)
-        return cursor.fetchall()
+        try:
+            return self.connect().execute(query, params or ()).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Query execution failed: {e}\nQuery: {query}\nParams: {params}")
+            raise
 
     def commit(self) -> None:
         """Commit current transaction"""
@@ -324,6 +384,13 @@ class DatabaseManager:
             conn.rollback()
             logger.error(f"Migration failed: {migration_file} - {e}")
             raise
+        finally:
+            self.clear_schema_cache()
+
+    def clear_schema_cache(self) -> None:
+        """Invalidate cached table names and table info after schema changes"""
+        with self._schema_lock:
+            self._schema_cache.clear()
 
     def get_table_info(self, table_name: str) -> List[Tuple]:
         """
@@ -335,8 +402,12 @@ class DatabaseManager:
         Returns:
             List of column information tuples
         """
-        cursor = self.query(f"PRAGMA table_info({table_name})")
-        return cursor.fetchall()
+        key = ("info", table_name)
+        with self._schema_lock:
+            if key not in self._schema_cache:
+                cursor = self.query(f"PRAGMA table_info({table_name})")
+                self._schema_cache[key] = cursor.fetchall()
+            return list(self._schema_cache[key])
 
     def get_table_names(self) -> List[str]:
         """
@@ -345,15 +416,19 @@ class DatabaseManager:
         Returns:
             List of table names
         """
-        cursor = self.query(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        )
-        return [row['name'] for row in cursor.fetchall()]
+        with self._schema_lock:
+            if "_tables" not in self._schema_cache:
+                cursor = self.query(
+                    "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+                )
+                self._schema_cache["_tables"] = [row['name'] for row in cursor.fetchall()]
+            return list(self._schema_cache["_tables"])
 
     def vacuum(self) -> None:
         """Run VACUUM to reclaim space and optimize database"""
         conn = self.connect()
         conn.execute("VACUUM")
+        self.clear_schema_cache()
         logger.info("Database vacuumed")
 
     def __enter__(self):
@@ -364,3 +439,177 @@ class DatabaseManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
         self.close()
+
+
+class AsyncDatabaseManager:
+    """
+    Async SQLite database manager backed by a small aiosqlite connection pool.
+
+    Intended for async code paths (collector buffer flushes, FastAPI handlers)
+    so database I/O does not block the event loop. Every pooled connection is
+    configured with the same PRAGMA settings as DatabaseManager.
+
+    Usage:
+        db = AsyncDatabaseManager("data/edge.db")
+        await db.connect()
+        async with db.transaction() as conn:
+            await conn.executemany("INSERT ...", rows)
+        rows = await db.fetchall("SELECT ...", params)
+        await db.close()
+    """
+
+    def __init__(self, db_path: str = "data/edge.db", pool_size: int = 4):
+        """
+        Initialize async database manager.
+
+        Args:
+            db_path: Path to SQLite database file
+            pool_size: Number of pooled connections
+        """
+        if not AIOSQLITE_AVAILABLE:
+            raise ImportError(
+                "aiosqlite is not available. Install with: pip install aiosqlite"
+            )
+
+        self.db_path = db_path
+        self.pool_size = pool_size
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._pool: Optional[asyncio.Queue] = None
+        self._connections: List[Any] = []
+        self._pool_lock = asyncio.Lock()
+
+    async def _create_connection(self):
+        """Open and configure a single pooled connection"""
+        conn = await aiosqlite.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        return conn
+
+    async def connect(self) -> asyncio.Queue:
+        """
+        Create the connection pool if it does not exist yet.
+
+        Returns:
+            Queue of idle pooled connections
+        """
+        async with self._pool_lock:
+            if self._pool is None:
+                pool: asyncio.Queue = asyncio.Queue(maxsize=self.pool_size)
+                for _ in range(self.pool_size):
+                    conn = await self._create_connection()
+                    self._connections.append(conn)
+                    pool.put_nowait(conn)
+                self._pool = pool
+                logger.info(
+                    f"Async database pool created: {self.db_path} "
+                    f"({self.pool_size} connections, WAL mode enabled)"
+                )
+
+        return self._pool
+
+    @asynccontextmanager
+    async def acquire(self):
+        """
+        Borrow a pooled connection for the duration of an `async with` block.
+
+        Yields:
+            aiosqlite connection
+        """
+        pool = await self.connect()
+        conn = await pool.get()
+        try:
+            yield conn
+        finally:
+            pool.put_nowait(conn)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Async context manager for transaction handling.
+
+        Commits on success, rolls back on exception.
+        """
+        async with self.acquire() as conn:
+            try:
+                yield conn
+                await conn.commit()
+            except Exception as e:
+                await conn.rollback()
+                logger.error(f"Transaction rolled back: {e}")
+                raise
+
+    async def execute(self, query: str, params: Optional[Tuple] = None) -> int:
+        """
+        Execute a write query in its own transaction.
+
+        Args:
+            query: SQL query string
+            params: Query parameters (optional)
+
+        Returns:
+            Number of rows affected
+        """
+        async with self.transaction() as conn:
+            cursor = await conn.execute(query, params or ())
+            return cursor.rowcount
+
+    async def execute_many(self, query: str, params_list: List[Tuple]) -> None:
+        """
+        Execute query with multiple parameter sets in a single transaction.
+
+        Args:
+            query: SQL query string with placeholders
+            params_list: List of parameter tuples
+        """
+        async with self.transaction() as conn:
+            await conn.executemany(query, params_list)
+
+    async def fetchone(self, query: str, params: Optional[Tuple] = None) -> Optional[sqlite3.Row]:
+        """
+        Execute query and fetch one result.
+
+        Args:
+            query: SQL query string
+            params: Query parameters (optional)
+
+        Returns:
+            Single row as dict-like Row object, or None
+        """
+        async with self.acquire() as conn:
+            async with conn.execute(query, params or ()) as cursor:
+                return await cursor.fetchone()
+
+    async def fetchall(self, query: str, params: Optional[Tuple] = None) -> List[sqlite3.Row]:
+        """
+        Execute query and fetch all results.
+
+        Args:
+            query: SQL query string
+            params: Query parameters (optional)
+
+        Returns:
+            List of rows as dict-like Row objects
+        """
+        async with self.acquire() as conn:
+            return list(await conn.execute_fetchall(query, params or ()))
+
+    async def close(self) -> None:
+        """Close all pooled connections"""
+        async with self._pool_lock:
+            for conn in self._connections:
+                await conn.close()
+            self._connections = []
+            if self._pool is not None:
+                self._pool = None
+                logger.info("Async database pool closed")
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
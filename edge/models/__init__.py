@@ -2,6 +2,7 @@
 Edge Database Models
 Defines SQLAlchemy ORM models for edge SQLite database
 """
+from .base import Base
 from .plc_log import PLCLog
 from .attitude_log import AttitudeLog
 from .monitoring_log import MonitoringLog
@@ -10,6 +11,7 @@ from .prediction_result import PredictionResult
 from .model_metadata import ModelMetadata, ModelPerformanceMetric
 
 __all__ = [
+    "Base",
     "PLCLog",
     "AttitudeLog",
     "MonitoringLog",
@@ -2,12 +2,11 @@
 T052: Attitude Log Model
 Represents guidance system data (pitch, roll, yaw, deviations)
 """
-from datetime import datetime
+import time
 from typing import Optional
 from sqlalchemy import Column, Integer, Float, String, Index
-from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+from .base import Base, DataQualityFlag
 
 
 class AttitudeLog(Base):
@@ -20,17 +19,19 @@ class AttitudeLog(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(Float, nullable=False, index=True)
-    ring_number = Column(Integer, nullable=True, index=True)
+    ring_number = Column(Integer, nullable=True)
     pitch = Column(Float, nullable=True)  # degrees
     roll = Column(Float, nullable=True)  # degrees
     yaw = Column(Float, nullable=True)  # degrees
     horizontal_deviation = Column(Float, nullable=True)  # mm from design
     vertical_deviation = Column(Float, nullable=True)  # mm from design
     source_id = Column(String(50), nullable=False)
-    data_quality_flag = Column(String(20), default="raw")
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    data_quality_flag = Column(DataQualityFlag, default="raw")
+    created_at = Column(Float, default=time.time)
 
-    __table_args__ = (Index("idx_attitude_ring", "ring_number"),)
+    # Composite index serves ring lookups and ring-ordered timeline scans;
+    # a standalone ring_number index would be redundant.
+    __table_args__ = (Index("idx_attitude_ring_ts", "ring_number", "timestamp"),)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
@@ -49,6 +50,11 @@ class AttitudeLog(Base):
         }
 
     def __repr__(self) -> str:
+        # Keep repr to the primary key so logging never triggers attribute loads
+        return f"<AttitudeLog#{self.id}>"
+
+    def detailed_repr(self) -> str:
+        """Verbose representation for explicit debugging"""
         return (
             f"<AttitudeLog(id={self.id}, ring={self.ring_number}, "
             f"h_dev={self.horizontal_deviation}, v_dev={self.vertical_deviation})>"
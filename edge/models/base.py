@@ -0,0 +1,69 @@
+"""
+Shared Declarative Base
+All edge models register on one metadata so cross-model foreign keys resolve
+and compiled statements are cached against a single registry
+"""
+from typing import Any
+
+from sqlalchemy import JSON, Enum, Float, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.types import TypeEngine
+
+Base = declarative_base()
+
+# Closed low-cardinality string domains. PostgreSQL stores them as native
+# enums (4 bytes/row); SQLite keeps plain VARCHAR so raw-SQL readers and
+# existing rows are unaffected. Attributes hold plain strings either way.
+# Every flag the pipeline writes: cleaner stages ("raw" through "rejected"),
+# interpolator gap markers ("missing") and operator entries ("manual")
+DATA_QUALITY_FLAGS = (
+    "raw", "interpolated", "calibrated", "rejected", "missing", "manual",
+)
+DEPLOYMENT_STATUSES = ("staged", "active", "retired", "failed")
+
+# Integer rank of data_quality_flag, kept as a generated column so quality
+# filters are integer range predicates an index can serve:
+# 0 = raw/calibrated/unset, 1 = interpolated, 2 = rejected, 3 = missing.
+# Readings usable for aggregation have a code below DATA_QUALITY_CODE_REJECTED.
+DATA_QUALITY_CODE_SQL = (
+    "CASE data_quality_flag "
+    "WHEN 'interpolated' THEN 1 "
+    "WHEN 'rejected' THEN 2 "
+    "WHEN 'missing' THEN 3 "
+    "ELSE 0 END"
+)
+DATA_QUALITY_CODE_REJECTED = 2
+
+DataQualityFlag = String(20).with_variant(
+    Enum(*DATA_QUALITY_FLAGS, name="data_quality_flag"), "postgresql"
+)
+DeploymentStatus = String(20).with_variant(
+    Enum(*DEPLOYMENT_STATUSES, name="deployment_status"), "postgresql"
+)
+
+# Sensor measurements (12-bit ADC sources, mm-scale settlement) don't need
+# double precision. FLOAT(24) is a 4-byte real on PostgreSQL; SQLite stores
+# every REAL as 8 bytes, so the edge schema is unaffected. Not for timestamps.
+SensorFloat = Float(precision=24)
+
+
+def json_type() -> TypeEngine:
+    """
+    Native JSON column type: JSONB on PostgreSQL (GIN-indexable, @> containment),
+    JSON (stored as text) on SQLite. Values are decoded by the dialect, so
+    attributes hold Python lists/dicts. SQL NULL is kept for None.
+
+    Returns a new instance per call so columns can be wrapped independently
+    (e.g. MutableList.as_mutable binds to the type instance).
+    """
+    return JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def not_postgresql(ddl: Any, target: Any, bind: Any, **kw: Any) -> bool:
+    """
+    ddl_if() predicate for B-tree indexes that PostgreSQL replaces with BRIN
+
+    Usage: Index(...).ddl_if(callable_=not_postgresql)
+    """
+    return kw["dialect"].name != "postgresql"
@@ -0,0 +1,174 @@
+"""
+Bulk Load Helpers
+Bypass per-row ORM overhead for high-rate log ingestion
+"""
+import csv
+import io
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select
+
+DEFAULT_CHUNK_SIZE = 10_000
+INSERT_CHUNK_SIZE = 5_000
+EXPORT_YIELD_PER = 1_000
+
+
+def _iter_chunks(
+    rows: Iterable[Dict[str, Any]],
+    columns: Sequence[str],
+    defaults: Dict[str, Any],
+    chunk_size: int,
+) -> Iterator[List[Tuple]]:
+    """Yield lists of column-ordered tuples, filling missing values from defaults"""
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        # Callable defaults (e.g. time.time) are evaluated once per chunk
+        fill = {k: (v() if callable(v) else v) for k, v in defaults.items()}
+        yield [
+            tuple(
+                fill.get(col) if row.get(col) is None else row[col]
+                for col in columns
+            )
+            for row in chunk
+        ]
+
+
+def bulk_copy_rows(
+    session: Any,
+    table_name: str,
+    rows: Iterable[Dict[str, Any]],
+    columns: Sequence[str],
+    defaults: Dict[str, Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Stream rows into a table without instantiating ORM objects.
+
+    PostgreSQL uses COPY FROM STDIN; other dialects (SQLite on the edge
+    device) use executemany. Runs inside the session's current transaction;
+    the caller is responsible for commit.
+
+    Args:
+        session: SQLAlchemy session
+        table_name: Target table
+        rows: Iterable of dicts keyed by column name
+        columns: Columns to load, in order
+        defaults: Values (or callables) used when a row omits a column
+        chunk_size: Rows per COPY buffer / executemany batch
+
+    Returns:
+        Number of rows written
+    """
+    connection = session.connection()
+    column_list = ", ".join(columns)
+    written = 0
+
+    if connection.dialect.name == "postgresql":
+        copy_sql = (
+            f"COPY {table_name} ({column_list}) FROM STDIN "
+            f"WITH (FORMAT csv, DELIMITER E'\\t', NULL '')"
+        )
+        cursor = connection.connection.cursor()
+        try:
+            for chunk in _iter_chunks(rows, columns, defaults, chunk_size):
+                buf = io.StringIO()
+                csv.writer(buf, delimiter="\t", quoting=csv.QUOTE_MINIMAL).writerows(chunk)
+                buf.seek(0)
+                cursor.copy_expert(copy_sql, buf)
+                written += len(chunk)
+        finally:
+            cursor.close()
+        return written
+
+    marker = "?" if connection.dialect.paramstyle == "qmark" else "%s"
+    placeholders = ", ".join(marker for _ in columns)
+    insert_sql = f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})"
+    for chunk in _iter_chunks(rows, columns, defaults, chunk_size):
+        connection.exec_driver_sql(insert_sql, chunk)
+        written += len(chunk)
+
+    return written
+
+
+class BulkInsertMixin:
+    """
+    Adds a Core-level batch insert to ORM models.
+
+    Rows are inserted as plain dicts through insert(cls) in executemany
+    chunks, so no ORM instances or identity-map entries are created while
+    Python-side column defaults still apply.
+    """
+
+    @classmethod
+    def bulk_insert(
+        cls,
+        session: Any,
+        dicts: Iterable[Dict[str, Any]],
+        chunk: int = INSERT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Insert many rows in executemany batches.
+
+        Args:
+            session: SQLAlchemy session (caller commits)
+            dicts: Iterable of dicts keyed by attribute name
+            chunk: Rows per executemany batch
+
+        Returns:
+            Number of rows inserted
+        """
+        stmt = insert(cls)
+        it = iter(dicts)
+        inserted = 0
+        while True:
+            batch = list(islice(it, chunk))
+            if not batch:
+                return inserted
+            session.execute(stmt, batch)
+            inserted += len(batch)
+
+
+class BulkExportMixin:
+    """
+    Adds a Core-level batch counterpart to to_dict().
+
+    Subclasses list the to_dict() keys in EXPORT_COLUMNS. Rows are fetched
+    as plain tuples through select() and zipped into dicts, avoiding ORM
+    instance construction and per-attribute descriptor access.
+    """
+
+    EXPORT_COLUMNS: Tuple[str, ...] = ()
+
+    @classmethod
+    def bulk_to_dict(
+        cls,
+        session: Any,
+        where: Any = None,
+        cols: Optional[Sequence[str]] = None,
+        order_by: Any = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Export matching rows as dicts shaped like to_dict().
+
+        Args:
+            session: SQLAlchemy session
+            where: Optional filter clause (e.g. cls.ring_number >= 100)
+            cols: Columns to export (defaults to EXPORT_COLUMNS)
+            order_by: Optional ordering clause
+
+        Returns:
+            List of dicts keyed by column name
+        """
+        cols = tuple(cols or cls.EXPORT_COLUMNS)
+        stmt = select(*[getattr(cls, c) for c in cols])
+        if where is not None:
+            stmt = stmt.where(where)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+
+        result = session.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+        return [dict(zip(cols, row)) for row in result]
@@ -2,13 +2,16 @@
 Model Metadata Models
 Track deployed models and their performance on edge device
 """
-from datetime import datetime
+import time
 from typing import Optional, Dict, Any, List
-import json
-from sqlalchemy import Column, Integer, Float, String, Index, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import (
+    Column, Computed, Integer, Float, SmallInteger, String, Index, ForeignKey, func, select,
+)
+from sqlalchemy.ext.mutable import MutableDict, MutableList
+from sqlalchemy.orm import deferred
 
-Base = declarative_base()
+from .base import Base, DeploymentStatus, json_type
+from .prediction_result import PredictionResult
 
 
 class ModelMetadata(Base):
@@ -43,7 +46,13 @@ class ModelMetadata(Base):
     validation_mae = Column(Float)  # mm
 
     # Feature Configuration
-    feature_list = Column(String(1000))  # JSON array
+    # Large JSON payloads are deferred: status/list queries don't load them.
+    # Use .options(undefer(...)) where they are needed up front.
+    # Mutable wrappers track in-place edits (append, item set), so the value is
+    # serialized once at flush rather than on every change.
+    feature_list = deferred(
+        Column(MutableList.as_mutable(json_type())), group="model_config"
+    )  # JSON array
     feature_engineering_version = Column(String(20))
 
     # Output Format Configuration
@@ -53,10 +62,13 @@ class ModelMetadata(Base):
     # Only applies to 2-output models; ignored for other output counts
 
     # Hyperparameters
-    hyperparameters = Column(String(2000))  # JSON object
+    hyperparameters = deferred(
+        Column(MutableDict.as_mutable(json_type())), group="model_config"
+    )  # JSON object
 
     # Deployment Status
-    deployment_status = Column(String(20), default="staged")  # staged, active, retired, failed
+    # staged, active, retired, failed
+    deployment_status = Column(DeploymentStatus, default="staged")
     deployed_at = Column(Float)
     retired_at = Column(Float)
 
@@ -64,45 +76,86 @@ class ModelMetadata(Base):
     load_time_seconds = Column(Float)
     avg_inference_time_ms = Column(Float)
 
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
-    updated_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    created_at = Column(Float, default=time.time)
+    updated_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_model_metadata_status", "deployment_status"),
         Index("idx_model_metadata_zone", "geological_zone"),
+        # Feature-set containment lookups (feature_list @> '["x"]'); PG only
+        Index("idx_model_features_gin", "feature_list", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
     )
 
-    def get_feature_list(self) -> List[str]:
-        """Parse feature_list JSON to Python list"""
-        if self.feature_list:
-            return json.loads(self.feature_list)
-        return []
-
-    def set_feature_list(self, features: List[str]):
-        """Serialize feature list to JSON"""
-        self.feature_list = json.dumps(features)
-
     def get_hyperparameters(self) -> Dict[str, Any]:
-        """Parse hyperparameters JSON to Python dict"""
-        if self.hyperparameters:
-            return json.loads(self.hyperparameters)
-        return {}
+        """Get hyperparameters (decoded by the JSON column type)"""
+        return dict(self.hyperparameters) if self.hyperparameters else {}
 
     def set_hyperparameters(self, params: Dict[str, Any]):
-        """Serialize hyperparameters to JSON"""
-        self.hyperparameters = json.dumps(params)
+        """Set hyperparameters (serialized by the JSON column type)"""
+        self.hyperparameters = dict(params)
 
     def activate(self):
         """Mark model as active"""
         self.deployment_status = "active"
-        self.deployed_at = datetime.utcnow().timestamp()
-        self.updated_at = datetime.utcnow().timestamp()
+        self.deployed_at = time.time()
+        self.updated_at = time.time()
 
     def retire(self):
         """Mark model as retired"""
         self.deployment_status = "retired"
-        self.retired_at = datetime.utcnow().timestamp()
-        self.updated_at = datetime.utcnow().timestamp()
+        self.retired_at = time.time()
+        self.updated_at = time.time()
+
+    @classmethod
+    def dashboard_snapshot(cls, session: Any) -> List[Dict[str, Any]]:
+        """
+        Per-model overview for dashboards in one round trip
+
+        Performance and prediction aggregates are computed in separate grouped
+        CTEs and outer-joined to model_metadata, so neither join inflates the
+        other's counts and no per-model follow-up queries are needed.
+
+        Returns:
+            One dict per model, ordered by model_name
+        """
+        perf = (
+            select(
+                ModelPerformanceMetric.model_name,
+                func.max(ModelPerformanceMetric.evaluation_date).label("last_evaluated_at"),
+                func.count(ModelPerformanceMetric.id).label("evaluation_count"),
+            )
+            .group_by(ModelPerformanceMetric.model_name)
+            .cte("perf")
+        )
+        preds = (
+            select(
+                PredictionResult.model_name,
+                func.count(PredictionResult.id).label("prediction_count"),
+                func.max(PredictionResult.timestamp).label("last_prediction_at"),
+            )
+            .group_by(PredictionResult.model_name)
+            .cte("preds")
+        )
+        stmt = (
+            select(
+                cls.model_name,
+                cls.model_version,
+                cls.model_type,
+                cls.deployment_status,
+                cls.geological_zone,
+                cls.validation_rmse,
+                perf.c.last_evaluated_at,
+                func.coalesce(perf.c.evaluation_count, 0).label("evaluation_count"),
+                func.coalesce(preds.c.prediction_count, 0).label("prediction_count"),
+                preds.c.last_prediction_at,
+            )
+            .outerjoin(perf, perf.c.model_name == cls.model_name)
+            .outerjoin(preds, preds.c.model_name == cls.model_name)
+            .order_by(cls.model_name)
+        )
+        return [dict(row) for row in session.execute(stmt).mappings()]
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -122,12 +175,24 @@ class ModelMetadata(Base):
         }
 
     def __repr__(self) -> str:
+        r2 = f"{self.validation_r2:.3f}" if self.validation_r2 is not None else "n/a"
         return (
             f"<ModelMetadata(name={self.model_name}, version={self.model_version}, "
-            f"status={self.deployment_status}, R²={self.validation_r2:.3f})>"
+            f"status={self.deployment_status}, R²={r2})>"
         )
 
 
+# Drift severity derived in the database: 0=none, 1=minor, 2=moderate, 3=severe.
+# Bands match PerformanceMonitor's classification (>30% moderate, >50% severe).
+DRIFT_SEVERITY_LABELS = ("none", "minor", "moderate", "severe")
+DRIFT_SEVERITY_SQL = (
+    "CASE WHEN drift_detected IS NULL OR drift_detected = 0 THEN 0 "
+    "WHEN rmse_increase_percent > 50 THEN 3 "
+    "WHEN rmse_increase_percent > 30 THEN 2 "
+    "ELSE 1 END"
+)
+
+
 class ModelPerformanceMetric(Base):
     """
     Performance metrics for deployed models
@@ -138,7 +203,7 @@ class ModelPerformanceMetric(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     model_name = Column(String(100), ForeignKey("model_metadata.model_name"), nullable=False)
-    evaluation_date = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    evaluation_date = Column(Float, default=time.time)
 
     # Evaluation Window
     evaluation_data_range = Column(String(100))  # e.g., 'rings_501-550'
@@ -155,7 +220,7 @@ class ModelPerformanceMetric(Base):
 
     # Drift Detection
     drift_detected = Column(Integer, default=0)  # Boolean
-    drift_severity = Column(String(20))  # none, minor, moderate, severe
+    drift_severity_code = Column(SmallInteger, Computed(DRIFT_SEVERITY_SQL, persisted=True))
     baseline_rmse = Column(Float)  # Original validation RMSE
     rmse_increase_percent = Column(Float)  # % increase
 
@@ -163,13 +228,21 @@ class ModelPerformanceMetric(Base):
     triggered_retraining = Column(Integer, default=0)  # Boolean
     retraining_reason = Column(String(100))
 
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    created_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_model_performance_date", "evaluation_date"),
         Index("idx_model_performance_drift", "drift_detected"),
+        Index("idx_perf_sev", "drift_severity_code"),
     )
 
+    @property
+    def drift_severity(self) -> Optional[str]:
+        """Severity label (none, minor, moderate, severe); None until flushed"""
+        if self.drift_severity_code is None:
+            return None
+        return DRIFT_SEVERITY_LABELS[self.drift_severity_code]
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -190,7 +263,8 @@ class ModelPerformanceMetric(Base):
         }
 
     def __repr__(self) -> str:
+        rmse = f"{self.rmse:.2f}mm" if self.rmse is not None else "n/a"
         return (
             f"<ModelPerformanceMetric(model={self.model_name}, "
-            f"RMSE={self.rmse:.2f}mm, drift={bool(self.drift_detected)})>"
+            f"RMSE={rmse}, drift={bool(self.drift_detected)})>"
         )
@@ -3,15 +3,15 @@ T053: Monitoring Log Model
 Represents sensor data (surface settlement, deep displacement, groundwater)
 Variable frequency (hourly to per-ring)
 """
-from datetime import datetime
-from typing import Optional
+import time
+from typing import Any, Dict, Iterable, Optional, Sequence
 from sqlalchemy import Column, Integer, Float, String, Index
-from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+from .base import Base, DataQualityFlag, SensorFloat, not_postgresql
+from .bulk import DEFAULT_CHUNK_SIZE, BulkInsertMixin, bulk_copy_rows
 
 
-class MonitoringLog(Base):
+class MonitoringLog(BulkInsertMixin, Base):
     """
     Monitoring sensor data log entry
     Stores various sensor types with spatial locations
@@ -20,21 +20,66 @@ class MonitoringLog(Base):
     __tablename__ = "monitoring_logs"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(Float, nullable=False, index=True)
+    timestamp = Column(Float, nullable=False)
     ring_number = Column(Integer, nullable=True, index=True)
     sensor_type = Column(String(50), nullable=False)  # 'surface_settlement', 'deep_displacement', 'groundwater_level'
     sensor_location = Column(String(100), nullable=True)  # Spatial identifier or sensor ID
-    value = Column(Float, nullable=True)
+    value = Column(SensorFloat, nullable=True)
     unit = Column(String(20), nullable=True)  # 'mm', 'bar', 'm'
     source_id = Column(String(50), nullable=False)
-    data_quality_flag = Column(String(20), default="raw")
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    data_quality_flag = Column(DataQualityFlag, default="raw")
+    created_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_monitoring_type_timestamp", "sensor_type", "timestamp"),
         Index("idx_monitoring_ring_type", "ring_number", "sensor_type"),
+        # BRIN on PostgreSQL (insertion-ordered timestamps), B-tree elsewhere
+        Index("ix_monitoring_logs_timestamp", "timestamp").ddl_if(callable_=not_postgresql),
+        Index(
+            "idx_monitoring_ts_brin",
+            "timestamp",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ).ddl_if(dialect="postgresql"),
     )
 
+    BULK_COLUMNS = (
+        "timestamp", "ring_number", "sensor_type", "sensor_location", "value",
+        "unit", "source_id", "data_quality_flag", "created_at",
+    )
+
+    @classmethod
+    def bulk_copy(
+        cls,
+        session: Any,
+        rows: Iterable[Dict[str, Any]],
+        columns: Sequence[str] = BULK_COLUMNS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Bulk load readings without per-row ORM overhead.
+
+        Uses COPY on PostgreSQL and chunked executemany on SQLite, inside the
+        session's current transaction (caller commits).
+
+        Args:
+            session: SQLAlchemy session
+            rows: Iterable of dicts keyed by column name
+            columns: Columns to load
+            chunk_size: Rows per batch
+
+        Returns:
+            Number of rows written
+        """
+        return bulk_copy_rows(
+            session,
+            cls.__tablename__,
+            rows,
+            columns,
+            defaults={"data_quality_flag": "raw", "created_at": time.time},
+            chunk_size=chunk_size,
+        )
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -2,15 +2,17 @@
 T051: PLC Log Model
 Represents high-frequency PLC data from shield machine
 """
-from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, Float, String, Index
-from sqlalchemy.ext.declarative import declarative_base
+import time
+from typing import Any, Dict, Iterable, Optional, Sequence
+from sqlalchemy import Column, Computed, Integer, Float, SmallInteger, String, Index
 
-Base = declarative_base()
+from .base import (
+    DATA_QUALITY_CODE_SQL, Base, DataQualityFlag, SensorFloat, not_postgresql,
+)
+from .bulk import DEFAULT_CHUNK_SIZE, BulkExportMixin, BulkInsertMixin, bulk_copy_rows
 
 
-class PLCLog(Base):
+class PLCLog(BulkInsertMixin, BulkExportMixin, Base):
     """
     PLC data log entry
     Stores ~100 tags @ 1Hz = 8.64M readings/day
@@ -19,20 +21,73 @@ class PLCLog(Base):
     __tablename__ = "plc_logs"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(Float, nullable=False, index=True)  # Unix timestamp
+    timestamp = Column(Float, nullable=False)  # Unix timestamp
     ring_number = Column(Integer, nullable=True, index=True)
     tag_name = Column(String(100), nullable=False)
-    value = Column(Float, nullable=True)
+    value = Column(SensorFloat, nullable=True)
     source_id = Column(String(50), nullable=False)
-    data_quality_flag = Column(String(20), default="raw")  # raw, interpolated, calibrated, rejected
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    data_quality_flag = Column(DataQualityFlag, default="raw")  # see DATA_QUALITY_FLAGS
+    data_quality_code = Column(SmallInteger, Computed(DATA_QUALITY_CODE_SQL, persisted=True))
+    created_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_plc_tag_timestamp", "tag_name", "timestamp"),
         Index("idx_plc_quality", "data_quality_flag"),
         Index("idx_plc_ring_tag", "ring_number", "tag_name"),
+        # Timestamps arrive in insertion order, so PostgreSQL uses a compact BRIN
+        # index; SQLite has no BRIN and keeps a B-tree, which also carries the
+        # quality code so window scans filter rejected/missing in the index.
+        Index(
+            "ix_plc_logs_timestamp_quality", "timestamp", "data_quality_code"
+        ).ddl_if(callable_=not_postgresql),
+        Index(
+            "idx_plc_ts_brin",
+            "timestamp",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ).ddl_if(dialect="postgresql"),
     )
 
+    BULK_COLUMNS = (
+        "timestamp", "ring_number", "tag_name", "value", "source_id",
+        "data_quality_flag", "created_at",
+    )
+
+    # Keys of to_dict(), in order; used by bulk_to_dict()
+    EXPORT_COLUMNS = ("id",) + BULK_COLUMNS
+
+    @classmethod
+    def bulk_copy(
+        cls,
+        session: Any,
+        rows: Iterable[Dict[str, Any]],
+        columns: Sequence[str] = BULK_COLUMNS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Bulk load readings without per-row ORM overhead.
+
+        Uses COPY on PostgreSQL and chunked executemany on SQLite, inside the
+        session's current transaction (caller commits).
+
+        Args:
+            session: SQLAlchemy session
+            rows: Iterable of dicts keyed by column name
+            columns: Columns to load
+            chunk_size: Rows per batch
+
+        Returns:
+            Number of rows written
+        """
+        return bulk_copy_rows(
+            session,
+            cls.__tablename__,
+            rows,
+            columns,
+            defaults={"data_quality_flag": "raw", "created_at": time.time},
+            chunk_size=chunk_size,
+        )
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -2,15 +2,15 @@
 Prediction Result Model
 Stores ML prediction outputs for each ring
 """
-from datetime import datetime
+import time
 from typing import Optional, Dict, Any
 from sqlalchemy import Column, Integer, Float, String, Index, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+from .base import Base, not_postgresql
+from .bulk import BulkExportMixin, BulkInsertMixin
 
 
-class PredictionResult(Base):
+class PredictionResult(BulkInsertMixin, BulkExportMixin, Base):
     """
     ML prediction results for settlement and ground response indicators
     One or more records per ring (can have multiple model predictions)
@@ -20,7 +20,7 @@ class PredictionResult(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     ring_number = Column(Integer, ForeignKey("ring_summary.ring_number"), nullable=False)
-    timestamp = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    timestamp = Column(Float, default=time.time)
 
     # Model Information
     model_name = Column(String(100), nullable=False)
@@ -57,15 +57,46 @@ class PredictionResult(Base):
     prediction_error = Column(Float)  # mm (predicted - actual)
     absolute_error = Column(Float)  # mm (|predicted - actual|)
 
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    created_at = Column(Float, default=time.time)
 
     __table_args__ = (
-        Index("idx_prediction_ring_number", "ring_number"),
-        Index("idx_prediction_timestamp", "timestamp"),
+        # "Latest prediction for ring N by model M"; the leading ring_number
+        # also serves plain per-ring lookups. PostgreSQL carries the commonly
+        # projected values in the index leaf (index-only scan).
+        Index(
+            "idx_pred_ring_model_cover",
+            "ring_number",
+            "model_name",
+            "timestamp",
+            postgresql_include=[
+                "predicted_settlement",
+                "settlement_lower_bound",
+                "settlement_upper_bound",
+                "prediction_confidence",
+                "quality_flag",
+            ],
+        ),
+        # BRIN on PostgreSQL (insertion-ordered timestamps), B-tree elsewhere
+        Index("idx_prediction_timestamp", "timestamp").ddl_if(callable_=not_postgresql),
+        Index(
+            "idx_prediction_ts_brin",
+            "timestamp",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ).ddl_if(dialect="postgresql"),
         Index("idx_prediction_model_version", "model_version"),
         Index("idx_prediction_quality_flag", "quality_flag"),
     )
 
+    # Keys of to_dict(), in order; used by bulk_to_dict()
+    EXPORT_COLUMNS = (
+        "id", "ring_number", "timestamp", "model_name", "model_version", "model_type",
+        "geological_zone", "predicted_settlement", "settlement_lower_bound",
+        "settlement_upper_bound", "predicted_displacement", "predicted_groundwater_change",
+        "prediction_confidence", "inference_time_ms", "feature_completeness", "quality_flag",
+        "actual_settlement", "prediction_error", "absolute_error",
+    )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -106,8 +137,15 @@ class PredictionResult(Base):
             self.absolute_error = abs(self.prediction_error)
 
     def __repr__(self) -> str:
+        predicted = (
+            f"{self.predicted_settlement:.1f}mm"
+            if self.predicted_settlement is not None else "n/a"
+        )
+        actual = (
+            f"{self.actual_settlement:.1f}mm"
+            if self.actual_settlement is not None else "pending"
+        )
         return (
             f"<PredictionResult(ring={self.ring_number}, "
-            f"model={self.model_name}, predicted={self.predicted_settlement:.1f}mm, "
-            f"actual={self.actual_settlement:.1f}mm if self.actual_settlement else 'pending')>"
+            f"model={self.model_name}, predicted={predicted}, actual={actual})>"
         )
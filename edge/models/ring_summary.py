@@ -3,15 +3,17 @@ T054: Ring Summary Model
 Represents aggregated, aligned data for each tunnel ring
 This is the core entity for analysis and ML features
 """
-from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, Float, String, Index
-from sqlalchemy.ext.declarative import declarative_base
+import time
+from typing import Any, Optional, Sequence
 
-Base = declarative_base()
+import numpy as np
+from sqlalchemy import Column, Integer, Float, String, Index, select
 
+from .base import Base, SensorFloat
+from .bulk import BulkExportMixin
 
-class RingSummary(Base):
+
+class RingSummary(BulkExportMixin, Base):
     """
     Aggregated ring data with aligned PLC, attitude, and monitoring data
     One record per ring excavation cycle
@@ -25,55 +27,122 @@ class RingSummary(Base):
     end_time = Column(Float, nullable=False)
 
     # PLC Aggregated Features
-    mean_thrust = Column(Float)
-    max_thrust = Column(Float)
-    min_thrust = Column(Float)
-    std_thrust = Column(Float)
-    mean_torque = Column(Float)
-    max_torque = Column(Float)
-    min_torque = Column(Float)
-    std_torque = Column(Float)
-    mean_chamber_pressure = Column(Float)
-    max_chamber_pressure = Column(Float)
-    std_chamber_pressure = Column(Float)
-    mean_advance_rate = Column(Float)
-    max_advance_rate = Column(Float)
-    mean_grout_pressure = Column(Float)
-    grout_volume = Column(Float)
+    mean_thrust = Column(SensorFloat)
+    max_thrust = Column(SensorFloat)
+    min_thrust = Column(SensorFloat)
+    std_thrust = Column(SensorFloat)
+    mean_torque = Column(SensorFloat)
+    max_torque = Column(SensorFloat)
+    min_torque = Column(SensorFloat)
+    std_torque = Column(SensorFloat)
+    mean_chamber_pressure = Column(SensorFloat)
+    max_chamber_pressure = Column(SensorFloat)
+    std_chamber_pressure = Column(SensorFloat)
+    mean_advance_rate = Column(SensorFloat)
+    max_advance_rate = Column(SensorFloat)
+    mean_grout_pressure = Column(SensorFloat)
+    grout_volume = Column(SensorFloat)
 
     # Attitude Aggregated Features
-    mean_pitch = Column(Float)
-    mean_roll = Column(Float)
-    mean_yaw = Column(Float)
-    max_pitch = Column(Float)
-    max_roll = Column(Float)
-    horizontal_deviation_max = Column(Float)
-    vertical_deviation_max = Column(Float)
+    mean_pitch = Column(SensorFloat)
+    mean_roll = Column(SensorFloat)
+    mean_yaw = Column(SensorFloat)
+    max_pitch = Column(SensorFloat)
+    max_roll = Column(SensorFloat)
+    horizontal_deviation_max = Column(SensorFloat)
+    vertical_deviation_max = Column(SensorFloat)
 
     # Derived Engineering Indicators
-    specific_energy = Column(Float)  # kJ/m³
-    ground_loss_rate = Column(Float)  # m³
-    volume_loss_ratio = Column(Float)  # %
+    specific_energy = Column(SensorFloat)  # kJ/m³
+    ground_loss_rate = Column(SensorFloat)  # m³
+    volume_loss_ratio = Column(SensorFloat)  # %
 
     # Time-Lagged Monitoring Data
-    settlement_value = Column(Float)  # mm
-    displacement_value = Column(Float)  # mm
-    groundwater_level = Column(Float)  # m
+    settlement_value = Column(SensorFloat)  # mm
+    displacement_value = Column(SensorFloat)  # mm
+    groundwater_level = Column(SensorFloat)  # m
 
     # Metadata
     data_completeness_flag = Column(String(20), default="incomplete")
     geological_zone = Column(String(50))
     synced_to_cloud = Column(Integer, default=0)
     cloud_sync_at = Column(Float, nullable=True)
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
-    updated_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    created_at = Column(Float, default=time.time)
+    updated_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_ring_number", "ring_number"),
         Index("idx_ring_sync_status", "synced_to_cloud"),
+        # Partial index covering the synced-ring subquery used by data cleanup
+        Index(
+            "idx_ring_synced_rings", "ring_number",
+            sqlite_where=synced_to_cloud == 1,
+            postgresql_where=synced_to_cloud == 1,
+        ),
+        # Partial index serving get_unsynced_rings() in ring_number order;
+        # holds only the (few) rings still waiting for cloud sync
+        Index(
+            "idx_ring_unsynced_rings", "ring_number",
+            sqlite_where=synced_to_cloud == 0,
+            postgresql_where=synced_to_cloud == 0,
+        ),
         Index("idx_ring_geological_zone", "geological_zone"),
     )
 
+    # Keys of to_dict(), in order; used by bulk_to_dict()
+    EXPORT_COLUMNS = (
+        "ring_number", "start_time", "end_time", "mean_thrust", "max_thrust", "mean_torque",
+        "mean_chamber_pressure", "mean_advance_rate", "settlement_value", "specific_energy",
+        "ground_loss_rate", "geological_zone", "data_completeness_flag",
+    )
+
+    # Numeric per-ring features, in matrix column order for load_feature_matrix()
+    FEATURE_COLUMNS = (
+        "mean_thrust", "max_thrust", "min_thrust", "std_thrust",
+        "mean_torque", "max_torque", "min_torque", "std_torque",
+        "mean_chamber_pressure", "max_chamber_pressure", "std_chamber_pressure",
+        "mean_advance_rate", "max_advance_rate", "mean_grout_pressure", "grout_volume",
+        "mean_pitch", "mean_roll", "mean_yaw", "max_pitch", "max_roll",
+        "horizontal_deviation_max", "vertical_deviation_max",
+        "specific_energy", "ground_loss_rate", "volume_loss_ratio",
+        "settlement_value", "displacement_value", "groundwater_level",
+    )
+
+    @classmethod
+    def load_feature_matrix(
+        cls,
+        session: Any,
+        start_ring: int,
+        end_ring: int,
+        columns: Optional[Sequence[str]] = None,
+    ) -> np.ndarray:
+        """
+        Load features for a ring range as a dense float matrix.
+
+        Runs one Core select over the requested columns only (no ORM
+        instances) and converts the rows in a single numpy call.
+
+        Args:
+            session: SQLAlchemy session
+            start_ring: First ring (inclusive)
+            end_ring: Last ring (inclusive)
+            columns: Feature columns (defaults to FEATURE_COLUMNS)
+
+        Returns:
+            Array of shape (n_rings, n_columns) ordered by ring_number;
+            missing values are NaN
+        """
+        columns = tuple(columns or cls.FEATURE_COLUMNS)
+        stmt = (
+            select(*[getattr(cls, c) for c in columns])
+            .where(cls.ring_number.between(start_ring, end_ring))
+            .order_by(cls.ring_number)
+        )
+        rows = session.execute(stmt).all()
+        if not rows:
+            return np.empty((0, len(columns)), dtype=np.float64)
+        return np.array(rows, dtype=np.float64)
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -4,12 +4,11 @@ Stores warning events generated by the edge warning system
 Implements Feature 003 - Real-Time Warning System
 """
 import json
-from datetime import datetime
+import time
 from typing import Optional, List
 from sqlalchemy import Column, Integer, Float, String, Boolean, Index
-from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+from .base import Base
 
 
 class WarningEvent(Base):
@@ -78,8 +77,8 @@ class WarningEvent(Base):
     notification_timestamp = Column(Float)
 
     # Metadata
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
-    updated_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    created_at = Column(Float, default=time.time)
+    updated_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_warning_events_ring", "ring_number"),
@@ -115,27 +114,27 @@ class WarningEvent(Base):
     def acknowledge(self, user_id: str):
         """Mark warning as acknowledged"""
         self.status = "acknowledged"
-        self.acknowledged_at = datetime.utcnow().timestamp()
+        self.acknowledged_at = time.time()
         self.acknowledged_by = user_id
-        self.updated_at = datetime.utcnow().timestamp()
+        self.updated_at = time.time()
 
     def resolve(self, user_id: str, notes: Optional[str] = None):
         """Mark warning as resolved"""
         self.status = "resolved"
-        self.resolved_at = datetime.utcnow().timestamp()
+        self.resolved_at = time.time()
         self.resolved_by = user_id
         if notes:
             self.resolution_notes = notes
-        self.updated_at = datetime.utcnow().timestamp()
+        self.updated_at = time.time()
 
     def mark_as_false_positive(self, user_id: str, notes: Optional[str] = None):
         """Mark warning as false positive"""
         self.status = "false_positive"
-        self.resolved_at = datetime.utcnow().timestamp()
+        self.resolved_at = time.time()
         self.resolved_by = user_id
         if notes:
             self.resolution_notes = notes
-        self.updated_at = datetime.utcnow().timestamp()
+        self.updated_at = time.time()
 
     def to_dict(self) -> dict:
         """Convert to dictionary for API response"""
@@ -3,13 +3,13 @@ Warning Threshold Model
 Configurable thresholds for warning system
 Implements Feature 003 - Real-Time Warning System
 """
-import json
-from datetime import datetime
+import time
 from typing import Optional, List, Dict, Any
+
+import numpy as np
 from sqlalchemy import Column, Integer, Float, String, Boolean, Index
-from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+from .base import Base, json_type
 
 
 class WarningThreshold(Base):
@@ -55,17 +55,17 @@ class WarningThreshold(Base):
     min_duration_seconds = Column(Integer, default=60)
 
     # Notification Routing
-    attention_channels = Column(String, default='["mqtt"]')
-    warning_channels = Column(String, default='["mqtt", "email"]')
-    alarm_channels = Column(String, default='["mqtt", "email", "sms"]')
+    attention_channels = Column(json_type(), default=lambda: ["mqtt"])
+    warning_channels = Column(json_type(), default=lambda: ["mqtt", "email"])
+    alarm_channels = Column(json_type(), default=lambda: ["mqtt", "email", "sms"])
 
     # Status
     enabled = Column(Boolean, default=True)
     description = Column(String)
 
     # Metadata
-    created_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
-    updated_at = Column(Float, default=lambda: datetime.utcnow().timestamp())
+    created_at = Column(Float, default=time.time)
+    updated_at = Column(Float, default=time.time)
 
     __table_args__ = (
         Index("idx_thresholds_indicator_zone", "indicator_name", "geological_zone", unique=True),
@@ -74,25 +74,35 @@ class WarningThreshold(Base):
         Index("idx_thresholds_zone", "geological_zone"),
     )
 
+    # Level -> attribute dispatch (replaces per-call if/elif string compares)
+    _CHANNEL_ATTRS = {
+        "ATTENTION": "attention_channels",
+        "WARNING": "warning_channels",
+        "ALARM": "alarm_channels",
+    }
+    _THRESHOLD_ATTRS = {
+        (level, bound): f"{level.lower()}_{bound}"
+        for level in ("ATTENTION", "WARNING", "ALARM")
+        for bound in ("lower", "upper")
+    }
+
     def get_notification_channels(self, level: str) -> List[str]:
-        """Get notification channels for specific warning level"""
-        if level == "ATTENTION":
-            return json.loads(self.attention_channels) if self.attention_channels else []
-        elif level == "WARNING":
-            return json.loads(self.warning_channels) if self.warning_channels else []
-        elif level == "ALARM":
-            return json.loads(self.alarm_channels) if self.alarm_channels else []
-        return []
+        """
+        Get notification channels for specific warning level
+
+        Channel lists are decoded once when the row is loaded (JSON column type);
+        a copy is returned, so use set_notification_channels() to change them.
+        """
+        attr = self._CHANNEL_ATTRS.get(level)
+        if attr is None:
+            return []
+        return list(getattr(self, attr) or [])
 
     def set_notification_channels(self, level: str, channels: List[str]):
         """Set notification channels for specific warning level"""
-        channels_json = json.dumps(channels)
-        if level == "ATTENTION":
-            self.attention_channels = channels_json
-        elif level == "WARNING":
-            self.warning_channels = channels_json
-        elif level == "ALARM":
-            self.alarm_channels = channels_json
+        attr = self._CHANNEL_ATTRS.get(level)
+        if attr is not None:
+            setattr(self, attr, list(channels))
 
     def evaluate_threshold(self, value: float) -> Optional[str]:
         """
@@ -121,6 +131,36 @@ class WarningThreshold(Base):
 
         return None
 
+    def evaluate_batch(self, values) -> np.ndarray:
+        """
+        Evaluate many values against thresholds in one vectorized pass
+
+        Same precedence as evaluate_threshold (ALARM > WARNING > ATTENTION),
+        using array comparisons instead of a per-value Python branch chain.
+
+        Args:
+            values: Sequence or array of indicator values
+
+        Returns:
+            Object array of warning levels, None where the value is normal
+        """
+        values = np.asarray(values, dtype=np.float64)
+
+        def outside(lower: Optional[float], upper: Optional[float]) -> np.ndarray:
+            lo = -np.inf if lower is None else lower
+            hi = np.inf if upper is None else upper
+            return (values < lo) | (values > hi)
+
+        return np.select(
+            [
+                outside(self.alarm_lower, self.alarm_upper),
+                outside(self.warning_lower, self.warning_upper),
+                outside(self.attention_lower, self.attention_upper),
+            ],
+            ["ALARM", "WARNING", "ATTENTION"],
+            default=None,
+        )
+
     def get_threshold_value(self, level: str, bound_type: str) -> Optional[float]:
         """
         Get threshold value for specific level and bound type
@@ -132,13 +172,11 @@ class WarningThreshold(Base):
         Returns:
             Threshold value or None
         """
-        if level == "ATTENTION":
-            return self.attention_lower if bound_type == "lower" else self.attention_upper
-        elif level == "WARNING":
-            return self.warning_lower if bound_type == "lower" else self.warning_upper
-        elif level == "ALARM":
-            return self.alarm_lower if bound_type == "lower" else self.alarm_upper
-        return None
+        bound = "lower" if bound_type == "lower" else "upper"
+        attr = self._THRESHOLD_ATTRS.get((level, bound))
+        if attr is None:
+            return None
+        return getattr(self, attr)
 
     def calculate_hysteresis_bounds(self, threshold: float) -> tuple:
         """
@@ -13,15 +13,26 @@ Usage:
     python batch_align_rings.py --ring-list 100,101,105,110
     python batch_align_rings.py --all --force
     python batch_align_rings.py --incomplete-only
+    python batch_align_rings.py --all --force --workers 4
 """
-import asyncio
 import argparse
+import atexit
+import bisect
 import logging
+import os
+import queue
 import sys
-from typing import List, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from logging.handlers import QueueHandler, QueueListener
+from itertools import chain
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -30,7 +41,7 @@ from edge.database.manager import DatabaseManager
 from edge.services.aligner.ring_detector import RingBoundaryDetector
 from edge.services.aligner.plc_aggregator import PLCAggregator
 from edge.services.aligner.attitude_aggregator import AttitudeAggregator
-from edge.services.aligner.derived_indicators import DerivedIndicatorsCalculator
+from edge.services.aligner.derived_indicators import DerivedIndicatorCalculator
 from edge.services.aligner.settlement_associator import SettlementAssociator
 from edge.services.aligner.ring_summary_writer import RingSummaryWriter
 
@@ -45,6 +56,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows per fetchmany() batch when reading ring-number lists
+FETCH_BATCH_SIZE = 10_000
+
+# Sink handlers configured above; start_log_listener() moves them behind a queue
+_LOG_HANDLERS = tuple(logging.getLogger().handlers)
+_log_listener: Optional[QueueListener] = None
+
+
+def start_log_listener() -> None:
+    """
+    Route root logging through a queue so file I/O runs on a listener thread.
+
+    The aligning thread only enqueues records; formatting and the file
+    handler's write/flush happen on the QueueListener thread.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logging.getLogger().handlers = [QueueHandler(log_queue)]
+    _log_listener = QueueListener(log_queue, *_LOG_HANDLERS, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+@dataclass(slots=True)
+class AlignmentStats:
+    """Batch alignment counters (slotted: plain attribute access per ring)"""
+    total_processed: int = 0
+    successful: int = 0
+    failed: int = 0
+    skipped: int = 0
+    rings_with_data: int = 0
+    rings_without_data: int = 0
+
 
 class BatchRingAligner:
     """Batch ring alignment processor"""
@@ -71,48 +118,100 @@ class BatchRingAligner:
         self.ring_detector = RingBoundaryDetector()
         self.plc_aggregator = PLCAggregator()
         self.attitude_aggregator = AttitudeAggregator()
-        self.derived_calculator = DerivedIndicatorsCalculator()
+        self.derived_calculator = DerivedIndicatorCalculator()
         self.settlement_associator = SettlementAssociator()
         self.summary_writer = RingSummaryWriter()
 
         # Statistics
-        self.stats = {
-            'total_processed': 0,
-            'successful': 0,
-            'failed': 0,
-            'skipped': 0,
-            'rings_with_data': 0,
-            'rings_without_data': 0
-        }
+        self.stats = AlignmentStats()
 
-    def get_all_ring_numbers(self) -> List[int]:
-        """Get all distinct ring numbers from plc_logs"""
+        # Emit an INFO progress line every N finished rings (set per batch)
+        self._progress_every = 10
+
+        # Ring numbers already in ring_summary, prefetched once per batch
+        self._existing_rings: Optional[Set[int]] = None
+
+        # (ring_number, end_time) of ring_summary as parallel sorted lists,
+        # prefetched once per batch for previous-ring lookups
+        self._summary_ring_numbers: Optional[List[int]] = None
+        self._summary_end_times: List[float] = []
+
+        # Geological zone per ring, prefetched once per batch
+        self._zone_by_ring: Dict[int, str] = {}
+
+    def _fetch_column(self, query: str) -> List[Any]:
+        """
+        Run a single-column query and return its values as a flat list.
+
+        Rows come back as plain tuples (the cursor bypasses the connection's
+        sqlite3.Row factory) and are flattened in fetchmany batches.
+        """
+        values: List[Any] = []
         with self.db_manager.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT DISTINCT ring_number
-                FROM plc_logs
-                WHERE ring_number IS NOT NULL
-                ORDER BY ring_number
-            """)
-            results = cursor.fetchall()
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query)
+            while True:
+                batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+                if not batch:
+                    return values
+                values.extend(chain.from_iterable(batch))
 
-        return [row['ring_number'] for row in results]
+    def get_all_ring_numbers(self) -> List[int]:
+        """Get all distinct ring numbers from plc_logs"""
+        return self._fetch_column("""
+            SELECT DISTINCT ring_number
+            FROM plc_logs
+            WHERE ring_number IS NOT NULL
+            ORDER BY ring_number
+        """)
 
     def get_incomplete_ring_numbers(self) -> List[int]:
         """Get ring numbers with incomplete data"""
+        return self._fetch_column("""
+            SELECT ring_number
+            FROM ring_summary
+            WHERE data_completeness_flag != 'complete'
+            ORDER BY ring_number
+        """)
+
+    def load_existing_rings(self) -> None:
+        """Prefetch all summarized ring numbers so ring_exists() needs no query"""
+        self._existing_rings = set(self._fetch_column("SELECT ring_number FROM ring_summary"))
+
+    def load_ring_end_times(self) -> None:
+        """Prefetch ring end times so _get_previous_ring_end_time() is a bisect"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(
+                "SELECT ring_number, end_time FROM ring_summary ORDER BY ring_number"
+            ).fetchall()
+
+        self._summary_ring_numbers = [row[0] for row in rows]
+        self._summary_end_times = [row[1] for row in rows]
+
+    def load_geological_zones(self) -> None:
+        """
+        Prefetch geological zones in one query so the per-ring lookup is a dict hit.
+
+        Zones are tagged on ring_summary (manual logs / config import); there is
+        no separate zone table on the edge device. Reprocessing a ring keeps the
+        zone it already carries instead of overwriting it with NULL.
+        """
         with self.db_manager.get_connection() as conn:
             cursor = conn.execute("""
-                SELECT ring_number
+                SELECT ring_number, geological_zone
                 FROM ring_summary
-                WHERE data_completeness_flag != 'complete'
-                ORDER BY ring_number
+                WHERE geological_zone IS NOT NULL
             """)
-            results = cursor.fetchall()
-
-        return [row['ring_number'] for row in results]
+            self._zone_by_ring = {row['ring_number']: row['geological_zone'] for row in cursor}
 
     def ring_exists(self, ring_number: int) -> bool:
         """Check if ring summary exists"""
+        if self._existing_rings is not None:
+            return ring_number in self._existing_rings
+
         with self.db_manager.get_connection() as conn:
             cursor = conn.execute(
                 "SELECT COUNT(*) as count FROM ring_summary WHERE ring_number = ?",
@@ -133,36 +232,45 @@ class BatchRingAligner:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Processing ring {ring_number}...")
+            logger.debug("Processing ring %d...", ring_number)
 
             # Check if already exists and skip if not forcing
             if self.ring_exists(ring_number) and not self.force_reprocess:
-                logger.info(f"Ring {ring_number} already exists, skipping (use --force to reprocess)")
-                self.stats['skipped'] += 1
+                logger.debug(
+                    "Ring %d already exists, skipping (use --force to reprocess)", ring_number
+                )
+                self.stats.skipped += 1
                 return True
 
             # Detect ring boundaries
             # For batch processing, we need to get the previous ring's end time
             prev_ring_end = self._get_previous_ring_end_time(ring_number)
 
-            boundary = self.ring_detector.detect_ring_boundary(
-                self.db_manager, ring_number, prev_ring_end
-            )
+            try:
+                boundary = self.ring_detector.detect_ring_boundary(
+                    self.db_manager, ring_number, last_ring_end_time=prev_ring_end
+                )
+            except ValueError as e:
+                # No previous ring to search from
+                logger.warning(f"Ring {ring_number}: {e}")
+                boundary = None
 
             if not boundary:
                 logger.warning(f"Could not detect boundaries for ring {ring_number}")
-                self.stats['rings_without_data'] += 1
+                self.stats.rings_without_data += 1
                 return False
 
             start_time, end_time = boundary
-            logger.info(
-                f"Ring {ring_number} boundaries: "
-                f"{datetime.fromtimestamp(start_time)} - {datetime.fromtimestamp(end_time)}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Ring {ring_number} boundaries: "
+                    f"{datetime.fromtimestamp(start_time)} - {datetime.fromtimestamp(end_time)}"
+                )
 
             # Aggregate PLC data
-            plc_features = self.plc_aggregator.aggregate_ring_data(
-                self.db_manager, ring_number, start_time, end_time
+            tag_names, values = self._load_plc_arrays(start_time, end_time)
+            plc_features = self.plc_aggregator.aggregate_ring_arrays(
+                ring_number, tag_names, values
             )
 
             if not plc_features:
@@ -177,7 +285,7 @@ class BatchRingAligner:
             derived_indicators = {}
             if plc_features:
                 derived_indicators = self.derived_calculator.calculate_all_indicators(
-                    plc_features, attitude_features, duration=(end_time - start_time)
+                    plc_features, duration_minutes=(end_time - start_time) / 60
                 )
 
             # Associate settlement data
@@ -191,7 +299,7 @@ class BatchRingAligner:
             # Write ring summary
             if not self.dry_run:
                 success = self.summary_writer.write_ring_summary(
-                    db_manager=self.db_manager,
+                    db=self.db_manager,
                     ring_number=ring_number,
                     start_time=start_time,
                     end_time=end_time,
@@ -205,19 +313,57 @@ class BatchRingAligner:
                 if not success:
                     logger.error(f"Failed to write ring summary for ring {ring_number}")
                     return False
+
+                if self._existing_rings is not None:
+                    self._existing_rings.add(ring_number)
+                self._remember_ring_end_time(ring_number, end_time)
             else:
-                logger.info(f"[DRY RUN] Would write ring summary for ring {ring_number}")
+                logger.debug("[DRY RUN] Would write ring summary for ring %d", ring_number)
 
-            logger.info(f"Successfully processed ring {ring_number}")
-            self.stats['rings_with_data'] += 1
+            logger.debug("Successfully processed ring %d", ring_number)
+            self.stats.rings_with_data += 1
             return True
 
         except Exception as e:
             logger.error(f"Error processing ring {ring_number}: {e}", exc_info=True)
             return False
 
+    def _load_plc_arrays(
+        self, start_time: float, end_time: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch a ring's PLC window as column arrays in one query.
+
+        Rows come back as plain tuples (no sqlite3.Row) and are transposed
+        into a tag-name array and a float64 value array (NULL -> NaN), the
+        layout PLCAggregator.aggregate_ring_arrays() and numeric kernels take.
+        """
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(
+                """
+                SELECT tag_name, value
+                FROM plc_logs
+                WHERE timestamp >= ?
+                  AND timestamp <= ?
+                  AND data_quality_code < 2  -- not rejected/missing
+                """,
+                (start_time, end_time)
+            ).fetchall()
+
+        if not rows:
+            return np.empty(0, dtype=str), np.empty(0, dtype=np.float64)
+
+        tag_names, values = zip(*rows)
+        return np.array(tag_names), np.array(values, dtype=np.float64)
+
     def _get_previous_ring_end_time(self, ring_number: int) -> Optional[float]:
         """Get end time of previous ring"""
+        if self._summary_ring_numbers is not None:
+            index = bisect.bisect_left(self._summary_ring_numbers, ring_number) - 1
+            return self._summary_end_times[index] if index >= 0 else None
+
         with self.db_manager.get_connection() as conn:
             cursor = conn.execute(
                 """
@@ -233,52 +379,107 @@ class BatchRingAligner:
 
         return result['end_time'] if result else None
 
+    def _remember_ring_end_time(self, ring_number: int, end_time: float) -> None:
+        """Keep the prefetched end-time lists in step with a written summary"""
+        if self._summary_ring_numbers is None:
+            return
+
+        index = bisect.bisect_left(self._summary_ring_numbers, ring_number)
+        if (index < len(self._summary_ring_numbers)
+                and self._summary_ring_numbers[index] == ring_number):
+            self._summary_end_times[index] = end_time
+        else:
+            self._summary_ring_numbers.insert(index, ring_number)
+            self._summary_end_times.insert(index, end_time)
+
     def _get_geological_zone(self, ring_number: int) -> Optional[str]:
-        """Get geological zone for ring (from manual logs or config)"""
-        # This is a placeholder - in real implementation, would query
-        # geological zone database or manual logs
-        return None
+        """
+        Get geological zone for ring from the prefetched map.
 
-    async def process_rings(self, ring_numbers: List[int]) -> None:
+        Called once per ring in the alignment loop: keep this a dict lookup
+        filled by load_geological_zones(), never a per-call query.
+        """
+        return self._zone_by_ring.get(ring_number)
+
+    def process_rings(self, ring_numbers: List[int], workers: int = 1) -> None:
         """
         Process multiple rings.
 
         Args:
             ring_numbers: List of ring numbers to process
+            workers: Worker processes; 1 aligns sequentially in this process
         """
         logger.info(f"Starting batch alignment for {len(ring_numbers)} rings")
         logger.info(f"Force reprocess: {self.force_reprocess}")
         logger.info(f"Dry run mode: {self.dry_run}")
+        logger.info(f"Workers: {workers}")
 
-        start_time = datetime.now()
-
-        for ring_number in ring_numbers:
-            self.stats['total_processed'] += 1
-
-            success = self.align_ring(ring_number)
+        # About 100 progress lines per batch regardless of its size
+        self._progress_every = max(1, len(ring_numbers) // 100)
+        start_time = time.monotonic()
 
-            if success:
-                self.stats['successful'] += 1
-            else:
-                self.stats['failed'] += 1
-
-            # Progress indicator
-            if self.stats['total_processed'] % 10 == 0:
-                self._print_progress()
+        if workers <= 1:
+            self.load_existing_rings()
+            self.load_ring_end_times()
+            self.load_geological_zones()
+            for ring_number in ring_numbers:
+                self._record_result(self.align_ring(ring_number))
+        else:
+            self._process_rings_parallel(ring_numbers, workers)
 
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_time
 
         # Print final statistics
         self._print_final_statistics(duration)
 
+    def _process_rings_parallel(self, ring_numbers: List[int], workers: int) -> None:
+        """
+        Align rings across a process pool.
+
+        Each worker process builds its own BatchRingAligner (database handle
+        and alignment components) once, then aligns the rings it is handed.
+        Per-ring stat deltas are merged back into self.stats.
+        """
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.db_manager.db_path, self.force_reprocess, self.dry_run),
+        ) as executor:
+            futures = {
+                executor.submit(_align_ring_worker, ring_number): ring_number
+                for ring_number in ring_numbers
+            }
+            for future in as_completed(futures):
+                try:
+                    success, stats_delta = future.result()
+                except Exception as e:
+                    logger.error(f"Worker failed on ring {futures[future]}: {e}")
+                    success, stats_delta = False, {}
+
+                for key, value in stats_delta.items():
+                    setattr(self.stats, key, getattr(self.stats, key) + value)
+                self._record_result(success)
+
+    def _record_result(self, success: bool) -> None:
+        """Count a finished ring and periodically report progress"""
+        self.stats.total_processed += 1
+
+        if success:
+            self.stats.successful += 1
+        else:
+            self.stats.failed += 1
+
+        # Progress indicator
+        if self.stats.total_processed % self._progress_every == 0:
+            self._print_progress()
+
     def _print_progress(self) -> None:
         """Print progress update"""
         logger.info(
-            f"Progress: {self.stats['total_processed']} processed, "
-            f"{self.stats['successful']} successful, "
-            f"{self.stats['failed']} failed, "
-            f"{self.stats['skipped']} skipped"
+            f"Progress: {self.stats.total_processed} processed, "
+            f"{self.stats.successful} successful, "
+            f"{self.stats.failed} failed, "
+            f"{self.stats.skipped} skipped"
         )
 
     def _print_final_statistics(self, duration: float) -> None:
@@ -286,16 +487,16 @@ class BatchRingAligner:
         logger.info("\n" + "=" * 60)
         logger.info("BATCH ALIGNMENT COMPLETE")
         logger.info("=" * 60)
-        logger.info(f"Total processed:      {self.stats['total_processed']}")
-        logger.info(f"Successful:           {self.stats['successful']}")
-        logger.info(f"Failed:               {self.stats['failed']}")
-        logger.info(f"Skipped:              {self.stats['skipped']}")
-        logger.info(f"Rings with data:      {self.stats['rings_with_data']}")
-        logger.info(f"Rings without data:   {self.stats['rings_without_data']}")
+        logger.info(f"Total processed:      {self.stats.total_processed}")
+        logger.info(f"Successful:           {self.stats.successful}")
+        logger.info(f"Failed:               {self.stats.failed}")
+        logger.info(f"Skipped:              {self.stats.skipped}")
+        logger.info(f"Rings with data:      {self.stats.rings_with_data}")
+        logger.info(f"Rings without data:   {self.stats.rings_without_data}")
         logger.info(f"Duration:             {duration:.2f} seconds")
 
-        if self.stats['total_processed'] > 0:
-            avg_time = duration / self.stats['total_processed']
+        if self.stats.total_processed > 0:
+            avg_time = duration / self.stats.total_processed
             logger.info(f"Average per ring:     {avg_time:.2f} seconds")
 
         # Component statistics
@@ -307,6 +508,43 @@ class BatchRingAligner:
         logger.info("=" * 60)
 
 
+# Per-process aligner used by pool workers (built once by _init_worker)
+_worker_aligner: Optional[BatchRingAligner] = None
+
+
+def _init_worker(db_path: str, force_reprocess: bool, dry_run: bool) -> None:
+    """Process pool initializer: open this worker's own database handle"""
+    global _worker_aligner
+    # Forked workers inherit the parent's QueueHandler but not its listener
+    # thread; log straight to the sinks instead
+    logging.getLogger().handlers = list(_LOG_HANDLERS)
+    _worker_aligner = BatchRingAligner(
+        db_path=db_path,
+        force_reprocess=force_reprocess,
+        dry_run=dry_run
+    )
+    _worker_aligner.load_existing_rings()
+    _worker_aligner.load_ring_end_times()
+    _worker_aligner.load_geological_zones()
+
+
+def _align_ring_worker(ring_number: int) -> Tuple[bool, Dict[str, int]]:
+    """
+    Align one ring in a pool worker.
+
+    Returns:
+        (success, stat deltas recorded by align_ring)
+    """
+    before = asdict(_worker_aligner.stats)
+    success = _worker_aligner.align_ring(ring_number)
+    delta = {
+        key: value - before[key]
+        for key, value in asdict(_worker_aligner.stats).items()
+        if value != before[key]
+    }
+    return success, delta
+
+
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -328,6 +566,9 @@ Examples:
 
   # Dry run to see what would be processed
   python batch_align_rings.py --start-ring 100 --end-ring 105 --dry-run
+
+  # Re-align all rings on 4 processes
+  python batch_align_rings.py --all --force --workers 4
         """
     )
 
@@ -377,6 +618,17 @@ Examples:
         action='store_true',
         help='Dry run mode (no writes to database)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help=(
+            'Worker processes for alignment (default: 1; 0 = CPU count). '
+            'Boundary detection starts from the previous ring\'s stored end '
+            'time, so use more than 1 when those summaries already exist '
+            '(--force re-processing, --incomplete-only)'
+        )
+    )
     parser.add_argument(
         '--log-level',
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -396,12 +648,13 @@ Examples:
     return args
 
 
-async def main():
+def main():
     """Main entry point"""
     args = parse_arguments()
 
     # Set log level
     logging.getLogger().setLevel(args.log_level)
+    start_log_listener()
 
     # Create aligner
     aligner = BatchRingAligner(
@@ -434,8 +687,9 @@ async def main():
         return
 
     # Process rings
-    await aligner.process_rings(ring_numbers)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    aligner.process_rings(ring_numbers, workers=workers)
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    main()
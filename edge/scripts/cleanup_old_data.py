@@ -17,13 +17,15 @@ Usage:
     python cleanup_old_data.py --retention-days 90
     python cleanup_old_data.py --delete-synced
     python cleanup_old_data.py --vacuum
+    python cleanup_old_data.py --vacuum --full-vacuum
 """
 import argparse
 import logging
+import sqlite3
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
@@ -42,6 +44,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Rows removed per DELETE transaction; bounds WAL growth and lock hold time
+DELETE_CHUNK_SIZE = 50_000
+
+# Time column per table for oldest/newest statistics (default: timestamp)
+TIME_COLUMNS = {'ring_summary': 'end_time'}
+
+# Tables the retention policy may delete from (names are interpolated into SQL)
+RETENTION_TABLES = frozenset({'plc_logs', 'attitude_logs', 'monitoring_logs'})
+
+# Minimum seconds between per-table ANALYZE runs after cleanup
+ANALYZE_INTERVAL_SECONDS = 86_400
+
+# Indexes behind the cleanup and alignment hot queries. Names match the
+# SQLAlchemy models so databases built by create_all() are left untouched;
+# this only back-fills databases created from older schemas.
+HOT_QUERY_INDEXES = {
+    'ix_plc_logs_ring_number': "plc_logs(ring_number)",
+    'ix_plc_logs_timestamp_quality': "plc_logs(timestamp, data_quality_code)",
+    'ix_attitude_logs_timestamp': "attitude_logs(timestamp)",
+    'ix_monitoring_logs_timestamp': "monitoring_logs(timestamp)",
+    # Partial, covering the synced-ring subquery in cleanup_synced_data()
+    'idx_ring_synced_rings': "ring_summary(ring_number) WHERE synced_to_cloud = 1",
+}
+
 
 class DataCleanupManager:
     """Manages data cleanup and retention policies"""
@@ -69,16 +95,40 @@ class DataCleanupManager:
             'space_reclaimed_mb': 0.0
         }
 
-    def get_table_info(self, table_name: str) -> Dict[str, Any]:
-        """Get information about a table"""
+    def get_table_info(self, table_name: str, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get information about a table.
+
+        The row count comes from sqlite_stat1 (maintained by ANALYZE) when
+        available, avoiding a full COUNT(*) scan; otherwise, or when exact
+        is set, it is counted.
+        Oldest/newest use separate MIN and MAX subqueries, which SQLite
+        answers with one index seek each (a combined MIN, MAX aggregate
+        scans the table).
+        """
+        time_column = TIME_COLUMNS.get(table_name, 'timestamp')
+
         with self.db_manager.get_connection() as conn:
-            # Count total records
-            cursor = conn.execute(f"SELECT COUNT(*) as count FROM {table_name}")
-            total_count = cursor.fetchone()['count']
+            total_count = None
+            if not exact:
+                try:
+                    cursor = conn.execute(
+                        "SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table_name,)
+                    )
+                    row = cursor.fetchone()
+                    if row:
+                        total_count = int(row['stat'].split()[0])
+                except sqlite3.OperationalError:
+                    pass  # No sqlite_stat1 until the first ANALYZE
+
+            estimated = total_count is not None
+            if not estimated:
+                cursor = conn.execute(f"SELECT COUNT(*) as count FROM {table_name}")
+                total_count = cursor.fetchone()['count']
 
-            # Get oldest and newest timestamps
             cursor = conn.execute(
-                f"SELECT MIN(timestamp) as oldest, MAX(timestamp) as newest FROM {table_name}"
+                f"SELECT (SELECT MIN({time_column}) FROM {table_name}) as oldest, "
+                f"(SELECT MAX({time_column}) FROM {table_name}) as newest"
             )
             result = cursor.fetchone()
 
@@ -87,12 +137,50 @@ class DataCleanupManager:
 
         return {
             'total_records': total_count,
+            'estimated': estimated,
             'oldest_timestamp': oldest,
             'newest_timestamp': newest,
             'oldest_date': datetime.fromtimestamp(oldest) if oldest else None,
             'newest_date': datetime.fromtimestamp(newest) if newest else None
         }
 
+    def has_timestamp_index(self, table_name: str) -> bool:
+        """Check whether any index on the table leads with the timestamp column"""
+        with self.db_manager.get_connection() as conn:
+            for index in conn.execute(f"PRAGMA index_list({table_name})").fetchall():
+                columns = conn.execute(f"PRAGMA index_info({index['name']})").fetchall()
+                if columns and columns[0]['name'] == 'timestamp':
+                    return True
+        return False
+
+    def ensure_indexes(self) -> int:
+        """
+        Create any missing hot-query indexes (idempotent).
+
+        Returns:
+            Number of indexes created
+        """
+        created = 0
+        with self.db_manager.get_connection() as conn:
+            existing = {
+                row['name'] for row in
+                conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+            for index_name, definition in HOT_QUERY_INDEXES.items():
+                if index_name in existing:
+                    continue
+                try:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {definition}")
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"Skipping index {index_name}: {e}")
+                    continue
+                created += 1
+            conn.commit()
+
+        if created:
+            logger.info(f"Created {created} missing index(es)")
+        return created
+
     def get_database_size(self) -> float:
         """Get database file size in MB"""
         db_path = Path(self.db_manager.db_path)
@@ -117,38 +205,110 @@ class DataCleanupManager:
         Returns:
             Number of records deleted
         """
-        cutoff_timestamp = (datetime.now() - timedelta(days=retention_days)).timestamp()
+        return self.cleanup_expired_records(
+            {table_name: retention_days}, additional_condition
+        )[table_name]
 
-        logger.info(
-            f"Cleaning {table_name}: deleting records older than "
-            f"{datetime.fromtimestamp(cutoff_timestamp)}"
-        )
+    def cleanup_expired_records(
+        self,
+        retention: Dict[str, int],
+        additional_condition: str = ""
+    ) -> Dict[str, int]:
+        """
+        Delete records older than each table's retention period.
 
-        # Count records to delete
-        where_clause = f"WHERE timestamp < {cutoff_timestamp}"
-        if additional_condition:
-            where_clause += f" AND {additional_condition}"
+        Tables are cleaned together in rounds: every round deletes up to
+        DELETE_CHUNK_SIZE rows from each table with expired rows and commits
+        once. A routine cleanup therefore costs a single commit, while large
+        backlogs are still split into bounded transactions.
 
-        with self.db_manager.get_connection() as conn:
-            cursor = conn.execute(
-                f"SELECT COUNT(*) as count FROM {table_name} {where_clause}"
+        Args:
+            retention: Days to retain, keyed by table name
+            additional_condition: Additional WHERE conditions
+
+        Returns:
+            Number of records deleted (or that would be deleted), per table
+        """
+        for table_name in retention:
+            if table_name not in RETENTION_TABLES:
+                raise ValueError(f"Not a retention-managed table: {table_name}")
+
+        deleted = {table_name: 0 for table_name in retention}
+        pending = {}
+
+        for table_name, retention_days in retention.items():
+            cutoff_timestamp = (datetime.now() - timedelta(days=retention_days)).timestamp()
+
+            logger.info(
+                f"Cleaning {table_name}: deleting records older than "
+                f"{datetime.fromtimestamp(cutoff_timestamp)}"
             )
-            count_to_delete = cursor.fetchone()['count']
 
-        if count_to_delete == 0:
-            logger.info(f"No records to delete from {table_name}")
-            return 0
+            # Cutoff is bound as a parameter so the statement text is identical
+            # on every chunk/run and sqlite3's statement cache reuses the plan
+            where_clause = "WHERE timestamp < ?"
+            params = (cutoff_timestamp,)
+            if additional_condition:
+                where_clause += f" AND {additional_condition}"
+
+            if self.dry_run:
+                deleted[table_name] = self._count_expired(table_name, where_clause, params)
+                continue
+
+            if not self.has_timestamp_index(table_name):
+                logger.warning(
+                    f"{table_name} has no timestamp index; each cleanup chunk will "
+                    f"scan the table"
+                )
+            pending[table_name] = (where_clause, params)
+
+        # Delete oldest first along the timestamp index, in bounded chunks, so
+        # the WAL can be checkpointed between rounds and readers are not blocked
+        # for the whole cleanup. rowcount gives the totals; no COUNT scan.
+        while pending:
+            with self.db_manager.transaction() as conn:
+                for table_name, (where_clause, params) in list(pending.items()):
+                    cursor = conn.execute(
+                        f"DELETE FROM {table_name} WHERE rowid IN ("
+                        f"SELECT rowid FROM {table_name} {where_clause} "
+                        f"ORDER BY timestamp LIMIT ?)",
+                        params + (DELETE_CHUNK_SIZE,)
+                    )
+                    deleted[table_name] += cursor.rowcount
+                    if cursor.rowcount < DELETE_CHUNK_SIZE:
+                        del pending[table_name]
 
-        logger.info(f"Found {count_to_delete} records to delete from {table_name}")
+            if pending:
+                logger.info(
+                    "Deleted so far: "
+                    + ", ".join(f"{table_name}={deleted[table_name]}" for table_name in pending)
+                )
 
         if not self.dry_run:
-            with self.db_manager.transaction() as conn:
-                conn.execute(f"DELETE FROM {table_name} {where_clause}")
+            for table_name, count in deleted.items():
+                if count == 0:
+                    logger.info(f"No records to delete from {table_name}")
+                else:
+                    logger.info(f"Deleted {count} records from {table_name}")
 
-            logger.info(f"Deleted {count_to_delete} records from {table_name}")
-        else:
-            logger.info(f"[DRY RUN] Would delete {count_to_delete} records from {table_name}")
+        return deleted
 
+    def _count_expired(self, table_name: str, where_clause: str, params: tuple) -> int:
+        """Dry run: count expired rows (cheap existence probe first)"""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT 1 FROM {table_name} {where_clause} LIMIT 1", params
+            )
+            if cursor.fetchone() is None:
+                logger.info(f"No records to delete from {table_name}")
+                return 0
+
+            cursor = conn.execute(
+                f"SELECT COUNT(*) as count FROM {table_name} {where_clause}", params
+            )
+            count_to_delete = cursor.fetchone()['count']
+
+        logger.info(f"[DRY RUN] Would delete {count_to_delete} records from {table_name}")
         return count_to_delete
 
     def cleanup_synced_data(self) -> int:
@@ -162,30 +322,22 @@ class DataCleanupManager:
 
         total_deleted = 0
 
-        # Delete synced ring summaries' raw data
-        # First, get ring numbers that have been synced
-        with self.db_manager.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT ring_number
-                FROM ring_summary
-                WHERE synced_to_cloud = 1
-            """)
-            synced_rings = [row['ring_number'] for row in cursor.fetchall()]
-
-        if not synced_rings:
-            logger.info("No synced rings found")
-            return 0
+        # Delete raw data of rings whose summaries have been synced. The ring
+        # set stays in SQL (semi-join on ring_number) rather than being pulled
+        # into Python and spliced into a literal IN list.
+        synced_rings = "SELECT ring_number FROM ring_summary WHERE synced_to_cloud = 1"
 
-        logger.info(f"Found {len(synced_rings)} synced rings")
-
-        # Delete PLC logs for synced rings
-        ring_list = ','.join(str(r) for r in synced_rings)
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.execute("SELECT 1 FROM ring_summary WHERE synced_to_cloud = 1 LIMIT 1")
+            if cursor.fetchone() is None:
+                logger.info("No synced rings found")
+                return 0
 
         for table_name in ['plc_logs', 'attitude_logs', 'monitoring_logs']:
             if not self.dry_run:
                 with self.db_manager.transaction() as conn:
                     cursor = conn.execute(
-                        f"DELETE FROM {table_name} WHERE ring_number IN ({ring_list})"
+                        f"DELETE FROM {table_name} WHERE ring_number IN ({synced_rings})"
                     )
                     deleted = cursor.rowcount
                     total_deleted += deleted
@@ -193,7 +345,8 @@ class DataCleanupManager:
             else:
                 with self.db_manager.get_connection() as conn:
                     cursor = conn.execute(
-                        f"SELECT COUNT(*) as count FROM {table_name} WHERE ring_number IN ({ring_list})"
+                        f"SELECT COUNT(*) as count FROM {table_name} "
+                        f"WHERE ring_number IN ({synced_rings})"
                     )
                     would_delete = cursor.fetchone()['count']
                     total_deleted += would_delete
@@ -203,15 +356,36 @@ class DataCleanupManager:
 
         return total_deleted
 
-    def vacuum_database(self) -> None:
-        """Vacuum database to reclaim space"""
-        logger.info("Vacuuming database...")
+    def vacuum_database(self, full: bool = False) -> None:
+        """
+        Reclaim free pages.
+
+        Databases in auto_vacuum=INCREMENTAL mode release only the pages freed
+        by the cleanup (cost proportional to pages freed). A full VACUUM, which
+        rewrites the whole file, runs when requested or when the database is
+        not yet in incremental mode (it also converts the file to it).
+
+        Args:
+            full: Force a full VACUUM
+        """
+        with self.db_manager.get_connection() as conn:
+            incremental = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+        full = full or not incremental
+        logger.info(f"Vacuuming database ({'full' if full else 'incremental'})...")
 
         size_before = self.get_database_size()
 
         if not self.dry_run:
             with self.db_manager.get_connection() as conn:
-                conn.execute("VACUUM")
+                if full:
+                    conn.execute("VACUUM")
+                else:
+                    # executescript runs the pragma to completion; a single
+                    # execute() steps it once and frees only one page
+                    conn.executescript("PRAGMA incremental_vacuum;")
+                # Truncation reaches the main file at checkpoint (WAL mode)
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
             size_after = self.get_database_size()
             space_reclaimed = size_before - size_after
@@ -227,6 +401,57 @@ class DataCleanupManager:
                 f"[DRY RUN] Would vacuum database (current size: {size_before:.2f} MB)"
             )
 
+    def analyze_tables(self, table_names: Iterable[str], force: bool = False) -> List[str]:
+        """
+        Refresh planner statistics for tables cleanup has just modified.
+
+        Runs ANALYZE per table rather than database-wide, and records when
+        each table was last analyzed in maintenance_log so repeated cleanups
+        within ANALYZE_INTERVAL_SECONDS skip it. This also keeps the
+        sqlite_stat1 row estimates used by get_table_info() current.
+
+        Args:
+            table_names: Tables to analyze
+            force: Analyze even if analyzed within the interval
+
+        Returns:
+            Tables that were analyzed
+        """
+        table_names = sorted(set(table_names))
+        if not table_names:
+            return []
+
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would analyze: {', '.join(table_names)}")
+            return []
+
+        now = datetime.now().timestamp()
+        analyzed = []
+        with self.db_manager.transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS maintenance_log ("
+                "task TEXT PRIMARY KEY, last_run REAL NOT NULL)"
+            )
+            for table_name in table_names:
+                task = f"analyze:{table_name}"
+                row = conn.execute(
+                    "SELECT last_run FROM maintenance_log WHERE task = ?", (task,)
+                ).fetchone()
+                if not force and row and now - row['last_run'] < ANALYZE_INTERVAL_SECONDS:
+                    logger.info(f"Skipping ANALYZE {table_name} (analyzed within the last day)")
+                    continue
+
+                conn.execute(f"ANALYZE {table_name}")
+                conn.execute(
+                    "INSERT OR REPLACE INTO maintenance_log (task, last_run) VALUES (?, ?)",
+                    (task, now)
+                )
+                analyzed.append(table_name)
+
+        if analyzed:
+            logger.info(f"Analyzed: {', '.join(analyzed)}")
+        return analyzed
+
     def analyze_database(self) -> None:
         """Analyze database and update statistics"""
         logger.info("Analyzing database...")
@@ -239,8 +464,15 @@ class DataCleanupManager:
         else:
             logger.info("[DRY RUN] Would analyze database")
 
-    def print_database_statistics(self) -> None:
-        """Print database statistics"""
+    def print_database_statistics(self, exact_tables: Iterable[str] = ()) -> None:
+        """
+        Print database statistics.
+
+        Args:
+            exact_tables: Tables to COUNT(*) instead of using the sqlite_stat1
+                estimate (modified since their last ANALYZE)
+        """
+        exact_tables = set(exact_tables)
         logger.info("\n" + "=" * 60)
         logger.info("DATABASE STATISTICS")
         logger.info("=" * 60)
@@ -251,9 +483,10 @@ class DataCleanupManager:
         # Table statistics
         for table_name in ['plc_logs', 'attitude_logs', 'monitoring_logs', 'ring_summary']:
             try:
-                info = self.get_table_info(table_name)
+                info = self.get_table_info(table_name, exact=table_name in exact_tables)
                 logger.info(f"\n{table_name}:")
-                logger.info(f"  Total records:  {info['total_records']:,}")
+                estimate_note = " (estimated, as of last ANALYZE)" if info['estimated'] else ""
+                logger.info(f"  Total records:  {info['total_records']:,}{estimate_note}")
                 if info['oldest_date']:
                     logger.info(f"  Oldest record:  {info['oldest_date']}")
                 if info['newest_date']:
@@ -269,7 +502,8 @@ class DataCleanupManager:
         retention_days_attitude: int = 90,
         retention_days_monitoring: int = 180,
         delete_synced: bool = False,
-        vacuum: bool = False
+        vacuum: bool = False,
+        full_vacuum: bool = False
     ) -> None:
         """
         Run cleanup process.
@@ -279,7 +513,8 @@ class DataCleanupManager:
             retention_days_attitude: Retention for attitude logs
             retention_days_monitoring: Retention for monitoring logs
             delete_synced: Delete synced data
-            vacuum: Run VACUUM after cleanup
+            vacuum: Reclaim free pages after cleanup
+            full_vacuum: Use a full VACUUM instead of incremental vacuum
         """
         logger.info("Starting data cleanup process...")
         logger.info(f"Dry run mode: {self.dry_run}")
@@ -287,32 +522,37 @@ class DataCleanupManager:
         # Print initial statistics
         self.print_database_statistics()
 
+        if not self.dry_run:
+            self.ensure_indexes()
+
         # Cleanup old records
         logger.info("\n--- Cleaning Old Records ---")
 
-        self.stats['plc_logs_deleted'] = self.cleanup_old_records(
-            'plc_logs', retention_days_plc
-        )
-
-        self.stats['attitude_logs_deleted'] = self.cleanup_old_records(
-            'attitude_logs', retention_days_attitude
-        )
-
-        self.stats['monitoring_logs_deleted'] = self.cleanup_old_records(
-            'monitoring_logs', retention_days_monitoring
-        )
+        deleted = self.cleanup_expired_records({
+            'plc_logs': retention_days_plc,
+            'attitude_logs': retention_days_attitude,
+            'monitoring_logs': retention_days_monitoring,
+        })
+        for table_name, count in deleted.items():
+            self.stats[f'{table_name}_deleted'] = count
+        touched = {table_name for table_name, count in deleted.items() if count}
 
         # Delete synced data if requested
         if delete_synced:
             logger.info("\n--- Cleaning Synced Data ---")
             synced_deleted = self.cleanup_synced_data()
             logger.info(f"Deleted {synced_deleted} synced records")
+            if synced_deleted:
+                touched.update(RETENTION_TABLES)
+
+        # Refresh planner statistics for the tables that shrank. VACUUM does
+        # not change row statistics, so no database-wide ANALYZE follows it.
+        analyzed = self.analyze_tables(touched)
 
         # Vacuum database
         if vacuum:
             logger.info("\n--- Database Maintenance ---")
-            self.vacuum_database()
-            self.analyze_database()
+            self.vacuum_database(full=full_vacuum)
 
         # Print final statistics
         logger.info("\n" + "=" * 60)
@@ -324,8 +564,11 @@ class DataCleanupManager:
         logger.info(f"Space reclaimed:         {self.stats['space_reclaimed_mb']:.2f} MB")
         logger.info("=" * 60)
 
-        # Print final database statistics
-        self.print_database_statistics()
+        # Print final database statistics. Tables that shrank but whose ANALYZE
+        # was skipped have stale sqlite_stat1 estimates, so count those exactly
+        # (a dry run deletes nothing, so its estimates are unchanged)
+        stale = set() if self.dry_run else touched.difference(analyzed)
+        self.print_database_statistics(exact_tables=stale)
 
 
 def parse_arguments():
@@ -344,6 +587,9 @@ Examples:
   # Delete all synced data and vacuum
   python cleanup_old_data.py --delete-synced --vacuum
 
+  # Rewrite the whole file (defragment) instead of incremental vacuum
+  python cleanup_old_data.py --vacuum --full-vacuum
+
   # Custom retention for different log types
   python cleanup_old_data.py --plc-retention 60 --monitoring-retention 180
         """
@@ -392,6 +638,11 @@ Examples:
         action='store_true',
         help='Vacuum database after cleanup to reclaim space'
     )
+    parser.add_argument(
+        '--full-vacuum',
+        action='store_true',
+        help='With --vacuum: full VACUUM (rewrites the file) instead of incremental'
+    )
 
     # Execution options
     parser.add_argument(
@@ -433,7 +684,8 @@ def main():
         retention_days_attitude=attitude_retention,
         retention_days_monitoring=monitoring_retention,
         delete_synced=args.delete_synced,
-        vacuum=args.vacuum
+        vacuum=args.vacuum,
+        full_vacuum=args.full_vacuum
     )
 
 
@@ -3,14 +3,186 @@ T048: Ring Data Aggregation and Alignment
 Implements the core align_data() function for spatio-temporal alignment
 Based on pseudocode from plan.md lines 807-935
 """
-import numpy as np
-from typing import Dict, List, Optional, Any
+import math
+import os
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import yaml
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Key PLC tags aggregated into ring features, and their integer ids
+KEY_PLC_TAGS = (
+    "thrust_total",
+    "torque_cutterhead",
+    "chamber_pressure",
+    "advance_rate",
+    "grout_pressure",
+    "grout_volume"
+)
+_KEY_PLC_TAG_IDS = {tag_name: i for i, tag_name in enumerate(KEY_PLC_TAGS)}
+
+# Assumed cutterhead speed (rpm); should come from PLC if available
+CUTTERHEAD_RPM = 2.0
+
+# Attitude channels aggregated into ring features
+ATTITUDE_FIELDS = ('pitch', 'roll', 'yaw', 'horizontal_deviation', 'vertical_deviation')
+_ATTITUDE_AGGREGATE_COLUMNS = ", ".join(
+    f"AVG({field}) AS mean_{field}, MAX({field}) AS max_{field}" for field in ATTITUDE_FIELDS
+)
+# Same, qualified with the attitude_logs alias used by align_data_batch()
+_ATTITUDE_AGGREGATE_COLUMNS_A = ", ".join(
+    f"AVG(a.{field}) AS mean_{field}, MAX(a.{field}) AS max_{field}" for field in ATTITUDE_FIELDS
+)
+
+# Rings per align_data_batch() query (bounded by SQLite's host-parameter limit)
+BATCH_RING_CHUNK = 500
+
+# SQL text is built once at import. Passing the identical string objects on
+# every ring lets sqlite3's per-connection statement cache (keyed by SQL
+# text) reuse the prepared statement instead of re-parsing and re-planning.
+_SQL_RING_WINDOW = "SELECT start_time, end_time FROM ring_summary WHERE ring_number = ?"
+
+# m2 is the sum of squared deviations from the tag mean (centered, so no
+# E[x^2] - E[x]^2 cancellation for large, tightly spread readings)
+_SQL_PLC_AGG = """WITH centered AS (
+               SELECT tag_name, value,
+                      value - AVG(value) OVER (PARTITION BY tag_name) AS deviation
+               FROM plc_logs
+               WHERE timestamp >= ? AND timestamp <= ?
+               AND data_quality_flag IN ('raw', 'interpolated', 'calibrated')
+               AND ring_number = ?
+           )
+           SELECT tag_name,
+                  COUNT(*) AS readings,
+                  COUNT(value) AS n,
+                  AVG(value) AS mean,
+                  MAX(value) AS max,
+                  MIN(value) AS min,
+                  SUM(deviation * deviation) AS m2
+           FROM centered
+           GROUP BY tag_name"""
+
+_SQL_ATTITUDE_AGG = f"""SELECT COUNT(*) AS readings, {_ATTITUDE_AGGREGATE_COLUMNS}
+            FROM attitude_logs
+            WHERE timestamp >= ? AND timestamp <= ?
+            AND ring_number = ?"""
+
+_SQL_SETTLEMENT = """SELECT AVG(value) as avg_settlement
+           FROM monitoring_logs
+           WHERE sensor_type = 'surface_settlement'
+           AND timestamp >= ? AND timestamp <= ?
+           AND ring_number = ?"""
+
+_SQL_UPDATE_RING = """UPDATE ring_summary SET
+           mean_thrust = ?, max_thrust = ?, min_thrust = ?, std_thrust = ?,
+           mean_torque = ?, max_torque = ?, min_torque = ?, std_torque = ?,
+           mean_chamber_pressure = ?, max_chamber_pressure = ?, std_chamber_pressure = ?,
+           mean_advance_rate = ?, max_advance_rate = ?,
+           mean_grout_pressure = ?, grout_volume = ?,
+           mean_pitch = ?, mean_roll = ?, mean_yaw = ?,
+           max_pitch = ?, max_roll = ?,
+           horizontal_deviation_max = ?, vertical_deviation_max = ?,
+           specific_energy = ?, ground_loss_rate = ?, volume_loss_ratio = ?,
+           settlement_value = ?,
+           data_completeness_flag = ?,
+           updated_at = ?
+           WHERE ring_number = ?"""
+
+# Feature vector keys bound to _SQL_UPDATE_RING's SET columns, in order
+_UPDATE_RING_FEATURES = (
+    'mean_thrust_total', 'max_thrust_total', 'min_thrust_total', 'std_thrust_total',
+    'mean_torque_cutterhead', 'max_torque_cutterhead',
+    'min_torque_cutterhead', 'std_torque_cutterhead',
+    'mean_chamber_pressure', 'max_chamber_pressure', 'std_chamber_pressure',
+    'mean_advance_rate', 'max_advance_rate',
+    'mean_grout_pressure', 'grout_volume',
+    'mean_pitch', 'mean_roll', 'mean_yaw',
+    'max_pitch', 'max_roll',
+    'max_horizontal_deviation', 'max_vertical_deviation',
+    'specific_energy', 'ground_loss_rate', 'volume_loss_ratio',
+    'settlement_value',
+    'data_completeness_flag'
+)
+
+# align_data_batch() templates; {placeholders} is the ring_number IN list
+_SQL_BATCH_WINDOWS = """SELECT ring_number, start_time, end_time
+                    FROM ring_summary
+                    WHERE ring_number IN ({placeholders})"""
+
+_SQL_BATCH_PLC_AGG = """WITH centered AS (
+                    SELECT p.ring_number, p.tag_name, p.value,
+                           p.value - AVG(p.value) OVER (
+                               PARTITION BY p.ring_number, p.tag_name
+                           ) AS deviation
+                    FROM ring_summary r
+                    JOIN plc_logs p
+                      ON p.ring_number = r.ring_number
+                     AND p.timestamp >= r.start_time AND p.timestamp <= r.end_time
+                    WHERE r.ring_number IN ({placeholders})
+                    AND p.data_quality_flag IN ('raw', 'interpolated', 'calibrated')
+                )
+                SELECT ring_number,
+                       tag_name,
+                       COUNT(*) AS readings,
+                       COUNT(value) AS n,
+                       AVG(value) AS mean,
+                       MAX(value) AS max,
+                       MIN(value) AS min,
+                       SUM(deviation * deviation) AS m2
+                FROM centered
+                GROUP BY ring_number, tag_name"""
+
+_SQL_BATCH_ATTITUDE_AGG = f"""SELECT r.ring_number, COUNT(a.ring_number) AS readings,
+                           {_ATTITUDE_AGGREGATE_COLUMNS_A}
+                    FROM ring_summary r
+                    LEFT JOIN attitude_logs a
+                      ON a.ring_number = r.ring_number
+                     AND a.timestamp >= r.start_time AND a.timestamp <= r.end_time
+                    WHERE r.ring_number IN ({{placeholders}})
+                    GROUP BY r.ring_number"""
+
+_SQL_BATCH_SETTLEMENT = """SELECT r.ring_number, AVG(m.value) AS avg_settlement
+                    FROM ring_summary r
+                    JOIN monitoring_logs m
+                      ON m.ring_number = r.ring_number
+                     AND m.timestamp >= r.end_time + ? AND m.timestamp <= r.end_time + ?
+                    WHERE r.ring_number IN ({placeholders})
+                    AND m.sensor_type = 'surface_settlement'
+                    GROUP BY r.ring_number"""
+
+
+@lru_cache(maxsize=8)
+def _batch_sql(n_rings: int) -> Tuple[str, str, str, str]:
+    """align_data_batch() SQL for a chunk of n_rings (full chunks share one text)"""
+    placeholders = ",".join("?" * n_rings)
+    return tuple(
+        template.format(placeholders=placeholders)
+        for template in (
+            _SQL_BATCH_WINDOWS, _SQL_BATCH_PLC_AGG,
+            _SQL_BATCH_ATTITUDE_AGG, _SQL_BATCH_SETTLEMENT
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse the alignment YAML (memoized per path and modification time)"""
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f)
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Load the alignment configuration, parsing the file only when it changes.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
+    return _load_config(config_path, os.path.getmtime(config_path))
+
 
 def align_data(
     ring_number: int,
@@ -41,14 +213,10 @@ def align_data(
         ValueError: If ring not found or data insufficient
     """
     # Load configuration
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path)
 
     # Step 1: Get ring time window
-    ring_window = db.query(
-        "SELECT start_time, end_time FROM ring_summary WHERE ring_number = ?",
-        (ring_number,)
-    ).fetchone()
+    ring_window = db.fetchone(_SQL_RING_WINDOW, (ring_number,))
 
     if not ring_window:
         raise ValueError(f"Ring {ring_number} not found in ring_summary")
@@ -61,56 +229,162 @@ def align_data(
         f"[{datetime.fromtimestamp(start_time)} - {datetime.fromtimestamp(end_time)}]"
     )
 
-    # Step 2: Query high-frequency PLC data within ring window
-    plc_data = db.query(
-        """SELECT tag_name, value
-           FROM plc_logs
-           WHERE timestamp >= ? AND timestamp <= ?
-           AND data_quality_flag IN ('raw', 'interpolated', 'calibrated')
-           AND ring_number = ?""",
-        (start_time, end_time, ring_number)
-    ).fetchall()
-
-    # Step 3: Aggregate PLC data into statistics
-    plc_features = aggregate_plc_data(plc_data, config)
-
-    # Step 4: Query attitude data and aggregate
-    attitude_data = db.query(
-        """SELECT pitch, roll, yaw, horizontal_deviation, vertical_deviation
-           FROM attitude_logs
-           WHERE timestamp >= ? AND timestamp <= ?
-           AND ring_number = ?""",
-        (start_time, end_time, ring_number)
-    ).fetchall()
-
-    attitude_features = aggregate_attitude_data(attitude_data, config)
-
-    # Step 5: Calculate derived engineering indicators
-    derived_features = calculate_derived_indicators(
-        plc_features,
-        attitude_features,
-        config['ring_geometry']
+    # Steps 2-9 share one connection and commit once
+    with db.transaction() as conn:
+        # Steps 2-3: Aggregate PLC data within the ring window in SQL
+        # (one row per tag instead of every 1 Hz reading)
+        plc_aggregates = conn.execute(
+            _SQL_PLC_AGG, (start_time, end_time, ring_number)
+        ).fetchall()
+
+        # Step 4: Aggregate attitude data in SQL (one row)
+        attitude_aggregates = conn.execute(
+            _SQL_ATTITUDE_AGG, (start_time, end_time, ring_number)
+        ).fetchone()
+
+        # Step 6: Query time-lagged monitoring data (settlement with 6-8 hour lag)
+        lag_config = config['time_lag_windows']['surface_settlement']
+        lag_window_start = end_time + (lag_config['min_hours'] * 3600)
+        lag_window_end = end_time + (lag_config['max_hours'] * 3600)
+
+        settlement_data = conn.execute(
+            _SQL_SETTLEMENT, (lag_window_start, lag_window_end, ring_number)
+        ).fetchone()
+
+        # Steps 5, 7, 8: Derived indicators, feature vector, completeness
+        feature_vector = build_feature_vector(
+            ring_number, start_time, end_time,
+            plc_aggregates, attitude_aggregates,
+            settlement_data['avg_settlement'] if settlement_data else None,
+            config
+        )
+
+        # Step 9: Update ring_summary table
+        update_ring_summary(conn, ring_number, feature_vector, commit=False)
+
+    logger.info(
+        f"Ring {ring_number} alignment complete: "
+        f"completeness={feature_vector['data_completeness_flag']}, "
+        f"settlement={feature_vector['settlement_value']}"
     )
 
-    # Step 6: Query time-lagged monitoring data (settlement with 6-8 hour lag)
+    return feature_vector
+
+
+def align_data_batch(
+    ring_numbers: List[int],
+    db: Any,  # SQLite database manager
+    config_path: str = "edge/config/alignment.yaml"
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Align many rings with a fixed number of queries per batch.
+
+    Same features as align_data(), but ring windows, PLC aggregates,
+    attitude aggregates and settlement averages are each fetched for a
+    whole chunk of rings at once (joined against ring_summary on the ring's
+    own window and grouped by ring_number), instead of ~5 queries per ring.
+
+    Args:
+        ring_numbers: Rings to align
+        db: Database manager instance with query/execute methods
+        config_path: Path to alignment configuration YAML
+
+    Returns:
+        Feature vector per aligned ring number (rings missing from
+        ring_summary are skipped with a warning)
+    """
+    config = load_config(config_path)
+
     lag_config = config['time_lag_windows']['surface_settlement']
-    lag_window_start = end_time + (lag_config['min_hours'] * 3600)
-    lag_window_end = end_time + (lag_config['max_hours'] * 3600)
+    lag_min_seconds = lag_config['min_hours'] * 3600
+    lag_max_seconds = lag_config['max_hours'] * 3600
 
-    settlement_data = db.query(
-        """SELECT AVG(value) as avg_settlement
-           FROM monitoring_logs
-           WHERE sensor_type = 'surface_settlement'
-           AND timestamp >= ? AND timestamp <= ?
-           AND ring_number = ?""",
-        (lag_window_start, lag_window_end, ring_number)
-    ).fetchone()
+    feature_vectors: Dict[int, Dict[str, Any]] = {}
 
-    target = {
-        "settlement_value": settlement_data['avg_settlement'] if settlement_data else None
-    }
+    for offset in range(0, len(ring_numbers), BATCH_RING_CHUNK):
+        chunk = list(ring_numbers[offset:offset + BATCH_RING_CHUNK])
+        sql_windows, sql_plc, sql_attitude, sql_settlement = _batch_sql(len(chunk))
+
+        windows = {
+            row['ring_number']: (row['start_time'], row['end_time'])
+            for row in db.fetchall(sql_windows, tuple(chunk))
+        }
+
+        plc_by_ring: Dict[int, List] = {}
+        for row in db.fetchall(sql_plc, tuple(chunk)):
+            plc_by_ring.setdefault(row['ring_number'], []).append(row)
+
+        attitude_by_ring = {
+            row['ring_number']: row
+            for row in db.fetchall(sql_attitude, tuple(chunk))
+        }
 
-    # Step 7: Combine all features
+        settlement_by_ring = {
+            row['ring_number']: row['avg_settlement']
+            for row in db.fetchall(sql_settlement, (lag_min_seconds, lag_max_seconds, *chunk))
+        }
+
+        chunk_vectors: Dict[int, Dict[str, Any]] = {}
+        for ring_number in chunk:
+            if ring_number not in windows:
+                logger.warning(f"Ring {ring_number} not found in ring_summary, skipping")
+                continue
+
+            start_time, end_time = windows[ring_number]
+            chunk_vectors[ring_number] = build_feature_vector(
+                ring_number, start_time, end_time,
+                plc_by_ring.get(ring_number, []),
+                attitude_by_ring[ring_number],
+                settlement_by_ring.get(ring_number),
+                config
+            )
+
+        # One executemany and one commit per chunk
+        with db.transaction() as conn:
+            update_ring_summary_many(conn, chunk_vectors, commit=False)
+        feature_vectors.update(chunk_vectors)
+
+    logger.info(f"Batch alignment complete: {len(feature_vectors)}/{len(ring_numbers)} rings")
+
+    return feature_vectors
+
+
+def build_feature_vector(
+    ring_number: int,
+    start_time: float,
+    end_time: float,
+    plc_aggregates: List[Dict],
+    attitude_aggregates: Dict,
+    settlement: Optional[float],
+    config: Dict
+) -> Dict[str, Any]:
+    """
+    Assemble a ring's feature vector from its SQL aggregates.
+
+    Args:
+        ring_number: Ring number
+        start_time: Ring start timestamp
+        end_time: Ring end timestamp
+        plc_aggregates: Per-tag aggregate rows (see align_data())
+        attitude_aggregates: Attitude aggregate row with reading count
+        settlement: Average lagged surface settlement, if any
+        config: Alignment configuration
+
+    Returns:
+        feature_vector: Dict with aggregated features, target value and
+        data_completeness_flag
+    """
+    plc_features = plc_features_from_aggregates(plc_aggregates, config)
+    attitude_features = attitude_features_from_aggregates(attitude_aggregates, config)
+
+    # Calculate derived engineering indicators
+    derived_features = calculate_derived_indicators(
+        plc_features,
+        attitude_features,
+        config['ring_geometry']
+    )
+
+    # Combine all features
     feature_vector = {
         "ring_number": ring_number,
         "start_time": start_time,
@@ -118,119 +392,95 @@ def align_data(
         **plc_features,
         **attitude_features,
         **derived_features,
-        **target
+        "settlement_value": settlement
     }
 
-    # Step 8: Assess data completeness
-    completeness = assess_data_completeness(
-        plc_data=plc_data,
-        attitude_data=attitude_data,
-        settlement=target['settlement_value'],
+    # Assess data completeness
+    feature_vector['data_completeness_flag'] = assess_data_completeness(
+        plc_count=sum(row['readings'] for row in plc_aggregates),
+        attitude_count=attitude_aggregates['readings'],
+        settlement=settlement,
         config=config['data_completeness']
     )
-    feature_vector['data_completeness_flag'] = completeness
-
-    # Step 9: Update ring_summary table
-    update_ring_summary(db, ring_number, feature_vector)
-
-    logger.info(
-        f"Ring {ring_number} alignment complete: "
-        f"completeness={completeness}, settlement={target['settlement_value']}"
-    )
 
     return feature_vector
 
 
-def aggregate_plc_data(plc_data: List[Dict], config: Dict) -> Dict[str, Optional[float]]:
+def plc_features_from_aggregates(
+    aggregates: List[Dict], config: Dict
+) -> Dict[str, Optional[float]]:
     """
-    Aggregate high-frequency PLC readings into statistical features.
+    Build PLC features from per-tag SQL aggregates.
+
+    Features are None for key tags without readings. Rows come from the
+    GROUP BY tag_name query in align_data() (n, mean, max, min, m2 per tag).
 
     Args:
-        plc_data: List of PLC readings with tag_name and value
+        aggregates: One row per tag
         config: Alignment configuration
 
     Returns:
         Dictionary of aggregated features (mean, max, min, std per tag)
     """
-    features: Dict[str, Optional[float]] = {}
-
-    # Key PLC tags to aggregate
-    key_tags = [
-        "thrust_total",
-        "torque_cutterhead",
-        "chamber_pressure",
-        "advance_rate",
-        "grout_pressure",
-        "grout_volume"
-    ]
-
-    # Group by tag name
-    tag_groups: Dict[str, List[float]] = {}
-    for reading in plc_data:
-        tag_name = reading['tag_name']
-        if tag_name in key_tags:
-            if tag_name not in tag_groups:
-                tag_groups[tag_name] = []
-            tag_groups[tag_name].append(reading['value'])
-
-    # Calculate statistics for each tag
     agg_funcs = config['feature_engineering']['aggregation_functions']
+    features: Dict[str, Optional[float]] = {
+        f'{func}_{tag_name}': None for tag_name in KEY_PLC_TAGS for func in agg_funcs
+    }
+
+    for row in aggregates:
+        tag_name = row['tag_name']
+        if tag_name not in _KEY_PLC_TAG_IDS or not row['n']:
+            continue
 
-    for tag_name in key_tags:
-        values = tag_groups.get(tag_name, [])
-
-        if len(values) > 0:
-            np_values = np.array(values)
-            if 'mean' in agg_funcs:
-                features[f'mean_{tag_name}'] = float(np.mean(np_values))
-            if 'max' in agg_funcs:
-                features[f'max_{tag_name}'] = float(np.max(np_values))
-            if 'min' in agg_funcs:
-                features[f'min_{tag_name}'] = float(np.min(np_values))
-            if 'std' in agg_funcs:
-                features[f'std_{tag_name}'] = float(np.std(np_values))
-        else:
-            # No data for this tag
-            for func in agg_funcs:
-                features[f'{func}_{tag_name}'] = None
+        stats = {'mean': row['mean'], 'max': row['max'], 'min': row['min']}
+        # Population std from the centered sum of squares
+        stats['std'] = math.sqrt(row['m2'] / row['n'])
+
+        for func in agg_funcs:
+            if func in stats:
+                features[f'{func}_{tag_name}'] = stats[func]
 
     return features
 
 
-def aggregate_attitude_data(attitude_data: List[Dict], config: Dict) -> Dict[str, Optional[float]]:
+def attitude_features_from_aggregates(
+    aggregates: Dict, config: Dict
+) -> Dict[str, Optional[float]]:
     """
-    Aggregate high-frequency attitude readings into statistical features.
+    Build attitude features from the SQL aggregate row in align_data().
+
+    AVG/MAX skip NULLs and return NULL for a channel with no readings.
 
     Args:
-        attitude_data: List of attitude readings
+        aggregates: Row with mean_<field> and max_<field> columns
         config: Alignment configuration
 
     Returns:
         Dictionary of aggregated attitude features
     """
-    features: Dict[str, Optional[float]] = {}
-
-    fields = ['pitch', 'roll', 'yaw', 'horizontal_deviation', 'vertical_deviation']
     agg_funcs = config['feature_engineering']['aggregation_functions']
+    features: Dict[str, Optional[float]] = {}
 
-    for field in fields:
-        values = [reading[field] for reading in attitude_data if reading[field] is not None]
-
-        if len(values) > 0:
-            np_values = np.array(values)
-            if 'mean' in agg_funcs:
-                features[f'mean_{field}'] = float(np.mean(np_values))
-            if 'max' in agg_funcs:
-                features[f'max_{field}'] = float(np.max(np_values))
-        else:
-            if 'mean' in agg_funcs:
-                features[f'mean_{field}'] = None
-            if 'max' in agg_funcs:
-                features[f'max_{field}'] = None
+    for field in ATTITUDE_FIELDS:
+        if 'mean' in agg_funcs:
+            features[f'mean_{field}'] = aggregates[f'mean_{field}']
+        if 'max' in agg_funcs:
+            features[f'max_{field}'] = aggregates[f'max_{field}']
 
     return features
 
 
+@lru_cache(maxsize=8)
+def _geometry_constants(
+    diameter: float,
+    width: float,
+    rpm: float = CUTTERHEAD_RPM
+) -> Tuple[float, float, float]:
+    """Excavation area (m²), theoretical ring volume (m³) and ω (rad/s)"""
+    excavation_area = math.pi * (diameter ** 2) / 4
+    return excavation_area, excavation_area * width, rpm * 2 * math.pi / 60
+
+
 def calculate_derived_indicators(
     plc_features: Dict,
     attitude_features: Dict,
@@ -259,14 +509,13 @@ def calculate_derived_indicators(
     torque = plc_features.get('mean_torque_cutterhead', 0) or 0  # kN·m
     advance_rate = plc_features.get('mean_advance_rate', 1) or 1  # mm/min
 
-    # Calculate excavation area
-    diameter = ring_geometry['diameter']  # m
-    excavation_area = np.pi * (diameter ** 2) / 4  # m²
+    # Excavation area, theoretical ring volume and cutterhead speed are
+    # constant for a given geometry
+    excavation_area, theoretical_volume, omega = _geometry_constants(
+        ring_geometry['diameter'], ring_geometry['width']
+    )
 
     # Convert units
-    # Assume cutterhead RPM available or use typical value
-    rpm = 2.0  # Typical value, should come from PLC if available
-    omega = rpm * 2 * np.pi / 60  # rad/s
     velocity = (advance_rate / 1000) / 60  # m/s
 
     if velocity > 0:
@@ -276,8 +525,6 @@ def calculate_derived_indicators(
         derived['specific_energy'] = None
 
     # Ground loss rate: V_loss = V_theoretical - V_grout
-    ring_width = ring_geometry['width']  # m
-    theoretical_volume = excavation_area * ring_width  # m³
     grout_volume = plc_features.get('grout_volume', 0) or 0  # m³
 
     ground_loss = theoretical_volume - grout_volume
@@ -293,8 +540,8 @@ def calculate_derived_indicators(
 
 
 def assess_data_completeness(
-    plc_data: List[Dict],
-    attitude_data: List[Dict],
+    plc_count: int,
+    attitude_count: int,
     settlement: Optional[float],
     config: Dict
 ) -> str:
@@ -302,17 +549,14 @@ def assess_data_completeness(
     Assess data completeness for the ring.
 
     Args:
-        plc_data: PLC readings
-        attitude_data: Attitude readings
+        plc_count: Number of PLC readings in the ring window
+        attitude_count: Number of attitude readings in the ring window
         settlement: Settlement value
         config: Completeness thresholds
 
     Returns:
         Completeness flag: 'complete', 'partial', or 'incomplete'
     """
-    plc_count = len(plc_data)
-    attitude_count = len(attitude_data)
-
     has_min_plc = plc_count >= config['min_plc_readings']
     has_min_attitude = attitude_count >= config['min_attitude_readings']
     has_settlement = settlement is not None if config['required_settlement'] else True
@@ -325,60 +569,68 @@ def assess_data_completeness(
         return 'incomplete'
 
 
-def update_ring_summary(db: Any, ring_number: int, feature_vector: Dict) -> None:
+def _ring_summary_params(
+    ring_number: int,
+    feature_vector: Dict,
+    updated_at: float
+) -> Tuple:
+    """_SQL_UPDATE_RING parameters for one ring"""
+    return (
+        *map(feature_vector.get, _UPDATE_RING_FEATURES),
+        updated_at,
+        ring_number
+    )
+
+
+def update_ring_summary(
+    db: Any,
+    ring_number: int,
+    feature_vector: Dict,
+    commit: bool = True
+) -> None:
     """
     Update ring_summary table with aggregated features.
 
     Args:
-        db: Database manager
+        db: Database manager (or connection)
         ring_number: Ring number
         feature_vector: Aggregated features
+        commit: Commit after the update; False when the caller owns the
+            transaction
     """
     db.execute(
-        """UPDATE ring_summary SET
-           mean_thrust = ?, max_thrust = ?, min_thrust = ?, std_thrust = ?,
-           mean_torque = ?, max_torque = ?, min_torque = ?, std_torque = ?,
-           mean_chamber_pressure = ?, max_chamber_pressure = ?, std_chamber_pressure = ?,
-           mean_advance_rate = ?, max_advance_rate = ?,
-           mean_grout_pressure = ?, grout_volume = ?,
-           mean_pitch = ?, mean_roll = ?, mean_yaw = ?,
-           max_pitch = ?, max_roll = ?,
-           horizontal_deviation_max = ?, vertical_deviation_max = ?,
-           specific_energy = ?, ground_loss_rate = ?, volume_loss_ratio = ?,
-           settlement_value = ?,
-           data_completeness_flag = ?,
-           updated_at = ?
-           WHERE ring_number = ?""",
-        (
-            feature_vector.get('mean_thrust_total'),
-            feature_vector.get('max_thrust_total'),
-            feature_vector.get('min_thrust_total'),
-            feature_vector.get('std_thrust_total'),
-            feature_vector.get('mean_torque_cutterhead'),
-            feature_vector.get('max_torque_cutterhead'),
-            feature_vector.get('min_torque_cutterhead'),
-            feature_vector.get('std_torque_cutterhead'),
-            feature_vector.get('mean_chamber_pressure'),
-            feature_vector.get('max_chamber_pressure'),
-            feature_vector.get('std_chamber_pressure'),
-            feature_vector.get('mean_advance_rate'),
-            feature_vector.get('max_advance_rate'),
-            feature_vector.get('mean_grout_pressure'),
-            feature_vector.get('grout_volume'),
-            feature_vector.get('mean_pitch'),
-            feature_vector.get('mean_roll'),
-            feature_vector.get('mean_yaw'),
-            feature_vector.get('max_pitch'),
-            feature_vector.get('max_roll'),
-            feature_vector.get('max_horizontal_deviation'),
-            feature_vector.get('max_vertical_deviation'),
-            feature_vector.get('specific_energy'),
-            feature_vector.get('ground_loss_rate'),
-            feature_vector.get('volume_loss_ratio'),
-            feature_vector.get('settlement_value'),
-            feature_vector.get('data_completeness_flag'),
-            datetime.utcnow().timestamp(),
-            ring_number
-        )
+        _SQL_UPDATE_RING,
+        _ring_summary_params(ring_number, feature_vector, time.time())
+    )
+    if commit:
+        db.commit()
+
+
+def update_ring_summary_many(
+    db: Any,
+    feature_vectors: Dict[int, Dict],
+    commit: bool = True
+) -> int:
+    """
+    Update ring_summary for many rings with one executemany.
+
+    Args:
+        db: Connection (e.g. from db.transaction())
+        feature_vectors: Aggregated features per ring number
+        commit: Commit after the updates; False when the caller owns the
+            transaction
+
+    Returns:
+        Number of rings written
+    """
+    updated_at = time.time()
+    db.executemany(
+        _SQL_UPDATE_RING,
+        [
+            _ring_summary_params(ring_number, feature_vector, updated_at)
+            for ring_number, feature_vector in feature_vectors.items()
+        ]
     )
-    db.commit()
+    if commit:
+        db.commit()
+    return len(feature_vectors)
@@ -4,11 +4,21 @@ Aggregates shield guidance/attitude data for ring-level analysis
 Processes pitch, roll, yaw, and deviation measurements
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 import numpy as np
 
+from edge.services.aligner.kernels import circular_mean, finite_summary_stats, summary_stats
+
 logger = logging.getLogger(__name__)
 
+# Columns read for a ring window, and how each channel is aggregated
+WINDOW_COLUMNS = (
+    'timestamp', 'pitch', 'roll', 'yaw',
+    'horizontal_deviation', 'vertical_deviation', 'axis_deviation'
+)
+ANGULAR_FIELDS = ('pitch', 'roll', 'yaw')
+DEVIATION_FIELDS = ('horizontal_deviation', 'vertical_deviation', 'axis_deviation')
+
 
 class AttitudeAggregator:
     """
@@ -48,87 +58,128 @@ class AttitudeAggregator:
             Dictionary with aggregated attitude features
         """
         try:
-            with db.get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT
-                        pitch, roll, yaw,
-                        horizontal_deviation, vertical_deviation, axis_deviation
-                    FROM attitude_logs
-                    WHERE timestamp >= ?
-                      AND timestamp <= ?
-                    ORDER BY timestamp
-                    """,
-                    (start_time, end_time)
-                )
-
-                rows = cursor.fetchall()
-
-                if not rows:
-                    logger.warning(
-                        f"No attitude data found for ring {ring_number}"
-                    )
-                    return {}
-
-                # Extract data
-                pitch_values = [row['pitch'] for row in rows if row['pitch'] is not None]
-                roll_values = [row['roll'] for row in rows if row['roll'] is not None]
-                yaw_values = [row['yaw'] for row in rows if row['yaw'] is not None]
-
-                h_dev_values = [row['horizontal_deviation'] for row in rows
-                               if row['horizontal_deviation'] is not None]
-                v_dev_values = [row['vertical_deviation'] for row in rows
-                               if row['vertical_deviation'] is not None]
-                axis_dev_values = [row['axis_deviation'] for row in rows
-                                  if row['axis_deviation'] is not None]
-
-                # Calculate aggregations
-                features = {}
-
-                # Angular data (use circular mean)
-                if pitch_values:
-                    features.update(self._aggregate_angular('pitch', pitch_values))
-
-                if roll_values:
-                    features.update(self._aggregate_angular('roll', roll_values))
-
-                if yaw_values:
-                    features.update(self._aggregate_angular('yaw', yaw_values))
-
-                # Deviation data (linear statistics)
-                if h_dev_values:
-                    features.update(
-                        self._aggregate_linear('horizontal_deviation', h_dev_values)
-                    )
-
-                if v_dev_values:
-                    features.update(
-                        self._aggregate_linear('vertical_deviation', v_dev_values)
-                    )
-
-                if axis_dev_values:
-                    features.update(
-                        self._aggregate_linear('axis_deviation', axis_dev_values)
-                    )
-
-                self.stats['rings_processed'] += 1
-                self.stats['total_readings'] += len(rows)
-
-                logger.info(
-                    f"Aggregated attitude data for ring {ring_number}: "
-                    f"{len(rows)} readings, {len(features)} features"
-                )
-
-                return features
+            columns = self._fetch_window(db, start_time, end_time)
+            return self._aggregate_from_arrays(ring_number, columns)
 
         except Exception as e:
             logger.error(f"Error aggregating attitude data for ring {ring_number}: {e}")
             raise
 
+    def aggregate_all(
+        self,
+        db,
+        ring_number: int,
+        start_time: float,
+        end_time: float,
+        tolerance_mm: float = 50.0
+    ) -> Dict[str, Any]:
+        """
+        Features, trajectory quality and deviation trend from one query.
+
+        Reads the ring window once and shares it across the three
+        computations instead of scanning attitude_logs three times.
+
+        Args:
+            db: Database manager
+            ring_number: Ring number
+            start_time: Ring start timestamp
+            end_time: Ring end timestamp
+            tolerance_mm: Allowable deviation (mm)
+
+        Returns:
+            Dict with 'features', 'trajectory_quality' and 'deviation_trend'
+        """
+        try:
+            columns = self._fetch_window(db, start_time, end_time)
+        except Exception as e:
+            logger.error(f"Error aggregating attitude data for ring {ring_number}: {e}")
+            raise
+
+        return {
+            'features': self._aggregate_from_arrays(ring_number, columns),
+            'trajectory_quality': self._trajectory_from_arrays(columns, tolerance_mm),
+            'deviation_trend': self._trend_from_arrays(columns)
+        }
+
+    def _fetch_window(
+        self,
+        db,
+        start_time: float,
+        end_time: float
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read the attitude window as float64 column arrays (NULL -> NaN).
+
+        The rows are copied once into a Fortran-ordered (n, columns) block,
+        so the per-field reductions run over contiguous memory.
+
+        Returns:
+            Dict of column name -> array, in timestamp order (empty arrays
+            if the window has no readings)
+        """
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(
+                f"""
+                SELECT {', '.join(WINDOW_COLUMNS)}
+                FROM attitude_logs
+                WHERE timestamp >= ?
+                  AND timestamp <= ?
+                ORDER BY timestamp
+                """,
+                (start_time, end_time)
+            ).fetchall()
+
+        # One column-major allocation: every column is a contiguous view
+        data = np.array(rows, dtype=np.float64, order='F').reshape(
+            len(rows), len(WINDOW_COLUMNS), order='F'
+        )
+        return {name: data[:, i] for i, name in enumerate(WINDOW_COLUMNS)}
+
+    def _aggregate_from_arrays(
+        self,
+        ring_number: int,
+        columns: Dict[str, np.ndarray]
+    ) -> Dict[str, Any]:
+        """Aggregated attitude features from a fetched window"""
+        n_rows = len(columns['timestamp'])
+        if n_rows == 0:
+            logger.warning(
+                f"No attitude data found for ring {ring_number}"
+            )
+            return {}
+
+        features = {}
+
+        # Angular data (use circular mean)
+        for name in ANGULAR_FIELDS:
+            values = columns[name]
+            values = values[~np.isnan(values)]
+            if len(values):
+                features.update(self._aggregate_angular(name, values))
+
+        # Deviation data (linear statistics)
+        for name in DEVIATION_FIELDS:
+            values = columns[name]
+            values = values[~np.isnan(values)]
+            if len(values):
+                features.update(self._aggregate_linear(name, values))
+
+        self.stats['rings_processed'] += 1
+        self.stats['total_readings'] += n_rows
+
+        logger.info(
+            f"Aggregated attitude data for ring {ring_number}: "
+            f"{n_rows} readings, {len(features)} features"
+        )
+
+        return features
+
     def _aggregate_angular(
         self,
         name: str,
-        values: list
+        values: Sequence[float]
     ) -> Dict[str, float]:
         """
         Aggregate angular data using circular statistics.
@@ -138,35 +189,29 @@ class AttitudeAggregator:
 
         Args:
             name: Parameter name (pitch, roll, yaw)
-            values: List of angle values in degrees
+            values: Angle values in degrees
 
         Returns:
             Dictionary with circular mean and linear std
         """
-        if not values:
+        if len(values) == 0:
             return {}
 
         try:
-            values_array = np.array(values)
-
-            # Convert degrees to radians
-            radians = np.deg2rad(values_array)
+            values_array = np.asarray(values, dtype=np.float64)
 
             # Circular mean
-            sin_mean = np.mean(np.sin(radians))
-            cos_mean = np.mean(np.cos(radians))
-            circular_mean = np.arctan2(sin_mean, cos_mean)
-            circular_mean_deg = np.rad2deg(circular_mean)
+            circular_mean_deg = circular_mean(values_array)
 
             # For std, use linear approximation (valid for small variations)
             # Full circular std is more complex
-            linear_std = float(np.std(values_array))
+            _, max_value, min_value, linear_std = summary_stats(values_array)
 
             return {
-                f'mean_{name}': float(circular_mean_deg),
+                f'mean_{name}': circular_mean_deg,
                 f'std_{name}': linear_std,
-                f'max_{name}': float(np.max(values_array)),
-                f'min_{name}': float(np.min(values_array))
+                f'max_{name}': max_value,
+                f'min_{name}': min_value
             }
 
         except Exception as e:
@@ -176,35 +221,35 @@ class AttitudeAggregator:
     def _aggregate_linear(
         self,
         name: str,
-        values: list
+        values: Sequence[float]
     ) -> Dict[str, float]:
         """
         Aggregate linear data (deviations).
 
         Args:
             name: Parameter name
-            values: List of values
+            values: Values
 
         Returns:
             Dictionary with mean, max, min, std
         """
-        if not values:
+        if len(values) == 0:
             return {}
 
         try:
-            values_array = np.array(values)
-
-            # Remove NaN/inf
-            values_array = values_array[np.isfinite(values_array)]
+            # NaN/inf are skipped inside the reduction
+            n_valid, mean_value, max_value, min_value, std_value = finite_summary_stats(
+                values
+            )
 
-            if len(values_array) == 0:
+            if n_valid == 0:
                 return {}
 
             return {
-                f'mean_{name}': float(np.mean(values_array)),
-                f'max_{name}': float(np.max(values_array)),
-                f'min_{name}': float(np.min(values_array)),
-                f'std_{name}': float(np.std(values_array))
+                f'mean_{name}': mean_value,
+                f'max_{name}': max_value,
+                f'min_{name}': min_value,
+                f'std_{name}': std_value
             }
 
         except Exception as e:
@@ -235,62 +280,7 @@ class AttitudeAggregator:
             Dictionary with trajectory quality metrics
         """
         try:
-            with db.get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT
-                        horizontal_deviation, vertical_deviation, axis_deviation
-                    FROM attitude_logs
-                    WHERE timestamp >= ?
-                      AND timestamp <= ?
-                    """,
-                    (start_time, end_time)
-                )
-
-                rows = cursor.fetchall()
-
-                if not rows:
-                    return {
-                        'quality': 'unknown',
-                        'samples': 0
-                    }
-
-                # Check how many samples exceed tolerance
-                total_samples = len(rows)
-                out_of_tolerance = 0
-
-                for row in rows:
-                    h_dev = row['horizontal_deviation'] or 0
-                    v_dev = row['vertical_deviation'] or 0
-                    axis_dev = row['axis_deviation'] or 0
-
-                    # Total deviation (Euclidean distance)
-                    total_dev = np.sqrt(h_dev**2 + v_dev**2 + axis_dev**2)
-
-                    if total_dev > tolerance_mm:
-                        out_of_tolerance += 1
-
-                # Calculate metrics
-                within_tolerance_pct = ((total_samples - out_of_tolerance) / total_samples) * 100
-
-                # Assess quality
-                if within_tolerance_pct >= 95:
-                    quality = 'excellent'
-                elif within_tolerance_pct >= 90:
-                    quality = 'good'
-                elif within_tolerance_pct >= 80:
-                    quality = 'acceptable'
-                else:
-                    quality = 'poor'
-
-                return {
-                    'quality': quality,
-                    'samples': total_samples,
-                    'out_of_tolerance': out_of_tolerance,
-                    'within_tolerance_percent': round(within_tolerance_pct, 2),
-                    'tolerance_mm': tolerance_mm
-                }
-
+            columns = self._fetch_window(db, start_time, end_time)
         except Exception as e:
             logger.error(f"Error calculating trajectory quality: {e}")
             return {
@@ -299,6 +289,50 @@ class AttitudeAggregator:
                 'error': str(e)
             }
 
+        return self._trajectory_from_arrays(columns, tolerance_mm)
+
+    def _trajectory_from_arrays(
+        self,
+        columns: Dict[str, np.ndarray],
+        tolerance_mm: float
+    ) -> Dict[str, Any]:
+        """Trajectory quality metrics from a fetched window"""
+        total_samples = len(columns['timestamp'])
+        if total_samples == 0:
+            return {
+                'quality': 'unknown',
+                'samples': 0
+            }
+
+        # Count samples whose total (Euclidean) deviation exceeds tolerance;
+        # missing deviations count as 0. Compared squared, so no sqrt.
+        h_dev = np.nan_to_num(columns['horizontal_deviation'])
+        v_dev = np.nan_to_num(columns['vertical_deviation'])
+        axis_dev = np.nan_to_num(columns['axis_deviation'])
+        squared_dev = h_dev * h_dev + v_dev * v_dev + axis_dev * axis_dev
+        out_of_tolerance = int(np.count_nonzero(squared_dev > tolerance_mm * tolerance_mm))
+
+        # Calculate metrics
+        within_tolerance_pct = ((total_samples - out_of_tolerance) / total_samples) * 100
+
+        # Assess quality
+        if within_tolerance_pct >= 95:
+            quality = 'excellent'
+        elif within_tolerance_pct >= 90:
+            quality = 'good'
+        elif within_tolerance_pct >= 80:
+            quality = 'acceptable'
+        else:
+            quality = 'poor'
+
+        return {
+            'quality': quality,
+            'samples': total_samples,
+            'out_of_tolerance': out_of_tolerance,
+            'within_tolerance_percent': round(within_tolerance_pct, 2),
+            'tolerance_mm': tolerance_mm
+        }
+
     def calculate_deviation_trend(
         self,
         db,
@@ -321,43 +355,7 @@ class AttitudeAggregator:
             Dictionary with trend analysis
         """
         try:
-            with db.get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT
-                        timestamp,
-                        horizontal_deviation, vertical_deviation
-                    FROM attitude_logs
-                    WHERE timestamp >= ?
-                      AND timestamp <= ?
-                    ORDER BY timestamp
-                    """,
-                    (start_time, end_time)
-                )
-
-                rows = cursor.fetchall()
-
-                if len(rows) < 10:
-                    return {
-                        'horizontal_trend': 'insufficient_data',
-                        'vertical_trend': 'insufficient_data'
-                    }
-
-                # Extract data
-                h_devs = [row['horizontal_deviation'] for row in rows
-                         if row['horizontal_deviation'] is not None]
-                v_devs = [row['vertical_deviation'] for row in rows
-                         if row['vertical_deviation'] is not None]
-
-                # Calculate trends using simple linear regression slope
-                h_trend = self._calculate_trend(h_devs)
-                v_trend = self._calculate_trend(v_devs)
-
-                return {
-                    'horizontal_trend': h_trend,
-                    'vertical_trend': v_trend
-                }
-
+            columns = self._fetch_window(db, start_time, end_time)
         except Exception as e:
             logger.error(f"Error calculating deviation trend: {e}")
             return {
@@ -365,7 +363,26 @@ class AttitudeAggregator:
                 'vertical_trend': 'error'
             }
 
-    def _calculate_trend(self, values: list) -> str:
+        return self._trend_from_arrays(columns)
+
+    def _trend_from_arrays(self, columns: Dict[str, np.ndarray]) -> Dict[str, str]:
+        """Deviation trends from a fetched window"""
+        if len(columns['timestamp']) < 10:
+            return {
+                'horizontal_trend': 'insufficient_data',
+                'vertical_trend': 'insufficient_data'
+            }
+
+        h_devs = columns['horizontal_deviation']
+        v_devs = columns['vertical_deviation']
+
+        # Calculate trends using simple linear regression slope
+        return {
+            'horizontal_trend': self._calculate_trend(h_devs[~np.isnan(h_devs)]),
+            'vertical_trend': self._calculate_trend(v_devs[~np.isnan(v_devs)])
+        }
+
+    def _calculate_trend(self, values: Sequence[float]) -> str:
         """
         Calculate trend direction from time series.
 
@@ -379,12 +396,12 @@ class AttitudeAggregator:
             return 'insufficient_data'
 
         try:
-            # Simple linear regression
-            x = np.arange(len(values))
-            y = np.array(values)
-
-            # Calculate slope
-            slope = np.polyfit(x, y, 1)[0]
+            # Least-squares slope against x = 0..n-1 in closed form:
+            # Sxy / Sxx with Sxx = n(n^2 - 1) / 12 (no Vandermonde/lstsq)
+            y = np.asarray(values, dtype=np.float64)
+            n = len(y)
+            sxy = np.arange(n, dtype=np.float64).dot(y) - (n - 1) / 2 * y.sum()
+            slope = sxy / (n * (n * n - 1) / 12)
 
             # Threshold for "stable" (< 0.1 mm per sample)
             if abs(slope) < 0.1:
@@ -4,12 +4,38 @@ Calculates derived indicators from aggregated data
 Includes specific energy, ground loss rate, volume loss ratio, etc.
 """
 import logging
-from typing import Dict, Any, Optional
+import numbers
+from typing import Dict, Any, Mapping, Optional
 import math
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+def _is_finite(x: Any) -> bool:
+    """
+    True for a finite real number, including NumPy scalars from the
+    aggregators (None, bool, NaN and inf are rejected)
+    """
+    return isinstance(x, numbers.Real) and not isinstance(x, bool) and math.isfinite(x)
+
+
+def _is_positive(x: Any) -> bool:
+    """True for a finite real number greater than zero"""
+    return _is_finite(x) and x > 0
+
+
+# Decimal places of each indicator as reported by calculate_all_indicators()
+INDICATOR_PRECISION = {
+    'specific_energy': 2,
+    'ground_loss_rate': 3,
+    'volume_loss_ratio': 2,
+    'penetration_efficiency': 4,
+    'torque_thrust_ratio': 4,
+    'power_efficiency': 3
+}
+
+
 class DerivedIndicatorCalculator:
     """
     Calculates derived engineering indicators for tunneling analysis.
@@ -35,16 +61,45 @@ class DerivedIndicatorCalculator:
             tunnel_diameter: Tunnel excavation diameter (m)
             ring_width: Ring width/advance per ring (m)
         """
-        self.tunnel_diameter = tunnel_diameter
-        self.ring_width = ring_width
-
-        # Calculate excavation volume per ring
-        self.excavation_volume = self._calculate_excavation_volume()
+        self._tunnel_diameter = tunnel_diameter
+        self._ring_width = ring_width
+        self._energy_coeff = 3.6 / 60  # kW·min -> MJ
+        self._update_geometry()
 
         self.stats = {
             'rings_processed': 0
         }
 
+    @property
+    def tunnel_diameter(self) -> float:
+        """Tunnel excavation diameter (m)"""
+        return self._tunnel_diameter
+
+    @tunnel_diameter.setter
+    def tunnel_diameter(self, value: float) -> None:
+        self._tunnel_diameter = value
+        self._update_geometry()
+
+    @property
+    def ring_width(self) -> float:
+        """Ring width/advance per ring (m)"""
+        return self._ring_width
+
+    @ring_width.setter
+    def ring_width(self, value: float) -> None:
+        self._ring_width = value
+        self._update_geometry()
+
+    def _update_geometry(self) -> None:
+        """Fold the per-ring geometric invariants (on init and on change)"""
+        # Calculate excavation volume per ring
+        self.excavation_volume = self._calculate_excavation_volume()
+        # None for degenerate geometry: volume-based indicators are then None
+        self._inv_excavation_volume = (
+            1.0 / self.excavation_volume if self.excavation_volume > 0 else None
+        )
+        self._default_tail_void = self._calculate_tail_void_volume()
+
     def _calculate_excavation_volume(self) -> float:
         """
         Calculate theoretical excavation volume per ring.
@@ -57,6 +112,21 @@ class DerivedIndicatorCalculator:
         volume = area * self.ring_width
         return volume
 
+    def _calculate_tail_void_volume(self) -> float:
+        """
+        Estimate the tail void volume per ring from geometry.
+
+        Typical shield has ~50mm overcut.
+
+        Returns:
+            Volume in cubic meters
+        """
+        overcut_diameter = self.tunnel_diameter + 0.1  # 50mm radius overcut
+        shield_diameter = self.tunnel_diameter - 0.05  # Shield slightly smaller
+
+        overcut_area = math.pi * ((overcut_diameter/2)**2 - (shield_diameter/2)**2)
+        return overcut_area * self.ring_width
+
     def calculate_specific_energy(
         self,
         mean_cutterhead_power: float,
@@ -74,28 +144,21 @@ class DerivedIndicatorCalculator:
             duration_minutes: Ring construction duration (minutes)
 
         Returns:
-            Specific energy (MJ/m³) or None on error
+            Specific energy (MJ/m³) or None for invalid inputs
         """
-        try:
-            if mean_penetration_rate <= 0:
-                logger.warning("Invalid penetration rate for specific energy calculation")
-                return None
-
-            # Total energy consumed (kWh -> MJ)
-            total_energy_kwh = mean_cutterhead_power * (duration_minutes / 60)
-            total_energy_mj = total_energy_kwh * 3.6  # 1 kWh = 3.6 MJ
-
-            # Excavated volume
-            excavated_volume = self.excavation_volume
-
-            # Specific energy
-            specific_energy = total_energy_mj / excavated_volume
+        if not _is_positive(mean_penetration_rate):
+            logger.warning("Invalid penetration rate for specific energy calculation")
+            return None
+        if not (_is_finite(mean_cutterhead_power) and _is_finite(duration_minutes)):
+            return None
+        if self._inv_excavation_volume is None:
+            return None
 
-            return round(specific_energy, 2)
+        # Total energy consumed (kW·min -> MJ; 1 kWh = 3.6 MJ)
+        total_energy_mj = mean_cutterhead_power * duration_minutes * self._energy_coeff
 
-        except Exception as e:
-            logger.error(f"Error calculating specific energy: {e}")
-            return None
+        # Specific energy
+        return total_energy_mj * self._inv_excavation_volume
 
     def calculate_ground_loss_rate(
         self,
@@ -114,26 +177,16 @@ class DerivedIndicatorCalculator:
                             If None, calculated from geometry
 
         Returns:
-            Ground loss rate (m³) or None
+            Ground loss rate (m³) or None for invalid inputs
         """
-        try:
-            if tail_void_volume is None:
-                # Estimate tail void from geometry
-                # Typical shield has ~50mm overcut
-                overcut_diameter = self.tunnel_diameter + 0.1  # 50mm radius overcut
-                shield_diameter = self.tunnel_diameter - 0.05  # Shield slightly smaller
-
-                overcut_area = math.pi * ((overcut_diameter/2)**2 - (shield_diameter/2)**2)
-                tail_void_volume = overcut_area * self.ring_width
-
-            # Ground loss = excess grout volume
-            ground_loss = mean_grout_volume - tail_void_volume
-
-            return round(ground_loss, 3)
-
-        except Exception as e:
-            logger.error(f"Error calculating ground loss rate: {e}")
+        if not _is_finite(mean_grout_volume):
             return None
+        if tail_void_volume is None:
+            # Estimate tail void from geometry (cached)
+            tail_void_volume = self._default_tail_void
+
+        # Ground loss = excess grout volume
+        return mean_grout_volume - tail_void_volume
 
     def calculate_volume_loss_ratio(
         self,
@@ -148,20 +201,15 @@ class DerivedIndicatorCalculator:
             ground_loss_rate: Ground loss volume (m³)
 
         Returns:
-            Volume loss ratio (%) or None
+            Volume loss ratio (%) or None for invalid inputs
         """
-        try:
-            if ground_loss_rate < 0:
-                logger.warning("Negative ground loss detected, setting to 0")
-                ground_loss_rate = 0
-
-            volume_loss_ratio = (ground_loss_rate / self.excavation_volume) * 100
-
-            return round(volume_loss_ratio, 2)
-
-        except Exception as e:
-            logger.error(f"Error calculating volume loss ratio: {e}")
+        if not _is_finite(ground_loss_rate) or self._inv_excavation_volume is None:
             return None
+        if ground_loss_rate < 0:
+            logger.warning("Negative ground loss detected, setting to 0")
+            ground_loss_rate = 0
+
+        return ground_loss_rate * self._inv_excavation_volume * 100
 
     def calculate_penetration_efficiency(
         self,
@@ -184,21 +232,15 @@ class DerivedIndicatorCalculator:
         Returns:
             Efficiency index or None
         """
-        try:
-            if mean_thrust <= 0 or mean_cutterhead_power <= 0:
-                return None
-
-            # Normalize to consistent units
-            penetration_m_min = mean_penetration_rate / 1000  # mm/min -> m/min
-
-            # Efficiency metric (dimensionless index)
-            efficiency = penetration_m_min / (mean_thrust * mean_cutterhead_power) * 1e6
+        if not (_is_positive(mean_thrust) and _is_positive(mean_cutterhead_power)
+                and _is_finite(mean_penetration_rate)):
+            return None
 
-            return round(efficiency, 4)
+        # Normalize to consistent units
+        penetration_m_min = mean_penetration_rate / 1000  # mm/min -> m/min
 
-        except Exception as e:
-            logger.error(f"Error calculating penetration efficiency: {e}")
-            return None
+        # Efficiency metric (dimensionless index)
+        return penetration_m_min / (mean_thrust * mean_cutterhead_power) * 1e6
 
     def calculate_torque_thrust_ratio(
         self,
@@ -219,18 +261,11 @@ class DerivedIndicatorCalculator:
         Returns:
             Torque/thrust ratio or None
         """
-        try:
-            if mean_thrust <= 0:
-                return None
-
-            ratio = mean_torque / mean_thrust
-
-            return round(ratio, 4)
-
-        except Exception as e:
-            logger.error(f"Error calculating torque/thrust ratio: {e}")
+        if not (_is_positive(mean_thrust) and _is_finite(mean_torque)):
             return None
 
+        return mean_torque / mean_thrust
+
     def calculate_power_efficiency(
         self,
         mean_total_power: float,
@@ -248,18 +283,11 @@ class DerivedIndicatorCalculator:
         Returns:
             Efficiency ratio (0-1) or None
         """
-        try:
-            if mean_total_power <= 0:
-                return None
-
-            efficiency = mean_cutterhead_power / mean_total_power
-
-            return round(efficiency, 3)
-
-        except Exception as e:
-            logger.error(f"Error calculating power efficiency: {e}")
+        if not (_is_positive(mean_total_power) and _is_finite(mean_cutterhead_power)):
             return None
 
+        return mean_cutterhead_power / mean_total_power
+
     def calculate_all_indicators(
         self,
         plc_features: Dict[str, float],
@@ -268,6 +296,8 @@ class DerivedIndicatorCalculator:
         """
         Calculate all derived indicators from aggregated features.
 
+        Values are rounded to INDICATOR_PRECISION decimal places.
+
         Args:
             plc_features: Dictionary with aggregated PLC features
             duration_minutes: Ring construction duration
@@ -277,54 +307,152 @@ class DerivedIndicatorCalculator:
         """
         indicators = {}
 
-        # Specific energy
-        if all(k in plc_features for k in ['mean_cutterhead_power', 'mean_penetration_rate']):
-            indicators['specific_energy'] = self.calculate_specific_energy(
-                plc_features['mean_cutterhead_power'],
-                plc_features['mean_penetration_rate'],
-                duration_minutes
-            )
-
-        # Ground loss rate
-        if 'mean_grout_volume' in plc_features:
-            ground_loss = self.calculate_ground_loss_rate(
-                plc_features['mean_grout_volume']
-            )
-            indicators['ground_loss_rate'] = ground_loss
-
-            # Volume loss ratio (depends on ground loss)
-            if ground_loss is not None:
-                indicators['volume_loss_ratio'] = self.calculate_volume_loss_ratio(
-                    ground_loss
+        # Inputs are validated by each method; this only catches the unexpected
+        try:
+            # Specific energy
+            if all(k in plc_features for k in ['mean_cutterhead_power', 'mean_penetration_rate']):
+                indicators['specific_energy'] = self.calculate_specific_energy(
+                    plc_features['mean_cutterhead_power'],
+                    plc_features['mean_penetration_rate'],
+                    duration_minutes
                 )
 
-        # Penetration efficiency
-        if all(k in plc_features for k in ['mean_penetration_rate', 'mean_thrust',
-                                             'mean_cutterhead_power']):
-            indicators['penetration_efficiency'] = self.calculate_penetration_efficiency(
-                plc_features['mean_penetration_rate'],
-                plc_features['mean_thrust'],
-                plc_features['mean_cutterhead_power']
-            )
-
-        # Torque/thrust ratio
-        if all(k in plc_features for k in ['mean_torque', 'mean_thrust']):
-            indicators['torque_thrust_ratio'] = self.calculate_torque_thrust_ratio(
-                plc_features['mean_torque'],
-                plc_features['mean_thrust']
-            )
-
-        # Power efficiency
-        if all(k in plc_features for k in ['mean_total_power', 'mean_cutterhead_power']):
-            indicators['power_efficiency'] = self.calculate_power_efficiency(
-                plc_features['mean_total_power'],
-                plc_features['mean_cutterhead_power']
-            )
+            # Ground loss rate
+            if 'mean_grout_volume' in plc_features:
+                ground_loss = self.calculate_ground_loss_rate(
+                    plc_features['mean_grout_volume']
+                )
+                indicators['ground_loss_rate'] = ground_loss
+
+                # Volume loss ratio (depends on ground loss)
+                if ground_loss is not None:
+                    indicators['volume_loss_ratio'] = self.calculate_volume_loss_ratio(
+                        ground_loss
+                    )
+
+            # Penetration efficiency
+            if all(k in plc_features for k in ['mean_penetration_rate', 'mean_thrust',
+                                               'mean_cutterhead_power']):
+                indicators['penetration_efficiency'] = self.calculate_penetration_efficiency(
+                    plc_features['mean_penetration_rate'],
+                    plc_features['mean_thrust'],
+                    plc_features['mean_cutterhead_power']
+                )
+
+            # Torque/thrust ratio
+            if all(k in plc_features for k in ['mean_torque', 'mean_thrust']):
+                indicators['torque_thrust_ratio'] = self.calculate_torque_thrust_ratio(
+                    plc_features['mean_torque'],
+                    plc_features['mean_thrust']
+                )
+
+            # Power efficiency
+            if all(k in plc_features for k in ['mean_total_power', 'mean_cutterhead_power']):
+                indicators['power_efficiency'] = self.calculate_power_efficiency(
+                    plc_features['mean_total_power'],
+                    plc_features['mean_cutterhead_power']
+                )
+
+        except Exception as e:
+            logger.error(f"Error calculating derived indicators: {e}")
 
         self.stats['rings_processed'] += 1
 
         logger.info(f"Calculated {len(indicators)} derived indicators")
 
+        # Round once for reporting; the methods above keep full precision
+        return {
+            name: None if value is None else round(value, INDICATOR_PRECISION[name])
+            for name, value in indicators.items()
+        }
+
+    def calculate_all_indicators_batch(
+        self,
+        plc_features: Mapping[str, Any],
+        duration_minutes: Any
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate derived indicators for many rings at once.
+
+        Column-wise counterpart of calculate_all_indicators() for backfills:
+        each indicator is a few elementwise NumPy operations over all rings
+        instead of per-ring Python calls. Values are rounded like
+        calculate_all_indicators(); NaN marks rings where it returns None.
+
+        Args:
+            plc_features: Feature name -> per-ring values (dict of arrays or
+                a DataFrame)
+            duration_minutes: Per-ring construction duration (or a scalar)
+
+        Returns:
+            Dictionary of indicator name -> per-ring float64 array (an
+            indicator is omitted when its input features are missing)
+        """
+        def column(name: str) -> np.ndarray:
+            return np.asarray(plc_features[name], dtype=np.float64)
+
+        indicators: Dict[str, np.ndarray] = {}
+        n_rings = 0
+        inv_volume = (
+            np.nan if self._inv_excavation_volume is None else self._inv_excavation_volume
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Specific energy
+            if all(k in plc_features for k in ['mean_cutterhead_power', 'mean_penetration_rate']):
+                power = column('mean_cutterhead_power')
+                energy = power * np.asarray(duration_minutes, dtype=np.float64) * self._energy_coeff
+                indicators['specific_energy'] = np.where(
+                    column('mean_penetration_rate') > 0,
+                    energy * inv_volume,
+                    np.nan
+                )
+
+            # Ground loss rate and volume loss ratio
+            if 'mean_grout_volume' in plc_features:
+                ground_loss = column('mean_grout_volume') - self._default_tail_void
+                indicators['ground_loss_rate'] = ground_loss
+                indicators['volume_loss_ratio'] = (
+                    np.maximum(ground_loss, 0) * inv_volume * 100
+                )
+
+            # Penetration efficiency
+            if all(k in plc_features for k in ['mean_penetration_rate', 'mean_thrust',
+                                               'mean_cutterhead_power']):
+                thrust = column('mean_thrust')
+                power = column('mean_cutterhead_power')
+                efficiency = column('mean_penetration_rate') / 1000 / (thrust * power) * 1e6
+                indicators['penetration_efficiency'] = np.where(
+                    (thrust > 0) & (power > 0), efficiency, np.nan
+                )
+
+            # Torque/thrust ratio
+            if all(k in plc_features for k in ['mean_torque', 'mean_thrust']):
+                thrust = column('mean_thrust')
+                indicators['torque_thrust_ratio'] = np.where(
+                    thrust > 0, column('mean_torque') / thrust, np.nan
+                )
+
+            # Power efficiency
+            if all(k in plc_features for k in ['mean_total_power', 'mean_cutterhead_power']):
+                total_power = column('mean_total_power')
+                indicators['power_efficiency'] = np.where(
+                    total_power > 0,
+                    column('mean_cutterhead_power') / total_power,
+                    np.nan
+                )
+
+        indicators = {
+            name: np.round(values, INDICATOR_PRECISION[name])
+            for name, values in indicators.items()
+        }
+
+        if indicators:
+            n_rings = len(next(iter(indicators.values())))
+        self.stats['rings_processed'] += n_rings
+
+        logger.info(f"Calculated {len(indicators)} derived indicators for {n_rings} rings")
+
         return indicators
 
     def get_statistics(self) -> Dict[str, Any]:
@@ -0,0 +1,149 @@
+"""
+Numeric Kernels for Ring Aggregation
+Single-pass reductions shared by the aligner aggregators
+Compiled with Numba when available (GIL released), NumPy otherwise
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+# numba JIT for the per-sample loops; NumPy reductions are the fallback
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+
+
+def _summary_stats_numpy(values: np.ndarray) -> Tuple[float, float, float, float]:
+    """mean, max, min, population std (std from centered dot product)"""
+    n = values.size
+    mean = values.sum() / n
+    centered = values - mean
+    variance = centered.dot(centered) / n
+    return float(mean), float(values.max()), float(values.min()), math.sqrt(variance)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _summary_stats_jit(values):
+        # Welford: running mean and sum of squared deviations (m2)
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        lo = values[0]
+        hi = values[0]
+        for v in values:
+            count += 1
+            delta = v - mean
+            mean += delta / count
+            m2 += delta * (v - mean)
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        return mean, hi, lo, math.sqrt(m2 / count)
+
+
+def _circular_mean_numpy(degrees: np.ndarray) -> float:
+    """Angle of the resultant vector via one complex exponential"""
+    resultant = np.exp(1j * np.deg2rad(degrees)).sum()
+    return math.degrees(math.atan2(resultant.imag, resultant.real))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _circular_mean_jit(degrees):
+        sin_sum = 0.0
+        cos_sum = 0.0
+        for d in degrees:
+            r = math.radians(d)
+            sin_sum += math.sin(r)
+            cos_sum += math.cos(r)
+        return math.degrees(math.atan2(sin_sum, cos_sum))
+
+
+def circular_mean(degrees: np.ndarray) -> float:
+    """
+    Circular mean (degrees) of a non-empty array of angles in degrees.
+
+    Sine and cosine are accumulated in one loop with Numba, or taken from a
+    single complex exponential with NumPy. The resultant is not divided by
+    n since atan2 is scale-invariant.
+    """
+    degrees = np.ascontiguousarray(degrees, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return float(_circular_mean_jit(degrees))
+    return _circular_mean_numpy(degrees)
+
+
+def summary_stats(values: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    mean, max, min and population std of a non-empty float64 array.
+
+    One pass over the data with Numba, using Welford's update for the
+    variance; with NumPy, std is the dot product of the mean-centered
+    values. Both avoid the cancellation of E[x^2] - E[x]^2 on large
+    offsets such as absolute deviations.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        mean, hi, lo, std = _summary_stats_jit(values)
+        return float(mean), float(hi), float(lo), float(std)
+    return _summary_stats_numpy(values)
+
+
+def _finite_summary_stats_numpy(values: np.ndarray) -> Tuple[int, float, float, float, float]:
+    """finite_summary_stats() via an isfinite mask"""
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0, math.nan, math.nan, math.nan, math.nan
+    return (finite.size, *_summary_stats_numpy(finite))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _finite_summary_stats_jit(values):
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        lo = math.inf
+        hi = -math.inf
+        for v in values:
+            if not math.isfinite(v):
+                continue
+            count += 1
+            delta = v - mean
+            mean += delta / count
+            m2 += delta * (v - mean)
+            if v < lo:
+                lo = v
+            if v > hi:
+                hi = v
+        if count == 0:
+            return 0, math.nan, math.nan, math.nan, math.nan
+        return count, mean, hi, lo, math.sqrt(m2 / count)
+
+
+def finite_summary_stats(values: np.ndarray) -> Tuple[int, float, float, float, float]:
+    """
+    summary_stats() over the finite elements of an array.
+
+    Returns (n_valid, mean, max, min, std); the statistics are NaN when
+    n_valid is 0. With Numba, NaN/inf are skipped inside the single pass
+    rather than through a mask and a compacted copy.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        count, mean, hi, lo, std = _finite_summary_stats_jit(values)
+        return int(count), float(mean), float(hi), float(lo), float(std)
+    return _finite_summary_stats_numpy(values)
+
+
+# Compile (or load from the on-disk cache) at import, not on the first ring
+if NUMBA_AVAILABLE:
+    summary_stats(np.zeros(1))
+    finite_summary_stats(np.zeros(1))
+    circular_mean(np.zeros(1))
@@ -3,12 +3,113 @@ T044: PLC Data Aggregator (Modular)
 Aggregates high-frequency PLC data into ring-level statistics
 Calculates mean, max, min, std for each tag
 """
+import json
 import logging
-from typing import Dict, List, Any, Optional
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import numpy as np
 
+from edge.services.aligner.kernels import NUMBA_AVAILABLE, finite_summary_stats
+
 logger = logging.getLogger(__name__)
 
+# Statistics reported per tag
+STAT_TYPES = ('mean', 'max', 'min', 'std', 'median')
+
+# Medians are only computed for tags with at most this many readings
+MEDIAN_MAX_SAMPLES = 10000
+
+# Per-tag aggregates of a window, one row per tag. Static text so sqlite3's
+# statement cache reuses the prepared statement; ?3 is a JSON array of tag
+# names, or NULL for all tags. Only finite values enter the statistics
+# (SQLite stores NaN as NULL, and 9e999 overflows to +inf), and m2 is the
+# sum of squared deviations from the tag mean, as in the kernels, rather
+# than E[x^2] - E[x]^2, which cancels for large, tightly spread readings.
+_SQL_AGGREGATE_WINDOW = """
+    WITH window_values AS (
+        SELECT tag_name,
+               CASE WHEN abs(value) < 9e999 THEN value END AS value
+        FROM plc_logs
+        WHERE timestamp >= ?1
+          AND timestamp <= ?2
+          AND data_quality_code < 2  -- not rejected/missing
+          AND (?3 IS NULL OR tag_name IN (SELECT value FROM json_each(?3)))
+    ),
+    centered AS (
+        SELECT tag_name, value,
+               value - AVG(value) OVER (PARTITION BY tag_name) AS deviation
+        FROM window_values
+    )
+    SELECT tag_name,
+           COUNT(*) AS readings,
+           COUNT(value) AS n,
+           AVG(value) AS mean,
+           MAX(value) AS max,
+           MIN(value) AS min,
+           SUM(deviation * deviation) AS m2
+    FROM centered
+    GROUP BY tag_name
+"""
+
+# Valid readings of one tag in a window (for medians)
+_SQL_TAG_VALUES = """
+    SELECT value
+    FROM plc_logs
+    WHERE tag_name = ?
+      AND timestamp >= ?
+      AND timestamp <= ?
+      AND data_quality_code < 2  -- not rejected/missing
+      AND abs(value) < 9e999  -- finite (NULL and inf excluded)
+"""
+
+# Ring windows per aggregate_rings_batch() query (3 bound parameters each,
+# kept under SQLite's default 999-variable limit)
+BATCH_WINDOW_CHUNK = 300
+
+
+@lru_cache(maxsize=8)
+def _batch_aggregate_sql(n_windows: int) -> str:
+    """Per-ring, per-tag aggregate SQL over n_windows inline ring windows"""
+    windows = ",".join(["(?, ?, ?)"] * n_windows)
+    return f"""
+    WITH ring_windows(ring_number, start_time, end_time) AS (VALUES {windows}),
+    window_values AS (
+        SELECT w.ring_number,
+               p.tag_name,
+               CASE WHEN abs(p.value) < 9e999 THEN p.value END AS value
+        FROM ring_windows w
+        JOIN plc_logs p
+          ON p.timestamp >= w.start_time AND p.timestamp <= w.end_time
+        WHERE p.data_quality_code < 2  -- not rejected/missing
+    ),
+    centered AS (
+        SELECT ring_number, tag_name, value,
+               value - AVG(value) OVER (PARTITION BY ring_number, tag_name) AS deviation
+        FROM window_values
+    )
+    SELECT ring_number,
+           tag_name,
+           COUNT(value) AS n,
+           AVG(value) AS mean,
+           MAX(value) AS max,
+           MIN(value) AS min,
+           SUM(deviation * deviation) AS m2
+    FROM centered
+    GROUP BY ring_number, tag_name
+    """
+
+
+# Ring windows whose reading counts are kept for get_data_completeness()
+# (bounds the aggregations never followed by a completeness check)
+WINDOW_COUNTS_CACHE_SIZE = 32
+
+# Smallest window (readings) for which aggregate_ring_arrays() spreads tags
+# over threads; below it, dispatch costs more than the kernels
+STATS_PARALLEL_MIN_READINGS = 100_000
+
 
 class PLCAggregator:
     """
@@ -22,61 +123,80 @@ class PLCAggregator:
     - Performance optimization for large datasets
     """
 
-    def __init__(self):
-        """Initialize PLC aggregator"""
+    def __init__(self, stats_workers: int = 1):
+        """
+        Initialize PLC aggregator
+
+        Args:
+            stats_workers: Threads computing per-tag statistics in
+                aggregate_ring_arrays(); 1 keeps it sequential. Only used
+                with Numba, whose kernels release the GIL.
+        """
+        self.stats_workers = stats_workers
+        self._stats_executor: Optional[ThreadPoolExecutor] = None
+
         self.stats = {
             'rings_processed': 0,
             'total_readings': 0,
             'tags_processed': set()
         }
 
+        # (ring_number, start_time, end_time) -> (readings, unique tags),
+        # filled by all-tag aggregations and consumed by the next
+        # get_data_completeness() call for the same window
+        self._window_counts: "OrderedDict[Tuple[int, float, float], Tuple[int, int]]" = (
+            OrderedDict()
+        )
+
+        # tag_mapping items -> (old_key, new_key) pairs for aggregate_specific_tags()
+        self._compiled_mappings: Dict[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]] = {}
+
     def aggregate_ring_data(
         self,
         db,
         ring_number: int,
         start_time: float,
         end_time: float,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        include_median: bool = False
     ) -> Dict[str, Any]:
         """
         Aggregate PLC data for a specific ring.
 
+        mean/max/min/std are computed by SQLite (GROUP BY tag_name), so only
+        one row per tag is transferred. Medians need the raw readings and
+        are fetched separately, on request, for tags with at most
+        MEDIAN_MAX_SAMPLES readings.
+
         Args:
             db: Database manager
             ring_number: Ring number
             start_time: Ring start timestamp
             end_time: Ring end timestamp
             tags: Optional list of tags to aggregate (None = all tags)
+            include_median: Also compute median_<tag>
 
         Returns:
             Dictionary with aggregated statistics per tag
         """
         try:
             with db.get_connection() as conn:
-                # Build query
-                if tags:
-                    placeholders = ','.join(['?' for _ in tags])
-                    tag_filter = f"AND tag_name IN ({placeholders})"
-                    query_params = [start_time, end_time] + tags
-                else:
-                    tag_filter = ""
-                    query_params = [start_time, end_time]
-
-                # Query PLC data for this ring
+                # Aggregate per tag in SQL (one row per tag, not per reading);
+                # rejected/missing readings are filtered out
                 cursor = conn.execute(
-                    f"""
-                    SELECT tag_name, value, data_quality_flag
-                    FROM plc_logs
-                    WHERE timestamp >= ?
-                      AND timestamp <= ?
-                      {tag_filter}
-                    ORDER BY tag_name, timestamp
-                    """,
-                    query_params
+                    _SQL_AGGREGATE_WINDOW,
+                    (start_time, end_time, json.dumps(tags) if tags else None)
                 )
 
                 rows = cursor.fetchall()
 
+                if not tags:
+                    self._remember_window_counts(
+                        (ring_number, start_time, end_time),
+                        sum(row['readings'] for row in rows),
+                        len(rows)
+                    )
+
                 if not rows:
                     logger.warning(
                         f"No PLC data found for ring {ring_number} "
@@ -84,34 +204,40 @@ class PLCAggregator:
                     )
                     return {}
 
-                # Group by tag
-                tag_data = {}
+                aggregated = {}
+                total_readings = 0
+                median_counts = {}
                 for row in rows:
                     tag_name = row['tag_name']
-                    value = row['value']
-                    quality_flag = row['data_quality_flag']
-
-                    # Filter out rejected/missing data
-                    if quality_flag in ['rejected', 'missing']:
+                    n = row['n']
+                    if not n:
+                        logger.warning(f"No valid values for tag {tag_name}")
                         continue
 
-                    if tag_name not in tag_data:
-                        tag_data[tag_name] = []
-                    tag_data[tag_name].append(value)
-
-                # Calculate statistics per tag
-                aggregated = {}
-                for tag_name, values in tag_data.items():
-                    stats = self._calculate_statistics(tag_name, values)
-                    aggregated.update(stats)
+                    # Population std from the centered sum of squares
+                    aggregated.update({
+                        f'mean_{tag_name}': float(row['mean']),
+                        f'max_{tag_name}': float(row['max']),
+                        f'min_{tag_name}': float(row['min']),
+                        f'std_{tag_name}': math.sqrt(row['m2'] / n)
+                    })
                     self.stats['tags_processed'].add(tag_name)
+                    total_readings += n
+
+                    if include_median and n <= MEDIAN_MAX_SAMPLES:
+                        median_counts[tag_name] = n
+
+                if median_counts:
+                    aggregated.update(self._query_medians(
+                        conn, start_time, end_time, median_counts
+                    ))
 
                 self.stats['rings_processed'] += 1
-                self.stats['total_readings'] += len(rows)
+                self.stats['total_readings'] += total_readings
 
                 logger.info(
                     f"Aggregated PLC data for ring {ring_number}: "
-                    f"{len(tag_data)} tags, {len(rows)} readings"
+                    f"{len(rows)} tags, {total_readings} readings"
                 )
 
                 return aggregated
@@ -120,44 +246,259 @@ class PLCAggregator:
             logger.error(f"Error aggregating PLC data for ring {ring_number}: {e}")
             raise
 
+    def aggregate_rings_batch(
+        self,
+        db,
+        ring_windows: List[Tuple[int, float, float]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Aggregate PLC data for many rings with one query per chunk.
+
+        Same mean/max/min/std features as aggregate_ring_data() (no
+        medians), for backfills. The windows are bound inline as a VALUES
+        table and joined against plc_logs on the timestamp index, grouped
+        by ring and tag, instead of one connection round trip per ring.
+
+        Args:
+            db: Database manager
+            ring_windows: (ring_number, start_time, end_time) per ring
+
+        Returns:
+            Aggregated statistics per ring number (rings without PLC data
+            map to an empty dict)
+        """
+        aggregated: Dict[int, Dict[str, Any]] = {
+            ring_number: {} for ring_number, _, _ in ring_windows
+        }
+
+        with db.get_connection() as conn:
+            for offset in range(0, len(ring_windows), BATCH_WINDOW_CHUNK):
+                chunk = ring_windows[offset:offset + BATCH_WINDOW_CHUNK]
+                params = [value for window in chunk for value in window]
+                cursor = conn.execute(_batch_aggregate_sql(len(chunk)), params)
+
+                for row in cursor.fetchall():
+                    n = row['n']
+                    if not n:
+                        continue
+                    tag_name = row['tag_name']
+                    aggregated[row['ring_number']].update({
+                        f'mean_{tag_name}': float(row['mean']),
+                        f'max_{tag_name}': float(row['max']),
+                        f'min_{tag_name}': float(row['min']),
+                        f'std_{tag_name}': math.sqrt(row['m2'] / n)
+                    })
+                    self.stats['tags_processed'].add(tag_name)
+                    self.stats['total_readings'] += n
+
+        self.stats['rings_processed'] += len(ring_windows)
+
+        logger.info(f"Aggregated PLC data for {len(ring_windows)} rings")
+
+        return aggregated
+
+    def _remember_window_counts(
+        self,
+        key: Tuple[int, float, float],
+        total: int,
+        unique_tags: int
+    ) -> None:
+        """Keep a window's reading counts for get_data_completeness()"""
+        self._window_counts[key] = (total, unique_tags)
+        self._window_counts.move_to_end(key)
+        if len(self._window_counts) > WINDOW_COUNTS_CACHE_SIZE:
+            self._window_counts.popitem(last=False)
+
+    def _query_medians(
+        self,
+        conn,
+        start_time: float,
+        end_time: float,
+        tag_counts: Dict[str, int]
+    ) -> Dict[str, float]:
+        """
+        Median per tag; the only statistic that needs the raw readings.
+
+        Each tag's readings are read with its own (tag_name, timestamp)
+        index range scan into one row of a NaN-padded (tags, max count)
+        float64 matrix preallocated from the aggregate counts, so no
+        per-reading Python floats are kept. One sort along axis 1 (NaN
+        padding sorts last) then gives every tag's median by index.
+
+        Args:
+            conn: Open database connection
+            start_time: Start timestamp
+            end_time: End timestamp
+            tag_counts: Tag -> number of valid readings in the window
+
+        Returns:
+            Dictionary with median_<tag> per tag
+        """
+        # Plain tuples, streamed from the cursor rather than fetchall()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+
+        tag_names = list(tag_counts)
+        counts = np.fromiter(tag_counts.values(), dtype=np.int64, count=len(tag_names))
+        matrix = np.full((len(tag_names), counts.max()), np.nan)
+
+        for i, tag_name in enumerate(tag_names):
+            cursor.execute(_SQL_TAG_VALUES, (tag_name, start_time, end_time))
+            try:
+                matrix[i, :counts[i]] = np.fromiter(
+                    (row[0] for row in cursor), dtype=np.float64, count=counts[i]
+                )
+            except ValueError:
+                # Window lost readings since the aggregate query
+                cursor.execute(_SQL_TAG_VALUES, (tag_name, start_time, end_time))
+                values = np.fromiter((row[0] for row in cursor), dtype=np.float64)
+                matrix[i, :len(values)] = values
+                matrix[i, len(values):] = np.nan
+                counts[i] = len(values)
+
+        # Middle element(s) of each row's valid prefix, as np.median
+        matrix.sort(axis=1)
+        rows = np.flatnonzero(counts)
+        lower = matrix[rows, (counts[rows] - 1) // 2]
+        upper = matrix[rows, counts[rows] // 2]
+        medians = (lower + upper) / 2
+
+        return {
+            f'median_{tag_names[i]}': value
+            for i, value in zip(rows.tolist(), medians.tolist())
+        }
+
+    def aggregate_ring_arrays(
+        self,
+        ring_number: int,
+        tag_names: np.ndarray,
+        values: np.ndarray,
+        include_median: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Aggregate PLC data supplied as column arrays (structure of arrays).
+
+        Same output as aggregate_ring_data(), for callers that already hold
+        the ring window as parallel arrays (e.g. batch alignment). Rows are
+        grouped by a stable sort on tag name and split at tag boundaries, so
+        each tag's samples stay a contiguous float64 slice. Input row order
+        does not matter; none of the statistics depend on it. With
+        stats_workers > 1, tags of large windows are reduced on a thread
+        pool, in parallel since the Numba kernel runs without the GIL.
+
+        Args:
+            ring_number: Ring number
+            tag_names: Tag name per reading
+            values: Reading values (float64, NaN for missing), already
+                filtered for rejected/missing quality flags
+            include_median: Also report median_<tag> (tags with at most
+                MEDIAN_MAX_SAMPLES valid readings)
+
+        Returns:
+            Dictionary with aggregated statistics per tag
+        """
+        if len(values) == 0:
+            logger.warning(f"No PLC data found for ring {ring_number}")
+            return {}
+
+        order = np.argsort(tag_names, kind='stable')
+        sorted_tags = tag_names[order]
+        boundaries = np.flatnonzero(sorted_tags[1:] != sorted_tags[:-1]) + 1
+
+        starts = np.concatenate(([0], boundaries))
+        groups = [
+            (str(sorted_tags[start]), tag_values)
+            for start, tag_values in zip(starts, np.split(values[order], boundaries))
+        ]
+
+        if (self.stats_workers > 1 and NUMBA_AVAILABLE and len(groups) > 1
+                and len(values) >= STATS_PARALLEL_MIN_READINGS):
+            tag_stats = self._get_stats_executor().map(
+                lambda group: self._calculate_statistics(*group, include_median),
+                groups
+            )
+        else:
+            tag_stats = (
+                self._calculate_statistics(*group, include_median) for group in groups
+            )
+
+        aggregated = {}
+        for (tag_name, _), stats in zip(groups, tag_stats):
+            aggregated.update(stats)
+            self.stats['tags_processed'].add(tag_name)
+
+        self.stats['rings_processed'] += 1
+        self.stats['total_readings'] += len(values)
+
+        logger.debug(
+            f"Aggregated PLC data for ring {ring_number}: "
+            f"{len(starts)} tags, {len(values)} readings"
+        )
+
+        return aggregated
+
+    def _get_stats_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for per-tag statistics, created on first use"""
+        if self._stats_executor is None:
+            self._stats_executor = ThreadPoolExecutor(
+                max_workers=self.stats_workers, thread_name_prefix="plc-stats"
+            )
+        return self._stats_executor
+
+    def close(self) -> None:
+        """Shut down the per-tag statistics thread pool, if started"""
+        if self._stats_executor is not None:
+            self._stats_executor.shutdown(wait=True)
+            self._stats_executor = None
+
     def _calculate_statistics(
         self,
         tag_name: str,
-        values: List[float]
+        values: Sequence[float],
+        include_median: bool = False
     ) -> Dict[str, float]:
         """
         Calculate statistics for a tag.
 
+        The median is opt-in: it costs a second pass over the readings and
+        nothing downstream of ring alignment reads it.
+
         Args:
             tag_name: PLC tag name
-            values: List of readings
+            values: List or array of readings
+            include_median: Also compute the median (at most
+                MEDIAN_MAX_SAMPLES valid readings)
 
         Returns:
-            Dictionary with mean, max, min, std for this tag
+            Dictionary with mean, max, min, std (and median) for this tag
         """
-        if not values:
+        if len(values) == 0:
             return {}
 
         try:
-            values_array = np.array(values)
+            values_array = np.asarray(values, dtype=np.float64)
 
-            # Remove NaN/inf values
-            values_array = values_array[np.isfinite(values_array)]
+            # Calculate statistics over finite values (NaN/inf skipped in the
+            # same pass as mean/max/min/std)
+            n_valid, mean_value, max_value, min_value, std_value = finite_summary_stats(
+                values_array
+            )
 
-            if len(values_array) == 0:
+            if n_valid == 0:
                 logger.warning(f"No valid values for tag {tag_name}")
                 return {}
 
-            # Calculate statistics
             stats = {
-                f'mean_{tag_name}': float(np.mean(values_array)),
-                f'max_{tag_name}': float(np.max(values_array)),
-                f'min_{tag_name}': float(np.min(values_array)),
-                f'std_{tag_name}': float(np.std(values_array))
+                f'mean_{tag_name}': mean_value,
+                f'max_{tag_name}': max_value,
+                f'min_{tag_name}': min_value,
+                f'std_{tag_name}': std_value
             }
 
             # Optional: median (can be expensive for large datasets)
-            if len(values_array) <= 10000:  # Only for reasonable sizes
+            if include_median and n_valid <= MEDIAN_MAX_SAMPLES:
+                if n_valid < len(values_array):
+                    values_array = values_array[np.isfinite(values_array)]
                 stats[f'median_{tag_name}'] = float(np.median(values_array))
 
             return stats
@@ -196,15 +537,24 @@ class PLCAggregator:
         )
 
         # Rename according to mapping
-        renamed = {}
-        for tag_name, output_prefix in tag_mapping.items():
-            for stat_type in ['mean', 'max', 'min', 'std', 'median']:
-                old_key = f'{stat_type}_{tag_name}'
-                if old_key in raw_aggregated:
-                    new_key = f'{stat_type}_{output_prefix}'
-                    renamed[new_key] = raw_aggregated[old_key]
+        return {
+            new_key: raw_aggregated[old_key]
+            for old_key, new_key in self._rename_pairs(tag_mapping)
+            if old_key in raw_aggregated
+        }
 
-        return renamed
+    def _rename_pairs(self, tag_mapping: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        """(old_key, new_key) feature names for a tag mapping, built once per mapping"""
+        key = tuple(tag_mapping.items())
+        pairs = self._compiled_mappings.get(key)
+        if pairs is None:
+            pairs = tuple(
+                (f'{stat_type}_{tag_name}', f'{stat_type}_{output_prefix}')
+                for tag_name, output_prefix in tag_mapping.items()
+                for stat_type in STAT_TYPES
+            )
+            self._compiled_mappings[key] = pairs
+        return pairs
 
     def get_data_completeness(
         self,
@@ -217,6 +567,10 @@ class PLCAggregator:
         """
         Assess data completeness for the ring.
 
+        Reuses the counts from the preceding all-tag aggregate_ring_data()
+        call for the same ring window, so the window is scanned once. The
+        counts are used once; later calls count again and see late data.
+
         Args:
             db: Database manager
             ring_number: Ring number
@@ -231,38 +585,41 @@ class PLCAggregator:
         expected_samples = duration_seconds * expected_frequency
 
         try:
-            with db.get_connection() as conn:
-                # Count actual samples
-                cursor = conn.execute(
-                    """
-                    SELECT COUNT(*) as total,
-                           COUNT(DISTINCT tag_name) as unique_tags
-                    FROM plc_logs
-                    WHERE timestamp >= ?
-                      AND timestamp <= ?
-                      AND data_quality_flag NOT IN ('rejected', 'missing')
-                    """,
-                    (start_time, end_time)
-                )
+            counts = self._window_counts.pop((ring_number, start_time, end_time), None)
+            if counts is None:
+                with db.get_connection() as conn:
+                    # Count actual samples
+                    cursor = conn.execute(
+                        """
+                        SELECT COUNT(*) as total,
+                               COUNT(DISTINCT tag_name) as unique_tags
+                        FROM plc_logs
+                        WHERE timestamp >= ?
+                          AND timestamp <= ?
+                          AND data_quality_code < 2  -- not rejected/missing
+                        """,
+                        (start_time, end_time)
+                    )
 
-                result = cursor.fetchone()
-                actual_samples = result['total']
-                unique_tags = result['unique_tags']
-
-                # Calculate completeness percentage
-                if unique_tags > 0:
-                    samples_per_tag = actual_samples / unique_tags
-                    completeness_pct = (samples_per_tag / expected_samples) * 100
-                else:
-                    completeness_pct = 0.0
-
-                return {
-                    'expected_samples_per_tag': expected_samples,
-                    'actual_samples_total': actual_samples,
-                    'unique_tags': unique_tags,
-                    'completeness_percent': min(completeness_pct, 100.0),
-                    'data_quality': self._assess_quality(completeness_pct)
-                }
+                    result = cursor.fetchone()
+                    counts = (result['total'], result['unique_tags'])
+
+            actual_samples, unique_tags = counts
+
+            # Calculate completeness percentage
+            if unique_tags > 0:
+                samples_per_tag = actual_samples / unique_tags
+                completeness_pct = (samples_per_tag / expected_samples) * 100
+            else:
+                completeness_pct = 0.0
+
+            return {
+                'expected_samples_per_tag': expected_samples,
+                'actual_samples_total': actual_samples,
+                'unique_tags': unique_tags,
+                'completeness_percent': min(completeness_pct, 100.0),
+                'data_quality': self._assess_quality(completeness_pct)
+            }
 
         except Exception as e:
             logger.error(f"Error assessing data completeness: {e}")
@@ -4,12 +4,43 @@ Detects ring construction start/end times from sensor signals
 Uses advance sensor signals with time-based fallback
 """
 import logging
-from typing import Optional, Tuple, Dict, Any
+import time
+from typing import Optional, Sequence, Tuple, Dict, Any
 from datetime import datetime, timedelta
-import yaml
+import numpy as np
+
+from edge.services.aligner.aggregator import load_config
 
 logger = logging.getLogger(__name__)
 
+# First readings of an advance search window (start anchor, plus one to
+# check there is data to compare it with)
+_SQL_ADVANCE_FIRST = """
+    SELECT timestamp, value, rowid
+    FROM plc_logs
+    WHERE tag_name = 'advance_distance'
+      AND timestamp >= ?
+      AND timestamp <= ?
+    ORDER BY timestamp, rowid
+    LIMIT 2
+"""
+
+# First advance reading after the anchor reading (?1 timestamp, ?2 rowid)
+# whose advance from the anchor value ?4 matches or overshoots the ring
+# width: above ?5 (width - tolerance) and not exactly ?6 (width + tolerance)
+_SQL_ADVANCE_CROSSING = """
+    SELECT timestamp, value, rowid
+    FROM plc_logs
+    WHERE tag_name = 'advance_distance'
+      AND timestamp >= ?1
+      AND timestamp <= ?3
+      AND (timestamp, rowid) > (?1, ?2)
+      AND value - ?4 > ?5
+      AND value - ?4 != ?6
+    ORDER BY timestamp, rowid
+    LIMIT 1
+"""
+
 
 class RingBoundaryDetector:
     """
@@ -35,8 +66,8 @@ class RingBoundaryDetector:
         Args:
             config_path: Path to alignment configuration
         """
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        # Parsed once per file version and shared with align_data()
+        config = load_config(config_path)
 
         self.ring_config = config.get('ring_boundary_detection', {})
         self.geometry = config.get('ring_geometry', {})
@@ -79,66 +110,65 @@ class RingBoundaryDetector:
         """
         try:
             with db.get_connection() as conn:
-                # Query advance sensor data
-                cursor = conn.execute(
-                    """
-                    SELECT timestamp, value
-                    FROM plc_logs
-                    WHERE tag_name = 'advance_distance'
-                      AND timestamp >= ?
-                      AND timestamp <= ?
-                    ORDER BY timestamp
-                    """,
-                    (start_search_time, end_search_time)
+                return self._detect_from_advance_sensor(
+                    conn, start_search_time, end_search_time, ring_number
                 )
+        except Exception as e:
+            logger.error(f"Error detecting from advance sensor: {e}")
+            return None
 
-                readings = cursor.fetchall()
-
-                if len(readings) < 2:
-                    logger.warning("Insufficient advance sensor data for ring detection")
-                    return None
-
-                # Find advance increments matching ring width
-                ring_width_mm = self.ring_width * 1000  # Convert to mm
-                tolerance = 200  # mm tolerance
-
-                start_time = None
-                start_value = None
-
-                for i, (timestamp, value) in enumerate(readings):
-                    if start_time is None:
-                        # Potential ring start
-                        start_time = timestamp
-                        start_value = value
-                        continue
+    def _detect_from_advance_sensor(
+        self,
+        conn,
+        start_search_time: float,
+        end_search_time: float,
+        ring_number: int
+    ) -> Optional[Tuple[float, float]]:
+        """detect_from_advance_sensor() on an open connection (errors propagate)"""
+        readings = conn.execute(
+            _SQL_ADVANCE_FIRST, (start_search_time, end_search_time)
+        ).fetchall()
 
-                    # Check if advance matches ring width
-                    advance_delta = value - start_value
+        if len(readings) < 2:
+            logger.warning("Insufficient advance sensor data for ring detection")
+            return None
 
-                    if abs(advance_delta - ring_width_mm) < tolerance:
-                        # Ring boundary detected
-                        end_time = timestamp
+        # Find advance increments matching ring width
+        ring_width_mm = self.ring_width * 1000  # Convert to mm
+        tolerance = 200  # mm tolerance
+
+        # SQLite seeks the next matching or overshooting reading on
+        # idx_plc_tag_timestamp; only those rows are fetched
+        start_time, start_value, start_rowid = readings[0]
+        while True:
+            crossing = conn.execute(
+                _SQL_ADVANCE_CROSSING,
+                (start_time, start_rowid, end_search_time, start_value,
+                 ring_width_mm - tolerance, ring_width_mm + tolerance)
+            ).fetchone()
+
+            if crossing is None:
+                logger.warning(f"No ring boundary found in advance sensor data")
+                return None
 
-                        logger.info(
-                            f"Ring {ring_number} detected via advance sensor: "
-                            f"advance={advance_delta:.1f}mm, "
-                            f"duration={(end_time - start_time)/60:.1f}min"
-                        )
+            timestamp, value, rowid = crossing
+            advance_delta = value - start_value
 
-                        self._record_detection('advance_sensor')
-                        return (start_time, end_time)
+            if advance_delta < ring_width_mm + tolerance:
+                # Ring boundary detected
+                end_time = timestamp
 
-                    # If advance exceeds expected, reset search
-                    if advance_delta > ring_width_mm + tolerance:
-                        start_time = timestamp
-                        start_value = value
+                logger.info(
+                    f"Ring {ring_number} detected via advance sensor: "
+                    f"advance={advance_delta:.1f}mm, "
+                    f"duration={(end_time - start_time)/60:.1f}min"
+                )
 
-                logger.warning(f"No ring boundary found in advance sensor data")
-                return None
+                self._record_detection('advance_sensor')
+                return (start_time, end_time)
 
-        except Exception as e:
-            logger.error(f"Error detecting from advance sensor: {e}")
-            return None
+            # Advance exceeds expected, restart search from here
+            start_time, start_value, start_rowid = timestamp, value, rowid
 
     def detect_from_ring_assembly_signal(
         self,
@@ -163,49 +193,68 @@ class RingBoundaryDetector:
         """
         try:
             with db.get_connection() as conn:
-                # Look for ring assembly start signal
-                cursor = conn.execute(
-                    """
-                    SELECT timestamp, value
-                    FROM plc_logs
-                    WHERE tag_name = 'ring_assembly_active'
-                      AND timestamp >= ?
-                      AND timestamp <= ?
-                    ORDER BY timestamp
-                    """,
-                    (start_search_time, end_search_time)
+                return self._detect_from_ring_assembly_signal(
+                    conn, start_search_time, end_search_time, ring_number
                 )
+        except Exception as e:
+            logger.error(f"Error detecting from assembly signal: {e}")
+            return None
 
-                readings = cursor.fetchall()
+    def _detect_from_ring_assembly_signal(
+        self,
+        conn,
+        start_search_time: float,
+        end_search_time: float,
+        ring_number: int
+    ) -> Optional[Tuple[float, float]]:
+        """detect_from_ring_assembly_signal() on an open connection (errors propagate)"""
+        # Look for ring assembly start signal
+        cursor = conn.execute(
+            """
+            SELECT timestamp, value
+            FROM plc_logs
+            WHERE tag_name = 'ring_assembly_active'
+              AND timestamp >= ?
+              AND timestamp <= ?
+            ORDER BY timestamp
+            """,
+            (start_search_time, end_search_time)
+        )
 
-                # Find rising edge (0 -> 1) and falling edge (1 -> 0)
-                start_time = None
-                for i in range(len(readings) - 1):
-                    curr_timestamp, curr_value = readings[i]
-                    next_timestamp, next_value = readings[i + 1]
+        readings = cursor.fetchall()
 
-                    # Rising edge: ring assembly started
-                    if curr_value == 0 and next_value == 1:
-                        start_time = next_timestamp
+        # Signal as float64 (NULL -> NaN, never an edge)
+        values = np.array([row[1] for row in readings], dtype=np.float64)
+        prev_values, next_values = values[:-1], values[1:]
 
-                    # Falling edge: ring assembly completed
-                    if curr_value == 1 and next_value == 0 and start_time:
-                        end_time = next_timestamp
+        # Rising edge (0 -> 1): ring assembly started;
+        # falling edge (1 -> 0): ring assembly completed.
+        # Indices are of the reading after the transition.
+        rising = np.flatnonzero((prev_values == 0) & (next_values == 1)) + 1
+        falling = np.flatnonzero((prev_values == 1) & (next_values == 0)) + 1
 
-                        logger.info(
-                            f"Ring {ring_number} detected via assembly signal: "
-                            f"duration={(end_time - start_time)/60:.1f}min"
-                        )
+        # First completion after an assembly start, paired with the
+        # latest start before it
+        if len(rising) == 0:
+            logger.debug("No ring assembly signal found")
+            return None
+        falling = falling[falling > rising[0]]
+        if len(falling) == 0:
+            logger.debug("No ring assembly signal found")
+            return None
 
-                        self._record_detection('assembly_signal')
-                        return (start_time, end_time)
+        end_index = int(falling[0])
+        start_index = int(rising[np.searchsorted(rising, end_index) - 1])
+        start_time = readings[start_index][0]
+        end_time = readings[end_index][0]
 
-                logger.debug("No ring assembly signal found")
-                return None
+        logger.info(
+            f"Ring {ring_number} detected via assembly signal: "
+            f"duration={(end_time - start_time)/60:.1f}min"
+        )
 
-        except Exception as e:
-            logger.error(f"Error detecting from assembly signal: {e}")
-            return None
+        self._record_detection('assembly_signal')
+        return (start_time, end_time)
 
     def detect_with_time_fallback(
         self,
@@ -307,6 +356,61 @@ class RingBoundaryDetector:
 
         return result
 
+    def detect_ring_boundaries_batch(
+        self,
+        db,
+        ring_windows: Sequence[Tuple[int, float, float]]
+    ) -> Dict[int, Optional[Tuple[float, float]]]:
+        """
+        Detect boundaries for several rings over one connection.
+
+        Runs the sensor methods of detect_ring_boundary() (advance sensor,
+        then assembly signal, per the configured method) for each search
+        window, reusing one connection and its cached prepared statements.
+        Detected boundaries are validated as in detect_ring_boundary().
+
+        The time-based fallback needs the previous ring's end time, so it
+        is left to the caller.
+
+        Args:
+            db: Database manager
+            ring_windows: (ring_number, start_search_time, end_search_time)
+                per ring
+
+        Returns:
+            Dictionary of ring_number -> (start_time, end_time), or None if
+            no sensor detected the ring
+        """
+        results = {}
+
+        with db.get_connection() as conn:
+            for ring_number, start_search_time, end_search_time in ring_windows:
+                result = None
+
+                if self.detection_method in ['auto', 'advance']:
+                    try:
+                        result = self._detect_from_advance_sensor(
+                            conn, start_search_time, end_search_time, ring_number
+                        )
+                    except Exception as e:
+                        logger.error(f"Error detecting from advance sensor: {e}")
+
+                if not result and self.detection_method in ['auto', 'assembly']:
+                    try:
+                        result = self._detect_from_ring_assembly_signal(
+                            conn, start_search_time, end_search_time, ring_number
+                        )
+                    except Exception as e:
+                        logger.error(f"Error detecting from assembly signal: {e}")
+
+                if result and not self._validate_boundary(result[0], result[1], ring_number):
+                    logger.warning(f"Ring {ring_number} boundary validation failed")
+                    self.stats['validation_failures'] += 1
+
+                results[ring_number] = result
+
+        return results
+
     def _validate_boundary(
         self,
         start_time: float,
@@ -335,7 +439,7 @@ class RingBoundaryDetector:
             return False
 
         # Check not in future
-        now = datetime.utcnow().timestamp()
+        now = time.time()
         if start_time > now or end_time > now:
             logger.error(f"Ring {ring_number}: boundary in the future")
             return False
@@ -3,12 +3,107 @@ T049: Ring Summary Persister
 Writes aggregated ring features to ring_summary table
 Handles upserts, data completeness flagging, and validation
 """
+import json
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+from typing import Dict, Any, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# ring_summary feature columns, in the order of the statements below
+_FEATURE_COLUMNS = (
+    'mean_thrust', 'max_thrust', 'min_thrust', 'std_thrust',
+    'mean_torque', 'max_torque',
+    'mean_penetration_rate', 'max_penetration_rate',
+    'mean_chamber_pressure', 'max_chamber_pressure',
+    'mean_pitch', 'mean_roll', 'mean_yaw',
+    'horizontal_deviation', 'vertical_deviation',
+    'specific_energy', 'ground_loss_rate', 'volume_loss_ratio',
+    'settlement_value'
+)
+
+# Features whose presence decides data_completeness_flag
+_CRITICAL_FEATURES = (
+    'mean_thrust',
+    'mean_torque',
+    'mean_penetration_rate',
+    'mean_chamber_pressure',
+    'mean_pitch',
+    'mean_roll',
+    'settlement_value',
+    'specific_energy'
+)
+
+# One ring_summary row (parameters from RingSummaryWriter._upsert_params())
+_SQL_INSERT_RING = """
+    INSERT INTO ring_summary (
+        ring_number, start_time, end_time,
+        mean_thrust, max_thrust, min_thrust, std_thrust,
+        mean_torque, max_torque,
+        mean_penetration_rate, max_penetration_rate,
+        mean_chamber_pressure, max_chamber_pressure,
+        mean_pitch, mean_roll, mean_yaw,
+        horizontal_deviation, vertical_deviation,
+        specific_energy, ground_loss_rate, volume_loss_ratio,
+        settlement_value,
+        data_completeness_flag, geological_zone,
+        synced_to_cloud, created_at, updated_at
+    ) VALUES (
+        ?, ?, ?,
+        ?, ?, ?, ?,
+        ?, ?,
+        ?, ?,
+        ?, ?,
+        ?, ?, ?,
+        ?, ?,
+        ?, ?, ?,
+        ?,
+        ?, ?,
+        ?, ?, ?
+    )
+"""
+
+# Insert a ring unless its ring_number exists (rowcount 0 on conflict)
+_SQL_INSERT_NEW_RING = _SQL_INSERT_RING + """    ON CONFLICT(ring_number) DO NOTHING
+"""
+
+# Insert a ring, or update the existing row for its ring_number (keeping
+# created_at and synced_to_cloud). No RETURNING clause: sqlite3 rejects
+# RETURNING statements in executemany() outside CPython 3.11.
+_SQL_UPSERT_RING = _SQL_INSERT_RING + """    ON CONFLICT(ring_number) DO UPDATE SET
+        start_time = excluded.start_time,
+        end_time = excluded.end_time,
+        mean_thrust = excluded.mean_thrust,
+        max_thrust = excluded.max_thrust,
+        min_thrust = excluded.min_thrust,
+        std_thrust = excluded.std_thrust,
+        mean_torque = excluded.mean_torque,
+        max_torque = excluded.max_torque,
+        mean_penetration_rate = excluded.mean_penetration_rate,
+        max_penetration_rate = excluded.max_penetration_rate,
+        mean_chamber_pressure = excluded.mean_chamber_pressure,
+        max_chamber_pressure = excluded.max_chamber_pressure,
+        mean_pitch = excluded.mean_pitch,
+        mean_roll = excluded.mean_roll,
+        mean_yaw = excluded.mean_yaw,
+        horizontal_deviation = excluded.horizontal_deviation,
+        vertical_deviation = excluded.vertical_deviation,
+        specific_energy = excluded.specific_energy,
+        ground_loss_rate = excluded.ground_loss_rate,
+        volume_loss_ratio = excluded.volume_loss_ratio,
+        settlement_value = excluded.settlement_value,
+        data_completeness_flag = excluded.data_completeness_flag,
+        geological_zone = excluded.geological_zone,
+        updated_at = excluded.updated_at
+"""
+
+# Ring numbers (JSON array) already in ring_summary
+_SQL_EXISTING_RINGS = """
+    SELECT ring_number
+    FROM ring_summary
+    WHERE ring_number IN (SELECT value FROM json_each(?))
+"""
+
 
 class RingSummaryWriter:
     """
@@ -62,40 +157,23 @@ class RingSummaryWriter:
         """
         try:
             # Merge all features
-            all_features = {
-                **plc_features,
-                **attitude_features,
-                **derived_indicators,
-                **settlement_features
-            }
+            all_features = self._merge_features(
+                plc_features, attitude_features, derived_indicators, settlement_features
+            )
 
             # Assess data completeness
             completeness_flag = self._assess_completeness(all_features)
 
-            # Check if ring already exists
-            with db.get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT id FROM ring_summary WHERE ring_number = ?",
-                    (ring_number,)
-                )
-                existing = cursor.fetchone()
-
-            if existing:
-                # Update existing record
-                success = self._update_ring(
-                    db, ring_number, start_time, end_time,
-                    all_features, completeness_flag, geological_zone
-                )
-                if success:
-                    self.stats['rings_updated'] += 1
-            else:
-                # Insert new record
-                success = self._insert_ring(
-                    db, ring_number, start_time, end_time,
-                    all_features, completeness_flag, geological_zone
-                )
-                if success:
-                    self.stats['rings_inserted'] += 1
+            # Insert, or update the existing record, in one statement
+            inserted = self._upsert_ring(
+                db, ring_number, start_time, end_time,
+                all_features, completeness_flag, geological_zone
+            )
+            success = inserted is not None
+            if inserted:
+                self.stats['rings_inserted'] += 1
+            elif success:
+                self.stats['rings_updated'] += 1
 
             if success:
                 self.stats['rings_written'] += 1
@@ -114,86 +192,101 @@ class RingSummaryWriter:
             self.stats['write_errors'] += 1
             return False
 
-    def _insert_ring(
+    def write_ring_summaries_bulk(
         self,
         db,
-        ring_number: int,
-        start_time: float,
-        end_time: float,
-        features: Dict[str, float],
-        completeness_flag: str,
-        geological_zone: Optional[str]
-    ) -> bool:
-        """Insert new ring summary"""
+        rings: Sequence[Tuple[Any, ...]]
+    ) -> int:
+        """
+        Write many ring summaries in one transaction.
+
+        Each entry holds write_ring_summary()'s arguments in order:
+        (ring_number, start_time, end_time, plc_features, attitude_features,
+        derived_indicators, settlement_features, geological_zone). Existing
+        rings are counted with one query (for the inserted/updated stats),
+        then all rings are upserted with one executemany, so N rings cost one
+        commit rather than N. A ring listed more than once is written from
+        its last entry.
+
+        Args:
+            db: Database manager
+            rings: Ring summary tuples as above
+
+        Returns:
+            Number of rings written (0 if the transaction failed)
+        """
+        # Last entry per ring wins, as with successive write_ring_summary() calls
+        latest = {entry[0]: entry for entry in rings}
+        if not latest:
+            return 0
+
+        rows = []
         try:
             with db.transaction() as conn:
-                now = datetime.utcnow().timestamp()
-
-                conn.execute(
-                    """
-                    INSERT INTO ring_summary (
-                        ring_number, start_time, end_time,
-                        mean_thrust, max_thrust, min_thrust, std_thrust,
-                        mean_torque, max_torque,
-                        mean_penetration_rate, max_penetration_rate,
-                        mean_chamber_pressure, max_chamber_pressure,
-                        mean_pitch, mean_roll, mean_yaw,
-                        horizontal_deviation, vertical_deviation,
-                        specific_energy, ground_loss_rate, volume_loss_ratio,
-                        settlement_value,
-                        data_completeness_flag, geological_zone,
-                        synced_to_cloud, created_at, updated_at
-                    ) VALUES (
-                        ?, ?, ?,
-                        ?, ?, ?, ?,
-                        ?, ?,
-                        ?, ?,
-                        ?, ?,
-                        ?, ?, ?,
-                        ?, ?,
-                        ?, ?, ?,
-                        ?,
-                        ?, ?,
-                        ?, ?, ?
+                existing = {
+                    row[0] for row in conn.execute(
+                        _SQL_EXISTING_RINGS, (json.dumps(list(latest)),)
                     )
-                    """,
-                    (
-                        ring_number, start_time, end_time,
-                        features.get('mean_thrust'),
-                        features.get('max_thrust'),
-                        features.get('min_thrust'),
-                        features.get('std_thrust'),
-                        features.get('mean_torque'),
-                        features.get('max_torque'),
-                        features.get('mean_penetration_rate'),
-                        features.get('max_penetration_rate'),
-                        features.get('mean_chamber_pressure'),
-                        features.get('max_chamber_pressure'),
-                        features.get('mean_pitch'),
-                        features.get('mean_roll'),
-                        features.get('mean_yaw'),
-                        features.get('horizontal_deviation'),
-                        features.get('vertical_deviation'),
-                        features.get('specific_energy'),
-                        features.get('ground_loss_rate'),
-                        features.get('volume_loss_ratio'),
-                        features.get('settlement_value'),
-                        completeness_flag,
-                        geological_zone,
-                        0,  # synced_to_cloud
-                        now,  # created_at
-                        now   # updated_at
+                }
+
+                now = time.time()
+                for (ring_number, start_time, end_time, plc_features, attitude_features,
+                     derived_indicators, settlement_features, geological_zone) in latest.values():
+                    features = self._merge_features(
+                        plc_features, attitude_features, derived_indicators, settlement_features
                     )
-                )
+                    rows.append(self._upsert_params(
+                        ring_number, start_time, end_time, features,
+                        self._assess_completeness(features), geological_zone, now
+                    ))
 
-            logger.debug(f"Inserted ring {ring_number} summary")
-            return True
+                conn.executemany(_SQL_UPSERT_RING, rows)
 
         except Exception as e:
-            logger.error(f"Error inserting ring {ring_number}: {e}")
-            return False
+            logger.error(f"Error writing {len(latest)} ring summaries: {e}")
+            self.stats['write_errors'] += len(latest)
+            return 0
+
+        self.stats['rings_inserted'] += len(latest) - len(existing)
+        self.stats['rings_updated'] += len(existing)
+        self.stats['rings_written'] += len(latest)
+        logger.info(
+            f"{len(latest)} ring summaries persisted: "
+            f"{len(latest) - len(existing)} inserted, {len(existing)} updated"
+        )
+
+        return len(latest)
+
+    @staticmethod
+    def _merge_features(*feature_groups: Dict[str, float]) -> Dict[str, float]:
+        """Merge feature dictionaries (later groups win on shared keys)"""
+        merged = {}
+        for features in feature_groups:
+            merged.update(features)
+        return merged
 
-    def _update_ring(
+    @staticmethod
+    def _upsert_params(
+        ring_number: int,
+        start_time: float,
+        end_time: float,
+        features: Dict[str, float],
+        completeness_flag: str,
+        geological_zone: Optional[str],
+        now: float
+    ) -> Tuple[Any, ...]:
+        """_SQL_INSERT_RING parameters for one ring"""
+        return (
+            ring_number, start_time, end_time,
+            *map(features.get, _FEATURE_COLUMNS),
+            completeness_flag,
+            geological_zone,
+            0,  # synced_to_cloud
+            now,  # created_at
+            now   # updated_at
+        )
+
+    def _upsert_ring(
         self,
         db,
         ring_number: int,
@@ -202,75 +295,35 @@ class RingSummaryWriter:
         features: Dict[str, float],
         completeness_flag: str,
         geological_zone: Optional[str]
-    ) -> bool:
-        """Update existing ring summary"""
+    ) -> Optional[bool]:
+        """
+        Insert or update a ring summary.
+
+        The insert skips an existing ring_number, so its row count says
+        which case applies; only an existing ring takes the second,
+        updating statement. Both run in one transaction.
+
+        Returns:
+            True if inserted, False if updated, None on error
+        """
         try:
+            params = self._upsert_params(
+                ring_number, start_time, end_time, features,
+                completeness_flag, geological_zone, time.time()
+            )
             with db.transaction() as conn:
-                now = datetime.utcnow().timestamp()
-
-                conn.execute(
-                    """
-                    UPDATE ring_summary SET
-                        start_time = ?,
-                        end_time = ?,
-                        mean_thrust = ?,
-                        max_thrust = ?,
-                        min_thrust = ?,
-                        std_thrust = ?,
-                        mean_torque = ?,
-                        max_torque = ?,
-                        mean_penetration_rate = ?,
-                        max_penetration_rate = ?,
-                        mean_chamber_pressure = ?,
-                        max_chamber_pressure = ?,
-                        mean_pitch = ?,
-                        mean_roll = ?,
-                        mean_yaw = ?,
-                        horizontal_deviation = ?,
-                        vertical_deviation = ?,
-                        specific_energy = ?,
-                        ground_loss_rate = ?,
-                        volume_loss_ratio = ?,
-                        settlement_value = ?,
-                        data_completeness_flag = ?,
-                        geological_zone = ?,
-                        updated_at = ?
-                    WHERE ring_number = ?
-                    """,
-                    (
-                        start_time, end_time,
-                        features.get('mean_thrust'),
-                        features.get('max_thrust'),
-                        features.get('min_thrust'),
-                        features.get('std_thrust'),
-                        features.get('mean_torque'),
-                        features.get('max_torque'),
-                        features.get('mean_penetration_rate'),
-                        features.get('max_penetration_rate'),
-                        features.get('mean_chamber_pressure'),
-                        features.get('max_chamber_pressure'),
-                        features.get('mean_pitch'),
-                        features.get('mean_roll'),
-                        features.get('mean_yaw'),
-                        features.get('horizontal_deviation'),
-                        features.get('vertical_deviation'),
-                        features.get('specific_energy'),
-                        features.get('ground_loss_rate'),
-                        features.get('volume_loss_ratio'),
-                        features.get('settlement_value'),
-                        completeness_flag,
-                        geological_zone,
-                        now,  # updated_at
-                        ring_number
-                    )
-                )
+                inserted = conn.execute(_SQL_INSERT_NEW_RING, params).rowcount == 1
+                if not inserted:
+                    conn.execute(_SQL_UPSERT_RING, params)
 
-            logger.debug(f"Updated ring {ring_number} summary")
-            return True
+            logger.debug(
+                f"{'Inserted' if inserted else 'Updated'} ring {ring_number} summary"
+            )
+            return inserted
 
         except Exception as e:
-            logger.error(f"Error updating ring {ring_number}: {e}")
-            return False
+            logger.error(f"Error upserting ring {ring_number}: {e}")
+            return None
 
     def _assess_completeness(self, features: Dict[str, Any]) -> str:
         """
@@ -282,26 +335,13 @@ class RingSummaryWriter:
         Returns:
             Completeness flag: 'complete', 'partial', or 'incomplete'
         """
-        # Define critical features
-        critical_features = [
-            'mean_thrust',
-            'mean_torque',
-            'mean_penetration_rate',
-            'mean_chamber_pressure',
-            'mean_pitch',
-            'mean_roll',
-            'settlement_value',
-            'specific_energy'
-        ]
-
         # Count available critical features
         available = sum(
-            1 for feat in critical_features
+            1 for feat in _CRITICAL_FEATURES
             if features.get(feat) is not None
         )
 
-        total = len(critical_features)
-        completeness_ratio = available / total
+        completeness_ratio = available / len(_CRITICAL_FEATURES)
 
         if completeness_ratio >= 0.9:
             return 'complete'
@@ -334,7 +374,7 @@ class RingSummaryWriter:
                         updated_at = ?
                     WHERE ring_number = ?
                     """,
-                    (datetime.utcnow().timestamp(), ring_number)
+                    (time.time(), ring_number)
                 )
 
             logger.info(f"Ring {ring_number} marked as synced to cloud")
@@ -4,7 +4,7 @@ Associates settlement monitoring data with rings using time lag
 Accounts for 6-8 hour delay between excavation and settlement
 """
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -109,10 +109,11 @@ class SettlementAssociator:
                     self.stats['associations_not_found'] += 1
                     return {}
 
-                # Extract settlement values
-                values = [row['value'] for row in rows if row['value'] is not None]
+                # Extract settlement values (NULL -> NaN, masked in one pass)
+                values = np.array([row['value'] for row in rows], dtype=np.float64)
+                values = values[~np.isnan(values)]
 
-                if not values:
+                if len(values) == 0:
                     self.stats['associations_not_found'] += 1
                     return {}
 
@@ -140,21 +141,21 @@ class SettlementAssociator:
             logger.error(f"Error associating settlement for ring {ring_number}: {e}")
             raise
 
-    def _aggregate_settlement(self, values: List[float]) -> Dict[str, float]:
+    def _aggregate_settlement(self, values: Sequence[float]) -> Dict[str, float]:
         """
         Aggregate settlement values.
 
         Args:
-            values: List of settlement readings (mm, negative = settlement)
+            values: Settlement readings (mm, negative = settlement)
 
         Returns:
             Dictionary with aggregated settlement features
         """
-        if not values:
+        if len(values) == 0:
             return {}
 
         try:
-            values_array = np.array(values)
+            values_array = np.asarray(values, dtype=np.float64)
 
             # Remove NaN/inf
             values_array = values_array[np.isfinite(values_array)]
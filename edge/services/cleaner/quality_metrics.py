@@ -4,6 +4,7 @@ Aggregates quality metrics from all cleaning stages
 Provides comprehensive data quality assessment
 """
 import logging
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from collections import defaultdict
@@ -28,7 +29,7 @@ class QualityMetricsTracker:
     def __init__(self):
         """Initialize quality metrics tracker"""
         self.metrics = {
-            'session_start': datetime.utcnow().timestamp(),
+            'session_start': time.time(),
             'total_records_processed': 0,
             'validation': {
                 'total_validated': 0,
@@ -238,7 +239,7 @@ class QualityMetricsTracker:
 
         return {
             'session_duration_hours': (
-                datetime.utcnow().timestamp() - self.metrics['session_start']
+                time.time() - self.metrics['session_start']
             ) / 3600,
             'total_records_processed': total_records,
 
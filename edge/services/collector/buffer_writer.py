@@ -5,11 +5,13 @@ Supports configurable flush strategies and overflow handling
 """
 import asyncio
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from collections import deque
-from datetime import datetime
 import threading
 
+from edge.database.manager import AsyncDatabaseManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +40,7 @@ class BufferWriter:
         Initialize buffer writer.
 
         Args:
-            db_manager: DatabaseManager instance
+            db_manager: DatabaseManager or AsyncDatabaseManager instance
             max_size: Maximum buffer size
             flush_interval: Auto-flush interval (seconds)
             flush_threshold: Flush when buffer reaches this size
@@ -118,7 +120,7 @@ class BufferWriter:
             'source_id': source_id,
             'ring_number': ring_number,
             'data_quality_flag': data_quality_flag,
-            'created_at': datetime.utcnow().timestamp()
+            'created_at': time.time()
         }
 
         return self._add_to_buffer(entry)
@@ -159,7 +161,7 @@ class BufferWriter:
             'axis_deviation': axis_deviation,
             'source_id': source_id,
             'ring_number': ring_number,
-            'created_at': datetime.utcnow().timestamp()
+            'created_at': time.time()
         }
 
         return self._add_to_buffer(entry)
@@ -195,7 +197,7 @@ class BufferWriter:
             'sensor_location': sensor_location,
             'unit': unit,
             'ring_number': ring_number,
-            'created_at': datetime.utcnow().timestamp()
+            'created_at': time.time()
         }
 
         return self._add_to_buffer(entry)
@@ -281,7 +283,7 @@ class BufferWriter:
 
             self.stats['total_written'] += written_count
             self.stats['flush_count'] += 1
-            self.stats['last_flush_time'] = datetime.utcnow().timestamp()
+            self.stats['last_flush_time'] = time.time()
 
             logger.info(
                 f"Flushed {written_count} records to database "
@@ -320,8 +322,7 @@ class BufferWriter:
             for log in logs
         ]
 
-        with self.db_manager.transaction() as conn:
-            conn.executemany(query, params_list)
+        await self._execute_batch(query, params_list)
 
         return len(logs)
 
@@ -351,8 +352,7 @@ class BufferWriter:
             for log in logs
         ]
 
-        with self.db_manager.transaction() as conn:
-            conn.executemany(query, params_list)
+        await self._execute_batch(query, params_list)
 
         return len(logs)
 
@@ -377,11 +377,19 @@ class BufferWriter:
             for log in logs
         ]
 
-        with self.db_manager.transaction() as conn:
-            conn.executemany(query, params_list)
+        await self._execute_batch(query, params_list)
 
         return len(logs)
 
+    async def _execute_batch(self, query: str, params_list: List[tuple]) -> None:
+        """Run a batch insert in one transaction, without blocking the loop when async"""
+        if isinstance(self.db_manager, AsyncDatabaseManager):
+            async with self.db_manager.transaction() as conn:
+                await conn.executemany(query, params_list)
+        else:
+            with self.db_manager.transaction() as conn:
+                conn.executemany(query, params_list)
+
     async def _auto_flush_loop(self) -> None:
         """Background task to auto-flush buffer at intervals"""
         while self.running:
@@ -438,7 +446,7 @@ if __name__ == "__main__":
             buffer.add_plc_log(
                 tag_name="thrust_total",
                 value=10000 + i * 100,
-                timestamp=datetime.utcnow().timestamp(),
+                timestamp=time.time(),
                 source_id="plc_main",
                 data_quality_flag="raw"
             )
@@ -5,8 +5,8 @@ Supports polling-based data retrieval
 """
 import asyncio
 import logging
+import time
 from typing import List, Callable, Optional, Dict, Any
-from datetime import datetime
 
 try:
     from pymodbus.client import AsyncModbusTcpClient
@@ -162,7 +162,7 @@ class ModbusTCPCollector:
         """
         Poll all configured sensors once.
         """
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
 
         for tag_name, config in self.register_map.items():
             address = config['address']
@@ -5,8 +5,8 @@ Supports tag subscription for real-time data streaming
 """
 import asyncio
 import logging
+import time
 from typing import List, Callable, Optional, Dict, Any
-from datetime import datetime
 
 try:
     from asyncua import Client, Node
@@ -49,7 +49,7 @@ class OPCUADataHandler(SubHandler):
             tag_name = str(node).split("=")[-1]  # Simplified, should use node.read_browse_name()
 
             # Extract timestamp
-            timestamp = datetime.utcnow().timestamp()
+            timestamp = time.time()
             if hasattr(data, 'monitored_item') and hasattr(data.monitored_item, 'Value'):
                 if hasattr(data.monitored_item.Value, 'SourceTimestamp'):
                     timestamp = data.monitored_item.Value.SourceTimestamp.timestamp()
@@ -5,8 +5,8 @@ Supports polling and webhook modes
 """
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Callable, Optional, List
-from datetime import datetime
 import aiohttp
 
 logger = logging.getLogger(__name__)
@@ -233,7 +233,7 @@ class RESTAPICollector:
             data: Fetched data (dict or list)
         """
         try:
-            timestamp = datetime.utcnow().timestamp()
+            timestamp = time.time()
 
             # Handle different data formats
             if isinstance(data, list):
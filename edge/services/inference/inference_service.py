@@ -3,12 +3,11 @@ Edge Inference Service
 Real-time ML predictions using ONNX models on edge device
 Implements FR-020 to FR-026
 """
-import time
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
 import logging
-from sqlalchemy.orm import Session
+import time
+from sqlalchemy.orm import Session, undefer
 
 from edge.models.ring_summary import RingSummary
 from edge.models.prediction_result import PredictionResult
@@ -215,15 +214,18 @@ class InferenceService:
         """
         # Convert feature dict to numpy array
         # Must match model's expected feature order
-        model_metadata = self.db.query(ModelMetadata).filter(
-            ModelMetadata.model_name == model_name
-        ).first()
+        model_metadata = (
+            self.db.query(ModelMetadata)
+            .options(undefer(ModelMetadata.feature_list))
+            .filter(ModelMetadata.model_name == model_name)
+            .first()
+        )
 
         if not model_metadata:
             raise ValueError(f"Model metadata not found for {model_name}")
 
         # Get expected feature list
-        expected_features = model_metadata.get_feature_list()
+        expected_features = model_metadata.feature_list or []
 
         # Build feature array in correct order
         feature_array = []
@@ -282,7 +284,7 @@ class InferenceService:
         # Create result object
         result = PredictionResult(
             ring_number=ring_number,
-            timestamp=datetime.utcnow().timestamp(),
+            timestamp=time.time(),
             model_name=model_name,
             model_version=model.model_version,
             model_type=model.model_type,
@@ -4,6 +4,7 @@ Tracks prediction accuracy and detects concept drift
 Implements FR-027 to FR-032
 """
 import numpy as np
+import time
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -96,7 +97,8 @@ class PerformanceMonitor:
 
         baseline_rmse = model.validation_rmse if model else None
 
-        # Detect drift
+        # Detect drift (the stored severity code is computed by the database
+        # from drift_detected and rmse_increase_percent; see DRIFT_SEVERITY_SQL)
         drift_detected = False
         drift_severity = "none"
         rmse_increase_percent = 0.0
@@ -137,7 +139,7 @@ class PerformanceMonitor:
 
         perf_metric = ModelPerformanceMetric(
             model_name=model_name,
-            evaluation_date=datetime.utcnow().timestamp(),
+            evaluation_date=time.time(),
             evaluation_data_range=data_range,
             num_predictions=len(predictions),
             r2_score=metrics["r2"],
@@ -146,7 +148,6 @@ class PerformanceMonitor:
             mape=metrics["mape"],
             confidence_coverage=confidence_coverage,
             drift_detected=int(drift_detected),
-            drift_severity=drift_severity,
             baseline_rmse=baseline_rmse,
             rmse_increase_percent=rmse_increase_percent,
             triggered_retraining=int(triggered_retraining),
@@ -275,7 +276,7 @@ class PerformanceMonitor:
         days: int = 30
     ) -> List[ModelPerformanceMetric]:
         """Get performance metrics history for a model"""
-        cutoff_time = datetime.utcnow().timestamp() - (days * 86400)
+        cutoff_time = time.time() - (days * 86400)
 
         return (
             self.db.query(ModelPerformanceMetric)
@@ -289,7 +290,7 @@ class PerformanceMonitor:
 
     def get_drift_alerts(self, days: int = 7) -> List[ModelPerformanceMetric]:
         """Get recent drift detection alerts"""
-        cutoff_time = datetime.utcnow().timestamp() - (days * 86400)
+        cutoff_time = time.time() - (days * 86400)
 
         return (
             self.db.query(ModelPerformanceMetric)
@@ -217,7 +217,7 @@ class PredictionManager:
 
             # Set feature list if provided
             if feature_list:
-                model_metadata.set_feature_list(feature_list)
+                model_metadata.feature_list = list(feature_list)
 
             # Calculate checksum
             import hashlib
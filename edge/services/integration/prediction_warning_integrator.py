@@ -3,8 +3,8 @@ Prediction to Warning Integrator (T204)
 Integrates prediction service with warning engine for predictive early warnings
 """
 import logging
+import time
 from typing import Optional, Dict, Any, List
-from datetime import datetime
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -135,7 +135,7 @@ class PredictionWarningIntegrator:
                 ),
                 "prediction_horizon_hours": self.prediction_horizon_hours,
                 "geological_zone": geological_zone,
-                "timestamp": datetime.utcnow().timestamp(),
+                "timestamp": time.time(),
             }
 
             warnings.append(warning_data)
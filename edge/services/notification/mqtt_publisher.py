@@ -6,8 +6,8 @@ Implements Feature 003 - Real-Time Warning System
 import asyncio
 import json
 import logging
+import time
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 from asyncio_mqtt import Client, MqttError
 
 from edge.models.warning_event import WarningEvent
@@ -161,7 +161,7 @@ class MQTTPublisher:
 
             # Update notification tracking
             warning.notification_sent = True
-            warning.notification_timestamp = datetime.utcnow().timestamp()
+            warning.notification_timestamp = time.time()
 
             return True
 
@@ -234,7 +234,7 @@ class MQTTPublisher:
             payload = {
                 "warning_id": warning_id,
                 "status": status,
-                "timestamp": datetime.utcnow().timestamp(),
+                "timestamp": time.time(),
                 "metadata": metadata or {},
             }
 
@@ -351,7 +351,7 @@ class MQTTPublisher:
             topic = f"{self.topic_prefix}/system/status"
             payload = {
                 **status,
-                "timestamp": datetime.utcnow().timestamp(),
+                "timestamp": time.time(),
             }
 
             async with self._lock:
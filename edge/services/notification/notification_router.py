@@ -4,9 +4,9 @@ Routes warning events to appropriate notification channels based on severity
 Implements Feature 003 - Real-Time Warning System (FR-010 to FR-014)
 """
 import logging
+import time
 from typing import List, Dict, Optional, Any
 import asyncio
-from datetime import datetime
 
 from edge.models.warning_event import WarningEvent
 from edge.services.notification.mqtt_publisher import MQTTPublisher
@@ -352,7 +352,7 @@ class NotificationRouter:
                     warning_type="test",
                     warning_level="ATTENTION",
                     ring_number=0,
-                    timestamp=datetime.utcnow().timestamp(),
+                    timestamp=time.time(),
                     indicator_name="test_indicator",
                     status="active"
                 )
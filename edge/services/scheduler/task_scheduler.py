@@ -8,8 +8,9 @@ Schedules and executes periodic tasks for edge services
 """
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Callable, Optional, List
-from datetime import datetime, timedelta
+from datetime import timedelta
 from dataclasses import dataclass
 import traceback
 
@@ -64,7 +65,7 @@ class TaskScheduler:
             interval_seconds: Execution interval in seconds
             enabled: Whether task is enabled
         """
-        now = datetime.utcnow().timestamp()
+        now = time.time()
 
         task = ScheduledTask(
             name=name,
@@ -136,7 +137,7 @@ class TaskScheduler:
 
         while self.running:
             try:
-                now = datetime.utcnow().timestamp()
+                now = time.time()
 
                 # Check all tasks
                 for task in self.tasks.values():
@@ -169,7 +170,7 @@ class TaskScheduler:
         Args:
             task: Task to execute
         """
-        start_time = datetime.utcnow().timestamp()
+        start_time = time.time()
 
         try:
             logger.debug(f"Executing task '{task.name}'")
@@ -186,7 +187,7 @@ class TaskScheduler:
             task.last_run = start_time
             task.run_count += 1
 
-            duration = datetime.utcnow().timestamp() - start_time
+            duration = time.time() - start_time
             logger.info(
                 f"Task '{task.name}' completed in {duration:.2f}s "
                 f"(run #{task.run_count})"
@@ -236,7 +237,7 @@ class TaskScheduler:
 
     def _format_task_status(self, task: ScheduledTask) -> Dict[str, Any]:
         """Format task status for display"""
-        now = datetime.utcnow().timestamp()
+        now = time.time()
 
         return {
             'name': task.name,
@@ -356,7 +357,7 @@ async def data_cleanup_task(db_manager, retention_days: int = 30):
     logger.info("Running data cleanup task")
 
     try:
-        cutoff_time = datetime.utcnow().timestamp() - (retention_days * 86400)
+        cutoff_time = time.time() - (retention_days * 86400)
 
         with db_manager.transaction() as conn:
             # Delete old PLC logs (keep if not yet aggregated)
@@ -4,9 +4,9 @@ Issues warnings when predicted values are expected to exceed thresholds
 Implements Feature 003 - Real-Time Warning System
 """
 import logging
+import time
 import uuid
 from typing import Optional, Dict, Any
-from datetime import datetime
 from sqlalchemy.orm import Session
 
 from edge.models.warning_threshold import WarningThreshold
@@ -54,7 +54,7 @@ class PredictiveChecker:
             List of WarningEvent objects for predicted violations
         """
         if timestamp is None:
-            timestamp = datetime.utcnow().timestamp()
+            timestamp = time.time()
 
         # Query latest prediction for this ring
         prediction = (
@@ -4,9 +4,9 @@ Detects abnormal rate of change compared to historical averages
 Implements Feature 003 - Real-Time Warning System
 """
 import logging
+import time
 import uuid
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 from sqlalchemy.orm import Session
 import statistics
 
@@ -75,7 +75,7 @@ class RateDetector:
             WarningEvent if rate is abnormal, None otherwise
         """
         if timestamp is None:
-            timestamp = datetime.utcnow().timestamp()
+            timestamp = time.time()
 
         # Get threshold config
         threshold_config = self._get_threshold_config(indicator_name, geological_zone)
@@ -4,8 +4,8 @@ Evaluates absolute values against configured thresholds
 Implements Feature 003 - Real-Time Warning System
 """
 import logging
+import time
 from typing import Optional, Dict, Any
-from datetime import datetime
 import uuid
 
 from edge.models.warning_threshold import WarningThreshold
@@ -54,7 +54,7 @@ class ThresholdChecker:
             WarningEvent if threshold violated, None otherwise
         """
         if timestamp is None:
-            timestamp = datetime.utcnow().timestamp()
+            timestamp = time.time()
 
         # Look up threshold config (zone-specific first, then 'all' fallback)
         threshold_config = self._get_threshold_config(indicator_name, geological_zone)
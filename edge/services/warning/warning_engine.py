@@ -4,8 +4,8 @@ Coordinates threshold, rate, and predictive warning checks
 Implements Feature 003 - Real-Time Warning System
 """
 import logging
+import time
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 from sqlalchemy.orm import Session
 
 from edge.models.warning_threshold import WarningThreshold
@@ -92,7 +92,7 @@ class WarningEngine:
         Implements FR-001 to FR-007, FR-033
         """
         if timestamp is None:
-            timestamp = datetime.utcnow().timestamp()
+            timestamp = time.time()
 
         all_warnings = []
 
@@ -3,6 +3,7 @@ Work Order Generator (T181)
 Automatically generates work orders from warnings based on configurable rules
 """
 import logging
+import time
 import uuid
 from typing import Optional, Dict, Any, List
 from datetime import datetime
@@ -179,7 +180,7 @@ class WorkOrderGenerator:
             "status": "pending",
             "verification_required": rule.get("verification_required", False),
             "verification_ring_count": rule.get("verification_ring_count", 5),
-            "created_at": datetime.utcnow().timestamp(),
+            "created_at": time.time(),
             "metadata": {
                 "source": "auto_generated",
                 "warning_level": warning.warning_level,
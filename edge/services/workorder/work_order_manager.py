@@ -3,8 +3,8 @@ Work Order Manager (T182-T183)
 Manages work order lifecycle and synchronization with cloud
 """
 import logging
+import time
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
@@ -157,7 +157,7 @@ class WorkOrderManager:
                 "verification_required": 1 if work_order.get("verification_required") else 0,
                 "verification_ring_count": work_order.get("verification_ring_count", 5),
                 "created_at": work_order["created_at"],
-                "updated_at": datetime.utcnow().timestamp(),
+                "updated_at": time.time(),
                 "metadata": json.dumps(work_order.get("metadata", {})),
             })
             self.db.commit()
@@ -0,0 +1,246 @@
+"""
+Integration test for the batch ring alignment script
+Aligns rings on a temporary database, serially and on a process pool
+"""
+import importlib
+import sqlite3
+from pathlib import Path
+
+import pytest
+from edge.models.base import DATA_QUALITY_CODE_SQL
+from edge.services.aligner.plc_aggregator import PLCAggregator
+
+EDGE_DIR = Path(__file__).resolve().parents[2]
+
+# Ring 0 ends here; rings 1-3 follow on the advance sensor
+BASE_TIME = 1_700_000_000.0
+N_MINUTES = 180
+
+SCHEMA = [
+    f"""
+    CREATE TABLE plc_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        ring_number INTEGER,
+        tag_name TEXT NOT NULL,
+        value REAL,
+        source_id TEXT NOT NULL,
+        data_quality_flag TEXT DEFAULT 'raw',
+        data_quality_code SMALLINT GENERATED ALWAYS AS ({DATA_QUALITY_CODE_SQL}) STORED
+    )
+    """,
+    "CREATE INDEX idx_plc_tag_timestamp ON plc_logs (tag_name, timestamp)",
+    """
+    CREATE TABLE attitude_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        pitch REAL, roll REAL, yaw REAL,
+        horizontal_deviation REAL, vertical_deviation REAL, axis_deviation REAL
+    )
+    """,
+    """
+    CREATE TABLE monitoring_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        sensor_type TEXT NOT NULL,
+        sensor_location TEXT,
+        value REAL
+    )
+    """,
+    """
+    CREATE TABLE ring_summary (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ring_number INTEGER UNIQUE NOT NULL,
+        start_time REAL NOT NULL,
+        end_time REAL NOT NULL,
+        mean_thrust REAL, max_thrust REAL, min_thrust REAL, std_thrust REAL,
+        mean_torque REAL, max_torque REAL,
+        mean_penetration_rate REAL, max_penetration_rate REAL,
+        mean_chamber_pressure REAL, max_chamber_pressure REAL,
+        mean_pitch REAL, mean_roll REAL, mean_yaw REAL,
+        horizontal_deviation REAL, vertical_deviation REAL,
+        specific_energy REAL, ground_loss_rate REAL, volume_loss_ratio REAL,
+        settlement_value REAL,
+        data_completeness_flag TEXT DEFAULT 'incomplete',
+        geological_zone TEXT,
+        synced_to_cloud INTEGER DEFAULT 0,
+        created_at REAL,
+        updated_at REAL
+    )
+    """,
+]
+
+
+@pytest.fixture
+def batch_align(tmp_path, monkeypatch):
+    """
+    Import the script from a working directory laid out like deployment
+    (logs/ for its file handler, edge/config for the alignment config)
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'logs').mkdir()
+    (tmp_path / 'edge').symlink_to(EDGE_DIR)
+    return importlib.import_module('edge.scripts.batch_align_rings')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Temporary database with minute-resolution PLC data for rings 1-3 after ring 0"""
+    path = str(tmp_path / 'edge.db')
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+    plc_rows = []
+    attitude_rows = []
+    for minute in range(N_MINUTES):
+        timestamp = BASE_TIME + minute * 60
+        # 30 mm/min: a 1.5 m ring every ~44 minutes
+        plc_rows.append((timestamp, 'advance_distance', 30.0 * minute))
+        plc_rows.append((timestamp, 'thrust', 12000.0 + (minute % 7) * 50))
+        plc_rows.append((timestamp, 'torque', 900.0 + (minute % 5) * 10))
+        plc_rows.append((timestamp, 'penetration_rate', 40.0 + minute % 3))
+        plc_rows.append((timestamp, 'chamber_pressure', 2.5 + (minute % 4) * 0.1))
+        plc_rows.append((timestamp, 'cutterhead_power', 500.0 + minute % 11))
+        plc_rows.append((timestamp, 'grout_volume', 3.0))
+        attitude_rows.append(
+            (timestamp, 0.1 * (minute % 3), 0.05, 1.0, minute % 9, -(minute % 4), 1.0)
+        )
+
+    conn.executemany(
+        "INSERT INTO plc_logs (timestamp, tag_name, value, source_id) VALUES (?, ?, ?, 'test')",
+        plc_rows
+    )
+    conn.executemany(
+        "INSERT INTO attitude_logs (timestamp, pitch, roll, yaw, horizontal_deviation, "
+        "vertical_deviation, axis_deviation) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        attitude_rows
+    )
+    # Settlement 7 hours after ring 1 ends
+    conn.execute(
+        "INSERT INTO monitoring_logs (timestamp, sensor_type, sensor_location, value) "
+        "VALUES (?, 'surface_settlement', 'S1', -2.5)",
+        (BASE_TIME + 44 * 60 + 7 * 3600,)
+    )
+    conn.execute(
+        "INSERT INTO ring_summary (ring_number, start_time, end_time, geological_zone) "
+        "VALUES (0, ?, ?, 'Z1')",
+        (BASE_TIME - 2700, BASE_TIME)
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def ring_summary_rows(db_path):
+    """ring_summary rows without the write timestamps"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM ring_summary ORDER BY ring_number").fetchall()
+    conn.close()
+    return [
+        {k: row[k] for k in row.keys() if k not in ('id', 'created_at', 'updated_at')}
+        for row in rows
+    ]
+
+
+def test_process_rings_serial_and_pool(batch_align, db_path):
+    """Test the process pool writes the same summaries as a serial run"""
+    ring_numbers = [1, 2, 3]
+
+    serial = batch_align.BatchRingAligner(db_path=db_path)
+    serial.process_rings(ring_numbers, workers=1)
+    assert serial.stats.successful == 3
+    assert serial.stats.rings_with_data == 3
+
+    serial_rows = ring_summary_rows(db_path)
+    assert [row['ring_number'] for row in serial_rows] == [0, 1, 2, 3]
+    ring_1 = serial_rows[1]
+    assert ring_1['start_time'] == BASE_TIME
+    assert ring_1['end_time'] == BASE_TIME + 44 * 60
+    assert ring_1['mean_thrust'] is not None
+    assert ring_1['mean_pitch'] is not None
+    assert ring_1['specific_energy'] is not None
+    assert ring_1['settlement_value'] == -2.5
+    assert serial_rows[2]['start_time'] == ring_1['end_time']
+
+    # Re-align on the pool: every ring's predecessor is already summarized
+    pooled = batch_align.BatchRingAligner(db_path=db_path, force_reprocess=True)
+    pooled.process_rings(ring_numbers, workers=2)
+    assert pooled.stats.successful == 3
+    assert pooled.stats.rings_with_data == 3
+
+    assert ring_summary_rows(db_path) == serial_rows
+
+
+def test_first_ring_without_predecessor(batch_align, db_path):
+    """Test a ring with no previous summary fails cleanly"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM ring_summary")
+    conn.commit()
+    conn.close()
+
+    aligner = batch_align.BatchRingAligner(db_path=db_path)
+    aligner.process_rings([1], workers=1)
+
+    assert aligner.stats.failed == 1
+    assert aligner.stats.rings_without_data == 1
+    assert ring_summary_rows(db_path) == []
+
+
+def test_plc_arrays_match_sql_aggregation(batch_align, db_path):
+    """Test the column-array path aggregates like the SQL path"""
+    start_time, end_time = BASE_TIME, BASE_TIME + 44 * 60
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO plc_logs (timestamp, tag_name, value, source_id, data_quality_flag) "
+        "VALUES (?, 'thrust', 1e9, 'test', 'rejected')",
+        (start_time + 30,)
+    )
+    conn.commit()
+    conn.close()
+
+    aligner = batch_align.BatchRingAligner(db_path=db_path)
+    tag_names, values = aligner._load_plc_arrays(start_time, end_time)
+    from_arrays = aligner.plc_aggregator.aggregate_ring_arrays(1, tag_names, values)
+    from_sql = PLCAggregator().aggregate_ring_data(
+        aligner.db_manager, 1, start_time, end_time
+    )
+
+    assert from_arrays.keys() == from_sql.keys()
+    for key, value in from_sql.items():
+        assert from_arrays[key] == pytest.approx(value), key
+    assert from_arrays['max_thrust'] < 1e9
+
+
+def test_prefetched_lookups(batch_align, db_path):
+    """Test ring lists, existing rings and zones come from the prefetches"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "UPDATE plc_logs SET ring_number = CAST((timestamp - ?) / 2640 AS INTEGER) + 1",
+        (BASE_TIME,)
+    )
+    conn.commit()
+
+    aligner = batch_align.BatchRingAligner(db_path=db_path)
+    assert aligner.get_all_ring_numbers() == [1, 2, 3, 4, 5]
+    aligner.process_rings([1, 2], workers=1)
+
+    conn.execute("UPDATE ring_summary SET geological_zone = 'Z2' WHERE ring_number = 1")
+    conn.commit()
+
+    # Existing rings are skipped unless forced
+    aligner = batch_align.BatchRingAligner(db_path=db_path)
+    aligner.process_rings([1, 2, 3], workers=1)
+    assert aligner.stats.skipped == 2
+    assert aligner.stats.successful == 3
+
+    # Reprocessing keeps the zone the ring already carries
+    aligner = batch_align.BatchRingAligner(db_path=db_path, force_reprocess=True)
+    aligner.process_rings([1], workers=1)
+    assert aligner.stats.rings_with_data == 1
+    zone = conn.execute(
+        "SELECT geological_zone FROM ring_summary WHERE ring_number = 1"
+    ).fetchone()[0]
+    conn.close()
+    assert zone == 'Z2'
@@ -7,8 +7,10 @@ import tempfile
 import os
 from datetime import datetime
 from edge.database.manager import DatabaseManager
+from edge.models.base import DATA_QUALITY_CODE_SQL
 from edge.services.cleaner.threshold_validator import ThresholdValidator
 from edge.services.cleaner.interpolator import DataInterpolator
+from edge.services.aligner import ring_summary_writer
 from edge.services.aligner.plc_aggregator import PLCAggregator
 from edge.services.aligner.ring_summary_writer import RingSummaryWriter
 
@@ -37,9 +39,10 @@ class TestDataPipeline:
                     value REAL,
                     source_id TEXT NOT NULL,
                     data_quality_flag TEXT DEFAULT 'raw',
+                    data_quality_code SMALLINT GENERATED ALWAYS AS ({DATA_QUALITY_CODE_SQL}) STORED,
                     created_at REAL DEFAULT (julianday('now'))
                 )
-            """)
+            """.format(DATA_QUALITY_CODE_SQL=DATA_QUALITY_CODE_SQL))
 
             # Create ring_summary table
             conn.execute("""
@@ -261,3 +264,55 @@ class TestDataPipeline:
         stats = writer.get_statistics()
         assert stats['rings_updated'] == 1
         assert stats['rings_inserted'] == 1  # First write
+
+    def test_bulk_write_rings(self, test_db):
+        """Test writing several rings in one transaction"""
+        start_time = datetime(2025, 11, 19, 10, 0).timestamp()
+        writer = RingSummaryWriter()
+
+        writer.write_ring_summary(
+            test_db, 100, start_time, start_time + 2700,
+            plc_features={'mean_thrust': 12000.0},
+            attitude_features={},
+            derived_indicators={},
+            settlement_features={}
+        )
+
+        written = writer.write_ring_summaries_bulk(test_db, [
+            (ring_num, start_time, start_time + 2700,
+             {'mean_thrust': 12000.0 + ring_num}, {}, {}, {}, 'Test')
+            for ring_num in [100, 101, 102]
+        ])
+
+        assert written == 3
+        with test_db.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT ring_number, mean_thrust FROM ring_summary ORDER BY ring_number"
+            ).fetchall()
+        assert [tuple(row) for row in rows] == [(100, 12100.0), (101, 12101.0), (102, 12102.0)]
+
+        stats = writer.get_statistics()
+        assert stats['rings_inserted'] == 3
+        assert stats['rings_updated'] == 1
+
+    def test_update_on_same_clock_tick(self, test_db, monkeypatch):
+        """Test an update right after the insert is counted as an update"""
+        start_time = datetime(2025, 11, 19, 10, 0).timestamp()
+        monkeypatch.setattr(ring_summary_writer.time, 'time', lambda: start_time + 3600)
+        writer = RingSummaryWriter()
+
+        for mean_thrust in (12000.0, 12500.0):
+            assert writer.write_ring_summary(
+                test_db, 100, start_time, start_time + 2700,
+                plc_features={'mean_thrust': mean_thrust},
+                attitude_features={},
+                derived_indicators={},
+                settlement_features={}
+            )
+
+        stats = writer.get_statistics()
+        assert stats['rings_inserted'] == 1
+        assert stats['rings_updated'] == 1
+        with test_db.get_connection() as conn:
+            row = conn.execute("SELECT mean_thrust FROM ring_summary").fetchone()
+        assert row['mean_thrust'] == 12500.0
@@ -0,0 +1,157 @@
+"""
+T048: Unit tests for ring data alignment
+Tests align_data() and align_data_batch() on a temporary database
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from edge.database.manager import DatabaseManager
+from edge.models import Base
+from edge.services.aligner.aggregator import align_data, align_data_batch
+
+CONFIG_PATH = str(Path(__file__).resolve().parents[2] / 'config' / 'alignment.yaml')
+
+BASE_TIME = 1_700_000_000.0
+RING_SECONDS = 2700
+
+# Thrust readings around 1e6 with sub-unit spread
+THRUST_VALUES = 1e6 + np.linspace(0.0, 1.0, 120)
+
+
+def make_db(db_path):
+    """
+    Database manager on a new database with the ORM schema.
+
+    Rings 1-3 are in ring_summary; ring 3 has no sensor data. PLC and
+    attitude readings are also logged for ring 4, which has no summary.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    manager = DatabaseManager(db_path)
+    with manager.transaction() as conn:
+        for ring_number in (1, 2, 3, 4):
+            start_time = BASE_TIME + (ring_number - 1) * RING_SECONDS
+            end_time = start_time + RING_SECONDS
+            if ring_number != 4:
+                conn.execute(
+                    "INSERT INTO ring_summary (ring_number, start_time, end_time) "
+                    "VALUES (?, ?, ?)",
+                    (ring_number, start_time, end_time)
+                )
+            if ring_number == 3:
+                continue
+
+            plc_rows = []
+            attitude_rows = []
+            for i, thrust in enumerate(THRUST_VALUES):
+                timestamp = start_time + i * 20
+                plc_rows += [
+                    (timestamp, ring_number, 'thrust_total', float(thrust), 'raw'),
+                    (timestamp, ring_number, 'torque_cutterhead', 900.0 + i % 7 + ring_number,
+                     'raw'),
+                    (timestamp, ring_number, 'advance_rate', 40.0 + i % 3, 'calibrated'),
+                    (timestamp, ring_number, 'chamber_pressure', 2.5, 'interpolated'),
+                    (timestamp, ring_number, 'grout_volume', 1e9, 'rejected'),
+                ]
+                attitude_rows.append(
+                    (timestamp, ring_number, 0.1 * (i % 5), -0.2, 1.0 + ring_number,
+                     float(i % 9), None)
+                )
+            conn.executemany(
+                "INSERT INTO plc_logs (timestamp, ring_number, tag_name, value, source_id, "
+                "data_quality_flag) VALUES (?, ?, ?, ?, 'test', ?)",
+                plc_rows
+            )
+            conn.executemany(
+                "INSERT INTO attitude_logs (timestamp, ring_number, pitch, roll, yaw, "
+                "horizontal_deviation, vertical_deviation, source_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 'test')",
+                attitude_rows
+            )
+
+        # Settlement 7 h after ring 1 ends (inside the 6-8 h lag window)
+        conn.execute(
+            "INSERT INTO monitoring_logs (timestamp, ring_number, sensor_type, value, "
+            "source_id) VALUES (?, 1, 'surface_settlement', -2.5, 'test')",
+            (BASE_TIME + RING_SECONDS + 7 * 3600,)
+        )
+
+    return manager
+
+
+def ring_summary_rows(db):
+    """ring_summary rows without ids and write timestamps"""
+    rows = db.fetchall("SELECT * FROM ring_summary ORDER BY ring_number")
+    return [
+        {k: row[k] for k in row.keys() if k not in ('id', 'created_at', 'updated_at')}
+        for row in rows
+    ]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Database manager on a temporary database"""
+    manager = make_db(str(tmp_path / 'edge.db'))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def batch_db(tmp_path):
+    """Second, identical temporary database for the batch path"""
+    manager = make_db(str(tmp_path / 'batch.db'))
+    yield manager
+    manager.close()
+
+
+def test_plc_std_is_centered(db):
+    """Test std of large, tightly spread readings matches NumPy"""
+    single = align_data(1, db, config_path=CONFIG_PATH)
+    batch = align_data_batch([1], db, config_path=CONFIG_PATH)[1]
+
+    for features in (single, batch):
+        assert features['std_thrust_total'] == pytest.approx(np.std(THRUST_VALUES), rel=1e-9)
+        assert features['mean_thrust_total'] == pytest.approx(np.mean(THRUST_VALUES))
+
+
+def test_align_data_batch_matches_single(db, batch_db):
+    """Test batch alignment gives the single-ring features and rows"""
+    single = {
+        ring_number: align_data(ring_number, db, config_path=CONFIG_PATH)
+        for ring_number in (1, 2, 3)
+    }
+    batch = align_data_batch([1, 2, 3, 4], batch_db, config_path=CONFIG_PATH)
+
+    assert batch.keys() == single.keys()
+    for ring_number, features in single.items():
+        assert batch[ring_number] == pytest.approx(features), ring_number
+    assert ring_summary_rows(batch_db) == pytest.approx(ring_summary_rows(db))
+
+    ring_1 = single[1]
+    assert ring_1['settlement_value'] == -2.5
+    assert ring_1['mean_advance_rate'] == pytest.approx(41.0)
+    assert ring_1['mean_chamber_pressure'] == 2.5
+    assert ring_1['mean_grout_volume'] is None
+    assert ring_1['mean_yaw'] == 2.0
+    assert ring_1['max_vertical_deviation'] is None
+    assert ring_1['data_completeness_flag'] == 'complete'
+    assert single[2]['data_completeness_flag'] == 'partial'
+    assert single[3]['mean_thrust_total'] is None
+    assert single[3]['data_completeness_flag'] == 'incomplete'
+
+    rows = ring_summary_rows(db)
+    assert rows[0]['std_thrust'] == pytest.approx(ring_1['std_thrust_total'])
+    assert rows[0]['settlement_value'] == -2.5
+
+
+def test_align_data_missing_ring(db):
+    """Test a ring without a summary raises, and the batch skips it"""
+    with pytest.raises(ValueError):
+        align_data(4, db, config_path=CONFIG_PATH)
+
+    assert align_data_batch([4], db, config_path=CONFIG_PATH) == {}
+    assert [row['ring_number'] for row in ring_summary_rows(db)] == [1, 2, 3]
@@ -0,0 +1,47 @@
+"""
+Unit tests for DerivedIndicatorCalculator
+Tests input guards of the derived engineering indicators
+"""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from edge.services.aligner.derived_indicators import DerivedIndicatorCalculator
+
+
+class TestDerivedIndicatorCalculator:
+    """Test cases for DerivedIndicatorCalculator"""
+
+    @pytest.fixture
+    def calculator(self):
+        """Create calculator instance"""
+        return DerivedIndicatorCalculator()
+
+    def test_numpy_scalar_inputs(self, calculator):
+        """Test NumPy scalars from the aggregators are accepted"""
+        specific_energy = calculator.calculate_specific_energy(
+            np.float32(500), np.float32(40), np.int64(45)
+        )
+        assert specific_energy == pytest.approx(29.81, abs=0.01)
+
+        indicators = calculator.calculate_all_indicators(
+            {'mean_thrust': np.float64(12000.0), 'mean_torque': np.int64(900)}, 45
+        )
+        assert indicators['torque_thrust_ratio'] == 0.075
+
+    def test_non_numeric_inputs(self, calculator):
+        """Test None, bool, NaN and non-real inputs give None"""
+        for value in (None, True, float('nan'), np.inf, Decimal('500'), '500'):
+            assert calculator.calculate_specific_energy(value, 40.0, 45.0) is None
+
+    def test_zero_geometry(self):
+        """Test zero diameter or width gives None for volume-based indicators"""
+        for calculator in (DerivedIndicatorCalculator(tunnel_diameter=0.0),
+                           DerivedIndicatorCalculator(ring_width=0.0)):
+            assert calculator.calculate_specific_energy(500.0, 40.0, 45.0) is None
+            assert calculator.calculate_volume_loss_ratio(1.0) is None
+
+            batch = calculator.calculate_all_indicators_batch(
+                {'mean_cutterhead_power': [500.0], 'mean_penetration_rate': [40.0]}, 45.0
+            )
+            assert np.isnan(batch['specific_energy'][0])
@@ -3,7 +3,7 @@ T130: Unit tests for hysteresis logic
 Tests WarningEngine._apply_hysteresis() to prevent oscillating warnings
 """
 import pytest
-from datetime import datetime
+import time
 from unittest.mock import Mock
 
 from edge.services.warning.warning_engine import WarningEngine
@@ -44,7 +44,7 @@ def create_warning(ring_number, indicator_name, value, level, threshold_value, g
         warning_type="threshold",
         warning_level=level,
         ring_number=ring_number,
-        timestamp=datetime.utcnow().timestamp(),
+        timestamp=time.time(),
         indicator_name=indicator_name,
         indicator_value=value,
         indicator_unit="mm",
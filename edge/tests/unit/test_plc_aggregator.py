@@ -2,11 +2,40 @@
 T022: Unit tests for PLC aggregator
 Tests aggregation of high-frequency PLC data
 """
+import sqlite3
+from contextlib import nullcontext
+
+import numpy as np
 import pytest
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock
+from edge.models.base import DATA_QUALITY_CODE_SQL
+from edge.services.aligner import plc_aggregator
 from edge.services.aligner.plc_aggregator import PLCAggregator
 
 
+def make_plc_db(readings):
+    """Database manager mock backed by an in-memory plc_logs table"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        "CREATE TABLE plc_logs ("
+        "timestamp REAL, tag_name TEXT, value REAL, data_quality_flag TEXT, "
+        f"data_quality_code SMALLINT GENERATED ALWAYS AS ({DATA_QUALITY_CODE_SQL}) STORED)"
+    )
+    conn.executemany(
+        "INSERT INTO plc_logs (timestamp, tag_name, value, data_quality_flag) "
+        "VALUES (?, ?, ?, ?)",
+        [
+            (1000.0 + i, r['tag_name'], r['value'], r['data_quality_flag'])
+            for i, r in enumerate(readings)
+        ]
+    )
+
+    db = MagicMock()
+    db.get_connection.return_value = nullcontext(conn)
+    return db
+
+
 class TestPLCAggregator:
     """Test cases for PLCAggregator"""
 
@@ -17,29 +46,14 @@ class TestPLCAggregator:
 
     @pytest.fixture
     def mock_db(self):
-        """Create mock database"""
-        db = MagicMock()
-
-        # Mock connection context manager
-        mock_conn = MagicMock()
-
-        # Mock cursor with sample data
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = [
+        """Create mock database with sample data"""
+        return make_plc_db([
             {'tag_name': 'thrust_total', 'value': 12000.0, 'data_quality_flag': 'raw'},
             {'tag_name': 'thrust_total', 'value': 12500.0, 'data_quality_flag': 'raw'},
             {'tag_name': 'thrust_total', 'value': 13000.0, 'data_quality_flag': 'raw'},
             {'tag_name': 'torque', 'value': 900.0, 'data_quality_flag': 'raw'},
             {'tag_name': 'torque', 'value': 950.0, 'data_quality_flag': 'raw'},
-        ]
-
-        mock_conn.execute.return_value = mock_cursor
-        mock_conn.__enter__ = Mock(return_value=mock_conn)
-        mock_conn.__exit__ = Mock(return_value=False)
-
-        db.get_connection.return_value = mock_conn
-
-        return db
+        ])
 
     def test_aggregate_ring_data(self, aggregator, mock_db):
         """Test basic aggregation"""
@@ -68,18 +82,14 @@ class TestPLCAggregator:
         assert stats['max_test_tag'] == 18.0
         assert stats['min_test_tag'] == 10.0
         assert 'std_test_tag' in stats
+        assert 'median_test_tag' not in stats
+
+        stats = aggregator._calculate_statistics('test_tag', values, include_median=True)
+        assert stats['median_test_tag'] == 14.0
 
     def test_empty_data(self, aggregator):
         """Test handling of empty data"""
-        mock_db = MagicMock()
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = []
-
-        mock_conn.execute.return_value = mock_cursor
-        mock_conn.__enter__ = Mock(return_value=mock_conn)
-        mock_conn.__exit__ = Mock(return_value=False)
-        mock_db.get_connection.return_value = mock_conn
+        mock_db = make_plc_db([])
 
         result = aggregator.aggregate_ring_data(mock_db, 100, 1000.0, 2000.0)
 
@@ -87,21 +97,12 @@ class TestPLCAggregator:
 
     def test_data_quality_filtering(self, aggregator):
         """Test filtering of rejected/missing data"""
-        mock_db = MagicMock()
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-
         # Include rejected data
-        mock_cursor.fetchall.return_value = [
+        mock_db = make_plc_db([
             {'tag_name': 'thrust', 'value': 12000.0, 'data_quality_flag': 'raw'},
             {'tag_name': 'thrust', 'value': 99999.0, 'data_quality_flag': 'rejected'},
             {'tag_name': 'thrust', 'value': 13000.0, 'data_quality_flag': 'raw'},
-        ]
-
-        mock_conn.execute.return_value = mock_cursor
-        mock_conn.__enter__ = Mock(return_value=mock_conn)
-        mock_conn.__exit__ = Mock(return_value=False)
-        mock_db.get_connection.return_value = mock_conn
+        ])
 
         result = aggregator.aggregate_ring_data(mock_db, 100, 1000.0, 2000.0)
 
@@ -146,3 +147,96 @@ class TestPLCAggregator:
         # Should filter out NaN/inf and calculate on valid values only
         assert 'mean_test' in stats
         assert stats['mean_test'] == 12.0  # Mean of 10, 12, 14
+
+    def test_median_on_request(self, aggregator, mock_db):
+        """Test medians are only computed when requested"""
+        result = aggregator.aggregate_ring_data(mock_db, 100, 1000.0, 2000.0)
+        assert 'median_thrust_total' not in result
+
+        result = aggregator.aggregate_ring_data(
+            mock_db, 100, 1000.0, 2000.0, include_median=True
+        )
+        assert result['median_thrust_total'] == 12500.0
+        assert result['median_torque'] == 925.0
+
+    def test_completeness_reuses_aggregate_counts(self, aggregator, mock_db):
+        """Test completeness after aggregation does not rescan the window"""
+        aggregator.aggregate_ring_data(mock_db, 100, 1000.0, 2000.0)
+        mock_db.get_connection.reset_mock()
+
+        completeness = aggregator.get_data_completeness(mock_db, 100, 1000.0, 2000.0)
+
+        mock_db.get_connection.assert_not_called()
+        assert completeness['actual_samples_total'] == 5
+        assert completeness['unique_tags'] == 2
+
+    def test_completeness_sees_late_data(self, aggregator, mock_db):
+        """Test reused counts serve one completeness call only"""
+        aggregator.aggregate_ring_data(mock_db, 100, 1000.0, 2000.0)
+        aggregator.get_data_completeness(mock_db, 100, 1000.0, 2000.0)
+
+        with mock_db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO plc_logs (timestamp, tag_name, value, data_quality_flag) "
+                "VALUES (1500.0, 'advance_speed', 40.0, 'raw')"
+            )
+
+        completeness = aggregator.get_data_completeness(mock_db, 100, 1000.0, 2000.0)
+
+        assert completeness['actual_samples_total'] == 6
+        assert completeness['unique_tags'] == 3
+
+    def test_aggregate_rings_batch(self, aggregator, mock_db):
+        """Test batch aggregation matches per-ring aggregation"""
+        windows = [(100, 1000.0, 1002.0), (101, 1003.0, 1004.0), (102, 5000.0, 6000.0)]
+
+        result = aggregator.aggregate_rings_batch(mock_db, windows)
+
+        for ring_number, start_time, end_time in windows[:2]:
+            single = aggregator.aggregate_ring_data(mock_db, ring_number, start_time, end_time)
+            assert result[ring_number] == pytest.approx(single)
+        assert result[100]['mean_thrust_total'] == 12500.0
+        assert result[102] == {}
+
+    def test_sql_statistics_match_arrays(self, aggregator):
+        """Test SQL aggregation is centered and skips non-finite values"""
+        values = 1e6 + np.linspace(0.0, 1.0, 12)
+        db = make_plc_db(
+            [{'tag_name': 'thrust_total', 'value': float(v), 'data_quality_flag': 'raw'}
+             for v in values]
+            + [{'tag_name': 'thrust_total', 'value': value, 'data_quality_flag': 'raw'}
+               for value in (float('inf'), float('-inf'), None)]
+        )
+
+        single = aggregator.aggregate_ring_data(db, 100, 1000.0, 2000.0, include_median=True)
+        batch = aggregator.aggregate_rings_batch(db, [(100, 1000.0, 2000.0)])[100]
+        arrays = aggregator.aggregate_ring_arrays(
+            100, np.array(['thrust_total'] * 15),
+            np.append(values, [np.inf, -np.inf, np.nan])
+        )
+
+        for result in (single, batch):
+            assert result['std_thrust_total'] == pytest.approx(np.std(values), rel=1e-9)
+            assert result['mean_thrust_total'] == pytest.approx(np.mean(values))
+            assert result['max_thrust_total'] == values.max()
+            assert result['std_thrust_total'] == pytest.approx(
+                arrays['std_thrust_total'], rel=1e-9
+            )
+        assert single['median_thrust_total'] == pytest.approx(np.median(values))
+
+    def test_threaded_array_statistics(self, monkeypatch):
+        """Test per-tag thread pool gives the sequential result"""
+        monkeypatch.setattr(plc_aggregator, 'NUMBA_AVAILABLE', True)
+        monkeypatch.setattr(plc_aggregator, 'STATS_PARALLEL_MIN_READINGS', 1)
+        tag_names = np.array(['thrust_total', 'torque_cutterhead', 'chamber_pressure'] * 50)
+        values = np.arange(150, dtype=np.float64)
+        values[::7] = np.nan
+
+        threaded = PLCAggregator(stats_workers=4)
+        try:
+            result = threaded.aggregate_ring_arrays(100, tag_names, values)
+        finally:
+            threaded.close()
+
+        assert threaded._stats_executor is None
+        assert result == PLCAggregator().aggregate_ring_arrays(100, tag_names, values)
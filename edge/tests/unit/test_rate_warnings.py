@@ -3,7 +3,7 @@ T128: Unit tests for rate-based anomaly detection
 Tests RateDetector for abnormal rate of change
 """
 import pytest
-from datetime import datetime
+import time
 from unittest.mock import Mock, MagicMock
 
 from edge.services.warning.rate_detector import RateDetector
@@ -307,7 +307,7 @@ class TestRateDetector:
 
         mock_db_session.query.return_value = mock_query
 
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
 
         # Trigger rate warning
         warning = rate_detector.check(
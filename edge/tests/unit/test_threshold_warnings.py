@@ -3,7 +3,7 @@ T127: Unit tests for threshold-based warning logic
 Tests ThresholdChecker for absolute value violations
 """
 import pytest
-from datetime import datetime
+import time
 
 from edge.services.warning.threshold_checker import ThresholdChecker
 from edge.models.warning_threshold import WarningThreshold
@@ -254,7 +254,7 @@ class TestThresholdChecker:
     @pytest.mark.unit
     def test_warning_event_fields(self, threshold_checker):
         """Test that warning event has all required fields"""
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
 
         warning = threshold_checker.check(
             ring_number=100,
@@ -341,3 +341,38 @@ class TestThresholdChecker:
                 assert warning is not None, f"Value {value} should trigger warning"
                 assert warning.warning_level == expected_level, \
                     f"Value {value} should trigger {expected_level}"
+
+
+class TestWarningThresholdBatch:
+    """Unit tests for vectorized WarningThreshold.evaluate_batch"""
+
+    @pytest.fixture
+    def range_threshold(self):
+        """Two-sided threshold, built without ThresholdChecker fixtures"""
+        return WarningThreshold(
+            indicator_name="mean_chamber_pressure",
+            attention_lower=1.8,
+            attention_upper=3.2,
+            warning_lower=1.6,
+            warning_upper=3.5,
+            alarm_lower=1.4,
+            alarm_upper=4.0,
+        )
+
+    @pytest.mark.unit
+    def test_batch_matches_scalar(self, range_threshold):
+        """evaluate_batch agrees with evaluate_threshold value by value"""
+        values = [1.0, 1.5, 1.7, 1.8, 2.5, 3.3, 3.6, 4.0, 4.5, float("nan")]
+
+        levels = range_threshold.evaluate_batch(values)
+
+        assert list(levels) == [range_threshold.evaluate_threshold(v) for v in values]
+
+    @pytest.mark.unit
+    def test_batch_open_bounds(self):
+        """Missing bounds never trigger, including zero-valued bounds"""
+        threshold = WarningThreshold(indicator_name="settlement_value", alarm_upper=0.0)
+
+        levels = threshold.evaluate_batch([-5.0, 0.0, 0.1])
+
+        assert list(levels) == [None, None, "ALARM"]